@@ -0,0 +1,312 @@
+"""
+Per-request query, latency and payload instrumentation.
+
+InstrumentationMiddleware wraps every database connection with an execute
+wrapper for the duration of a request and records, per view:
+
+- the number of SQL queries and the time spent executing them,
+- the time spent in serializer to_representation() (views that use
+  InstrumentedViewMixin),
+- the total request duration and response size.
+
+The figures are sent back in a Server-Timing header (only with DEBUG on or
+to staff users, since they reveal query counts), aggregated into a
+per-process registry that metrics_view exposes in the Prometheus text format
+at /metrics (only with METRICS_TOKEN set, or DEBUG on), and requests slower
+than SLOW_REQUEST_THRESHOLD_MS (or running more than
+SLOW_REQUEST_QUERY_THRESHOLD queries) are logged together with their slowest
+and most repeated SQL statements, which is how N+1 loops show up.
+
+The overhead is a couple of perf_counter() calls and a dict update per
+query. To find the repeats, each request keeps a count per distinct SQL
+string (a reference to the string the backend already built, not a copy)
+until it ends; only slow requests turn them into log lines.
+"""
+import contextvars
+import functools
+import heapq
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the Prometheus histogram buckets.
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# Number of statements listed in a slow-request log entry.
+SLOW_LOG_STATEMENTS = 5
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters for a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+        self.statements = {}
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.query_count += 1
+            self.sql_time += elapsed
+            self.statements[sql] = self.statements.get(sql, 0) + 1
+            if len(self.slowest) < SLOW_LOG_STATEMENTS:
+                heapq.heappush(self.slowest, (elapsed, sql))
+            elif elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, sql))
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def repeated_statements(self):
+        """Statements that ran more than once, most frequent first."""
+        repeated = [(count, sql) for sql, count in self.statements.items() if count > 1]
+        return sorted(repeated, reverse=True)[:SLOW_LOG_STATEMENTS]
+
+
+def current_metrics():
+    """Return the RequestMetrics of the request being handled, if any."""
+    return _current.get()
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class ViewStats:
+    """Aggregated figures for one view."""
+
+    def __init__(self):
+        self.responses = {}
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """Thread-safe, per-process aggregation of request metrics by view."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view, method, status, metrics, duration, response_bytes):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = ViewStats()
+            key = (method, status)
+            stats.responses[key] = stats.responses.get(key, 0) + 1
+            stats.duration.observe(duration)
+            stats.queries.observe(metrics.query_count)
+            stats.sql_seconds += metrics.sql_time
+            stats.serializer_seconds += metrics.serializer_time
+            stats.response_bytes += response_bytes
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def histogram(name, view, histogram):
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{view="{view}",le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{view="{view}",le="+Inf"}} {histogram.total}')
+            lines.append(f'{name}_sum{{view="{view}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{view="{view}"}} {histogram.total}')
+
+        with self._lock:
+            views = sorted(((_escape(view), stats) for view, stats in self._views.items()), key=lambda item: item[0])
+
+            family('babel_http_requests_total', 'counter', 'Requests handled, by view, method and status.')
+            for view, stats in views:
+                for (method, status), count in sorted(stats.responses.items()):
+                    lines.append(
+                        f'babel_http_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}'
+                    )
+
+            family('babel_http_request_duration_seconds', 'histogram', 'Request duration.')
+            for view, stats in views:
+                histogram('babel_http_request_duration_seconds', view, stats.duration)
+
+            family('babel_db_queries_per_request', 'histogram', 'SQL queries executed per request.')
+            for view, stats in views:
+                histogram('babel_db_queries_per_request', view, stats.queries)
+
+            family('babel_db_query_seconds_total', 'counter', 'Time spent executing SQL.')
+            for view, stats in views:
+                lines.append(f'babel_db_query_seconds_total{{view="{view}"}} {stats.sql_seconds}')
+
+            family('babel_serializer_seconds_total', 'counter', 'Time spent serializing responses.')
+            for view, stats in views:
+                lines.append(f'babel_serializer_seconds_total{{view="{view}"}} {stats.serializer_seconds}')
+
+            family('babel_http_response_bytes_total', 'counter', 'Response body bytes sent.')
+            for view, stats in views:
+                lines.append(f'babel_http_response_bytes_total{{view="{view}"}} {stats.response_bytes}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _is_staff(request):
+    # DRF copies the user it authenticated (e.g. from a JWT) onto the request.
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+class InstrumentationMiddleware:
+    """Measure every request; see the module docstring."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.INSTRUMENTATION_ENABLED:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        duration = metrics.elapsed
+        response_bytes = 0 if response.streaming else len(response.content)
+        view = _view_name(request)
+
+        if settings.SERVER_TIMING_HEADER and (settings.DEBUG or _is_staff(request)):
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.sql_time * 1000:.1f};desc="{metrics.query_count} queries"',
+                f'serialize;dur={metrics.serializer_time * 1000:.1f}',
+                f'total;dur={duration * 1000:.1f}',
+            ])
+
+        registry.record(view, request.method, response.status_code, metrics, duration, response_bytes)
+
+        if (duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS
+                or metrics.query_count >= settings.SLOW_REQUEST_QUERY_THRESHOLD):
+            self.log_slow_request(request, view, metrics, duration)
+        return response
+
+    def log_slow_request(self, request, view, metrics, duration):
+        lines = [
+            f'Slow request {request.method} {request.path} ({view}): {duration * 1000:.0f}ms, '
+            f'{metrics.query_count} queries in {metrics.sql_time * 1000:.0f}ms, '
+            f'serializer {metrics.serializer_time * 1000:.0f}ms'
+        ]
+        for elapsed, sql in sorted(metrics.slowest, reverse=True):
+            lines.append(f'  {elapsed * 1000:.1f}ms  {sql}')
+        for count, sql in metrics.repeated_statements():
+            lines.append(f'  x{count}  {sql}')
+        logger.warning('\n'.join(lines))
+
+
+@functools.lru_cache(maxsize=None)
+def timed_serializer_class(serializer_class):
+    """Return a subclass of serializer_class that reports its rendering time."""
+
+    class TimedSerializer(serializer_class):
+        def to_representation(self, instance):
+            metrics = _current.get()
+            # Nested or recursive serializers are already inside the outer timer.
+            if metrics is None or metrics.serializer_depth:
+                return super().to_representation(instance)
+            metrics.serializer_depth += 1
+            start = time.perf_counter()
+            try:
+                return super().to_representation(instance)
+            finally:
+                metrics.serializer_time += time.perf_counter() - start
+                metrics.serializer_depth -= 1
+
+    TimedSerializer.__name__ = serializer_class.__name__
+    TimedSerializer.__qualname__ = serializer_class.__qualname__
+    return TimedSerializer
+
+
+class InstrumentedViewMixin:
+    """
+    Count serializer time from get_serializer() into the request metrics.
+
+    Serializers a view instantiates directly are not timed.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer_class = timed_serializer_class(self.get_serializer_class())
+        kwargs.setdefault('context', self.get_serializer_context())
+        return serializer_class(*args, **kwargs)
+
+
+def metrics_view(request):
+    """
+    Expose the per-process registry for Prometheus to scrape.
+
+    Requires "Authorization: Bearer <METRICS_TOKEN>"; without a token the
+    endpoint is only open with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
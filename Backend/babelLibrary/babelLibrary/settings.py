@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import importlib.util
+import os
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
@@ -58,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'babelLibrary.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -113,6 +116,29 @@ DATABASES = {
 # }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# Defaults to a per-process local-memory cache. For multiple web workers,
+# point CACHE_BACKEND/CACHE_LOCATION at a shared backend, e.g.
+# django.core.cache.backends.redis.RedisCache with redis://localhost:6379/1
+# or django.core.cache.backends.filebased.FileBasedCache with a directory.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='babel-library'),
+    }
+}
+
+# Seconds an anonymous library response stays cached. Saves and deletes
+# invalidate immediately; this only bounds how stale view counts can get.
+LIBRARY_CACHE_TIMEOUT = config('LIBRARY_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds between bulk flushes of buffered reading progress (users/progress.py).
+# 0 writes every progress update through immediately.
+READING_PROGRESS_FLUSH_INTERVAL = config('READING_PROGRESS_FLUSH_INTERVAL', default=5, cast=float)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -132,6 +158,47 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER picks the preferred algorithm ('argon2' needs argon2-cffi and
+# falls back to 'pbkdf2' without it). Hashes made with other algorithms or
+# costs are upgraded on the next successful login (users/login.py).
+_PREFERRED_HASHERS = {
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'users.hashers.TunedPBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='argon2')
+if PASSWORD_HASHER == 'argon2' and importlib.util.find_spec('argon2') is None:
+    PASSWORD_HASHER = 'pbkdf2'
+PASSWORD_HASHERS = [_PREFERRED_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PREFERRED_HASHERS.items() if name != PASSWORD_HASHER
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Argon2id cost; defaults follow the OWASP minimum (19 MiB, 2 passes, 1 lane),
+# which is several times cheaper per login than Django's defaults.
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+PBKDF2_ITERATIONS = config('PBKDF2_ITERATIONS', default=600000, cast=int)
+
+# Login pipeline (users/login.py): failed attempts per client IP and per
+# username within LOGIN_FAILURE_WINDOW seconds before logins are rejected
+# without hashing, and the size of the password-hashing thread pool. The
+# counters live in CACHES['default'], so they are per worker process unless
+# that is a shared backend. LOGIN_TRUSTED_PROXIES is the number of reverse
+# proxies in front of the app that append to X-Forwarded-For; 0 ignores the
+# header and limits by REMOTE_ADDR.
+LOGIN_FAILURE_LIMIT_PER_IP = config('LOGIN_FAILURE_LIMIT_PER_IP', default=20, cast=int)
+LOGIN_FAILURE_LIMIT_PER_USERNAME = config('LOGIN_FAILURE_LIMIT_PER_USERNAME', default=5, cast=int)
+LOGIN_FAILURE_WINDOW = config('LOGIN_FAILURE_WINDOW', default=900, cast=int)
+LOGIN_HASH_WORKERS = config('LOGIN_HASH_WORKERS', default=os.cpu_count() or 1, cast=int)
+LOGIN_HASH_TIMEOUT = config('LOGIN_HASH_TIMEOUT', default=10, cast=float)
+LOGIN_TRUSTED_PROXIES = config('LOGIN_TRUSTED_PROXIES', default=0, cast=int)
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -167,13 +234,36 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
 }
 
+# Seconds an authenticated user's row (with role) stays in the per-process
+# auth cache (users/authentication.py). 0 loads the user on every request.
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=30, cast=int)
+
+# Seconds a role's permission set stays in the per-process cache
+# (users/permissions.py). Changes reach other worker processes immediately
+# only with a shared CACHES backend; otherwise within this many seconds.
+# 0 loads the permissions on every check.
+ROLE_PERMISSIONS_CACHE_TTL = config('ROLE_PERMISSIONS_CACHE_TTL', default=30, cast=int)
+
+# Request instrumentation (babelLibrary/instrumentation.py): per-view query
+# counts, SQL/serializer time and response sizes, reported in Server-Timing
+# headers (with DEBUG on or to staff users) and at /metrics. Requests slower
+# than SLOW_REQUEST_THRESHOLD_MS or running at least
+# SLOW_REQUEST_QUERY_THRESHOLD queries are logged with their SQL. /metrics
+# requires "Authorization: Bearer <METRICS_TOKEN>" and is closed when
+# METRICS_TOKEN is empty, unless DEBUG is on.
+INSTRUMENTATION_ENABLED = config('INSTRUMENTATION_ENABLED', default=True, cast=bool)
+SERVER_TIMING_HEADER = config('SERVER_TIMING_HEADER', default=True, cast=bool)
+SLOW_REQUEST_THRESHOLD_MS = config('SLOW_REQUEST_THRESHOLD_MS', default=500, cast=int)
+SLOW_REQUEST_QUERY_THRESHOLD = config('SLOW_REQUEST_QUERY_THRESHOLD', default=50, cast=int)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -209,18 +299,45 @@ SIMPLE_JWT = {
 
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
+    'users.login.PooledModelBackend',
 ]
 
 # Gemini API Configuration
 GEMINI_API_KEY = config('GEMINI_API_KEY', default='')
 GEMINI_MODEL = 'gemini-2.0-flash-exp'  # Default model
+# Retries for rate-limited or temporarily unavailable API calls, with exponential backoff
+GEMINI_MAX_RETRIES = config('GEMINI_MAX_RETRIES', default=2, cast=int)
+GEMINI_RETRY_BACKOFF = config('GEMINI_RETRY_BACKOFF', default=1.0, cast=float)  # seconds before the first retry
+# USD per million tokens, for the cost estimates shown with job telemetry
+GEMINI_INPUT_COST_PER_MILLION = config('GEMINI_INPUT_COST_PER_MILLION', default=0.10, cast=float)
+GEMINI_OUTPUT_COST_PER_MILLION = config('GEMINI_OUTPUT_COST_PER_MILLION', default=0.40, cast=float)
 
 # FlareSolverr Configuration
 # URL for FlareSolverr service used to bypass Cloudflare protection
 # Can be customized for different deployments (e.g., Docker: http://flaresolverr:8191/v1)
 FLARESOLVERR_URL = config('FLARESOLVERR_URL', default='http://localhost:8191/v1')
 
+# Offline stand-ins for benchmarking the translation pipeline (never enable in production)
+# FLARESOLVERR_BACKEND=stub serves saved HTML fixtures instead of calling FlareSolverr
+# GEMINI_BACKEND=stub returns deterministic text instead of calling the Gemini API
+FLARESOLVERR_BACKEND = config('FLARESOLVERR_BACKEND', default='flaresolverr')
+FLARESOLVERR_STUB_FIXTURES = config(
+    'FLARESOLVERR_STUB_FIXTURES', default=str(BASE_DIR / 'translator' / 'scraping' / 'fixtures')
+)
+FLARESOLVERR_STUB_LATENCY_MS = config('FLARESOLVERR_STUB_LATENCY_MS', default=0, cast=int)
+GEMINI_BACKEND = config('GEMINI_BACKEND', default='api')
+GEMINI_STUB_LATENCY_MS = config('GEMINI_STUB_LATENCY_MS', default=0, cast=int)
+GEMINI_STUB_LATENCY_PER_1K_CHARS_MS = config('GEMINI_STUB_LATENCY_PER_1K_CHARS_MS', default=0, cast=int)
+GEMINI_STUB_ERROR_RATE = config('GEMINI_STUB_ERROR_RATE', default=0.0, cast=float)
+
+# Translation job progress stream (translator/progress.py): seconds before a
+# quiet stream rereads the job from the database, between keep-alive comments,
+# and before the stream closes so the client reconnects; client retry delay.
+JOB_PROGRESS_POLL_INTERVAL = config('JOB_PROGRESS_POLL_INTERVAL', default=5, cast=float)
+JOB_PROGRESS_HEARTBEAT = config('JOB_PROGRESS_HEARTBEAT', default=15, cast=float)
+JOB_PROGRESS_STREAM_TIMEOUT = config('JOB_PROGRESS_STREAM_TIMEOUT', default=300, cast=float)
+JOB_PROGRESS_RETRY_MS = config('JOB_PROGRESS_RETRY_MS', default=2000, cast=int)
+
 # Scraper Security Configuration
 # Domain whitelist for SSRF protection (comma-separated list)
 # Set to empty string or omit to disable whitelist (NOT recommended for production)
@@ -3,13 +3,17 @@ URL configuration for the babelLibrary project.
 """
 from django.contrib import admin
 from django.urls import path, include
+from rest_framework_simplejwt.views import TokenRefreshView
 from users.views import login_view  # Import login_view here
+from .instrumentation import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     
     # API endpoints
     path('api/users/login/', login_view, name='login'), # Add the login path here
+    path('api/users/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/', include('users.urls')),
     path('api/library/', include('library.urls')),
     path('api/', include('comments.urls')),
@@ -0,0 +1,42 @@
+"""
+Version stamps for cache invalidation shared across apps.
+
+A stamp is a timestamp stored in the default cache under a scope name and an
+optional object id. Readers fold the current stamp into their cache keys;
+writers bump it, so stale entries are never read again and simply expire.
+Stamps strictly increase, which also makes them usable as Last-Modified
+values for conditional requests.
+"""
+from django.core.cache import cache
+from django.utils import timezone
+
+KEY_PREFIX = 'version'
+
+
+def _version_key(scope, object_id=None):
+    if object_id is None:
+        return f'{KEY_PREFIX}:{scope}'
+    return f'{KEY_PREFIX}:{scope}:{object_id}'
+
+
+def get_version(scope, object_id=None):
+    """Return the current version stamp for a scope, creating one if missing."""
+    key = _version_key(scope, object_id)
+    version = cache.get(key)
+    if version is None:
+        # Unknown scopes start at "now" so clients revalidate at most once.
+        version = timezone.now().timestamp()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(scope, object_id=None, modified_at=None):
+    """Advance the version stamp for a scope, invalidating everything keyed on it."""
+    key = _version_key(scope, object_id)
+    stamp = (modified_at or timezone.now()).timestamp()
+    current = cache.get(key)
+    if current is not None and stamp <= current:
+        # Stamps must strictly increase even when updated_at is not newer.
+        stamp = current + 0.001
+    cache.set(key, stamp, None)
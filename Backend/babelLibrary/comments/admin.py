@@ -1,11 +1,11 @@
 from django.contrib import admin
-from .models import Comment, CommentLike
+from .models import Comment, CommentLike, ModerationJob
 
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ['comment_id', 'user', 'text_preview', 'content_type', 'parent_comment', 'created_at']
-    list_filter = ['content_type', 'created_at']
+    list_display = ['comment_id', 'user', 'text_preview', 'content_type', 'parent_comment', 'is_hidden', 'created_at']
+    list_filter = ['content_type', 'is_hidden', 'created_at']
     search_fields = ['text', 'user__username']
     readonly_fields = ['comment_id', 'created_at', 'updated_at', 'like_count', 'reply_count']
     
@@ -20,3 +20,10 @@ class CommentLikeAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     search_fields = ['user__username', 'comment__text']
     readonly_fields = ['like_id', 'created_at']
+
+
+@admin.register(ModerationJob)
+class ModerationJobAdmin(admin.ModelAdmin):
+    list_display = ['job_id', 'action', 'status', 'processed', 'total', 'requested_by', 'created_at']
+    list_filter = ['action', 'status', 'created_at']
+    readonly_fields = ['job_id', 'total', 'processed', 'error_message', 'created_at', 'completed_at']
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CommentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'comments'
+
+    def ready(self):
+        """Connect comment counter signals."""
+        from . import signals  # noqa: F401
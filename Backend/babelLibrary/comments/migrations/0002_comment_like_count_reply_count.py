@@ -0,0 +1,46 @@
+# Generated by Django 4.2.25 on 2026-10-19 07:44
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    CommentLike = apps.get_model('comments', 'CommentLike')
+
+    likes = CommentLike.objects.filter(comment=OuterRef('pk')).order_by().values('comment').annotate(
+        total=Count('pk')
+    ).values('total')
+    replies = Comment.objects.filter(parent_comment=OuterRef('pk')).order_by().values('parent_comment').annotate(
+        total=Count('pk')
+    ).values('total')
+    Comment.objects.update(
+        like_count=Coalesce(Subquery(likes, output_field=IntegerField()), 0),
+        reply_count=Coalesce(Subquery(replies, output_field=IntegerField()), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_type', 'object_id', '-like_count'], name='comment_content_aeee8b_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
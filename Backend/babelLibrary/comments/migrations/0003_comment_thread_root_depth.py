@@ -0,0 +1,49 @@
+# Generated by Django 4.2.25 on 2026-10-19 07:46
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def backfill_threads(apps, schema_editor):
+    """Assign root_comment/depth one nesting level at a time (one UPDATE per level)."""
+    Comment = apps.get_model('comments', 'Comment')
+
+    # Direct replies to top-level comments: the parent is the root.
+    depth = 1
+    updated = Comment.objects.filter(
+        parent_comment__isnull=False, parent_comment__parent_comment__isnull=True
+    ).update(root_comment=models.F('parent_comment'), depth=depth)
+
+    # Deeper replies inherit the root of their parent.
+    parent_root = Comment.objects.filter(pk=OuterRef('parent_comment')).values('root_comment')[:1]
+    while updated:
+        depth += 1
+        updated = Comment.objects.filter(parent_comment__depth=depth - 1).update(
+            root_comment=Subquery(parent_root), depth=depth
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_comment_like_count_reply_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='root_comment',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_comments', to='comments.comment'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['root_comment', 'created_at'], name='comment_root_co_b63a45_idx'),
+        ),
+        migrations.RunPython(backfill_threads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.25 on 2026-10-19 07:49
+
+from django.db import migrations, models
+from django.db.models import CharField, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+
+def backfill_navigation_context(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Comment = apps.get_model('comments', 'Comment')
+    Series = apps.get_model('library', 'Series')
+    Chapter = apps.get_model('library', 'Chapter')
+
+    series_type = ContentType.objects.filter(app_label='library', model='series').first()
+    if series_type is not None:
+        Comment.objects.filter(content_type=series_type).update(
+            series_id=Subquery(Series.objects.filter(pk=OuterRef('object_id')).values('series_id')[:1]),
+            series_title=Subquery(Series.objects.filter(pk=OuterRef('object_id')).values('title')[:1]),
+        )
+
+    chapter_type = ContentType.objects.filter(app_label='library', model='chapter').first()
+    if chapter_type is not None:
+        chapters = Chapter.objects.filter(pk=OuterRef('object_id'))
+        Comment.objects.filter(content_type=chapter_type).update(
+            series_id=Subquery(chapters.values('series_id')[:1]),
+            series_title=Subquery(chapters.values('series__title')[:1]),
+            chapter_id=Subquery(chapters.values('chapter_id')[:1]),
+            chapter_title=Subquery(
+                chapters.annotate(number=Cast('chapter_number', CharField())).values('number')[:1]
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0003_comment_thread_root_depth'),
+        ('library', '0004_series_chapter_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='chapter_id',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='chapter_title',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='series_id',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='series_title',
+            field=models.CharField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['series_id', 'created_at'], name='comment_series__0511eb_idx'),
+        ),
+        migrations.RunPython(backfill_navigation_context, migrations.RunPython.noop),
+    ]
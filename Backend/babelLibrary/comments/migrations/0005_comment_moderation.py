@@ -0,0 +1,43 @@
+# Generated by Django 4.2.25 on 2026-10-19 07:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('comments', '0004_comment_navigation_context'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='is_hidden',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ModerationJob',
+            fields=[
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('action', models.CharField(choices=[('hide', 'Hide'), ('unhide', 'Unhide'), ('delete', 'Delete')], max_length=10)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('comment_ids', models.JSONField(blank=True, null=True)),
+                ('target_user_id', models.UUIDField(blank=True, null=True)),
+                ('thread_id', models.UUIDField(blank=True, null=True)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderation_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'moderationjob',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
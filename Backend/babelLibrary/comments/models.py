@@ -25,9 +25,41 @@ class Comment(models.Model):
         related_name='replies'
     )
     
+    # Thread bookkeeping: the top-level comment of this thread and the nesting
+    # level (0 for top-level comments). Set once when the comment is created.
+    root_comment = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='thread_comments'
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    
+    # Denormalized navigation context for comments on a series or chapter (or
+    # replies to them), copied from the target on create and kept current by
+    # comments/signals.py. Lets feeds link to the series/chapter without
+    # loading the generic content_object.
+    series_id = models.UUIDField(null=True, blank=True, editable=False)
+    series_title = models.CharField(max_length=255, blank=True, null=True, editable=False)
+    chapter_id = models.UUIDField(null=True, blank=True, editable=False)
+    chapter_title = models.CharField(max_length=255, blank=True, null=True, editable=False)
+    
+    # Soft-delete flag set by moderators (see comments/moderation.py). Hidden
+    # comments are omitted from non-staff listings and from reply counts.
+    is_hidden = models.BooleanField(default=False)
+    
+    # Denormalized counters, maintained by signal handlers in comments/signals.py
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    COUNTER_FIELDS = ('like_count', 'reply_count')
+    NAVIGATION_FIELDS = ('series_id', 'series_title', 'chapter_id', 'chapter_title')
+    
     class Meta:
         db_table = 'comment'
         ordering = ['-created_at']
@@ -35,8 +67,38 @@ class Comment(models.Model):
             models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['parent_comment']),
             models.Index(fields=['user']),
+            models.Index(fields=['content_type', 'object_id', '-like_count']),
+            models.Index(fields=['root_comment', 'created_at']),
+            models.Index(fields=['series_id', 'created_at']),
         ]
     
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.parent_comment_id:
+            parent = self.parent_comment
+            self.root_comment_id = parent.root_comment_id or parent.comment_id
+            self.depth = parent.depth + 1
+        if self._state.adding:
+            self._set_navigation_context()
+        # Counters and navigation context only change through queryset updates;
+        # never write back a stale in-memory value when a comment is edited.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            managed = self.COUNTER_FIELDS + self.NAVIGATION_FIELDS
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in managed
+            ]
+        super().save(*args, **kwargs)
+    
+    def _set_navigation_context(self):
+        from .targets import navigation_context
+        parent = self.parent_comment if self.parent_comment_id else None
+        if parent is not None and (parent.content_type_id, parent.object_id) == (self.content_type_id, self.object_id):
+            context = {field: getattr(parent, field) for field in self.NAVIGATION_FIELDS}
+        else:
+            context = navigation_context(ContentType.objects.get_for_id(self.content_type_id), self.object_id)
+        for field, value in context.items():
+            setattr(self, field, value)
+    
     def __str__(self):
         try:
             content_display = self.content_object if self.content_object else f"{self.content_type.model}:{self.object_id}"
@@ -44,16 +106,6 @@ class Comment(models.Model):
         except Exception:
             # Fallback if content_object is deleted or causes an error
             return f"Comment by {self.user.username} on {self.content_type.model}:{self.object_id}"
-    
-    @property
-    def like_count(self):
-        """Get total likes for this comment."""
-        return self.likes.count()
-    
-    @property
-    def reply_count(self):
-        """Get total replies to this comment."""
-        return self.replies.count()
 
 
 class CommentLike(models.Model):
@@ -76,3 +128,53 @@ class CommentLike(models.Model):
         except Exception:
             # Fallback if user or comment is deleted or causes an error
             return f"CommentLike {self.like_id}"
+
+
+class ModerationJob(models.Model):
+    """Tracks a bulk moderation operation (hide, unhide or delete) and its progress."""
+    ACTION_CHOICES = [
+        ('hide', 'Hide'),
+        ('unhide', 'Unhide'),
+        ('delete', 'Delete'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='moderation_jobs'
+    )
+    
+    # Exactly one selection is set: explicit comment ids, every comment by a
+    # user, or a whole thread (its top-level comment and everything under it).
+    comment_ids = models.JSONField(blank=True, null=True)
+    target_user_id = models.UUIDField(blank=True, null=True)
+    thread_id = models.UUIDField(blank=True, null=True)
+    
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True, null=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'moderationjob'
+        ordering = ['-created_at']
+    
+    @property
+    def progress_percentage(self):
+        """Calculate completion percentage."""
+        if self.total == 0:
+            return 100 if self.status == 'completed' else 0
+        return (self.processed / self.total) * 100
+    
+    def __str__(self):
+        return f"{self.get_action_display()} job {self.job_id} ({self.status})"
@@ -0,0 +1,212 @@
+"""
+Bulk comment moderation.
+
+Comment.delete() goes through Django's deletion collector, which loads every
+reply and like into memory and sends per-row signals before deleting. The
+operations here work on sets of ids instead: selections are expanded level by
+level (one query per nesting depth), rows are removed with plain
+DELETE ... WHERE id IN (...) statements in batches, and the denormalized
+counters of surviving comments are recomputed once per batch.
+
+Large selections run in a background thread as a ModerationJob whose
+processed/total fields report progress.
+"""
+import logging
+from threading import Thread
+
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Comment, CommentLike, ModerationJob
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+# Jobs selecting more comments than this run in a background thread.
+ASYNC_THRESHOLD = 500
+
+
+def select_comments(job):
+    """Return the queryset of comments directly selected by a moderation job."""
+    if job.comment_ids is not None:
+        return Comment.objects.filter(pk__in=job.comment_ids)
+    if job.target_user_id is not None:
+        return Comment.objects.filter(user_id=job.target_user_id)
+    return Comment.objects.filter(pk=job.thread_id) | Comment.objects.filter(root_comment_id=job.thread_id)
+
+
+def expand_to_subtrees(comment_ids):
+    """Return comment_ids plus every reply nested beneath them."""
+    selected = set(comment_ids)
+    frontier = selected
+    while frontier:
+        children = set(
+            Comment.objects.filter(parent_comment__in=frontier).values_list('pk', flat=True)
+        ) - selected
+        selected |= children
+        frontier = children
+    return selected
+
+
+def _batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def _raw_delete(queryset):
+    """
+    Run a plain DELETE ... WHERE for queryset, bypassing the deletion collector.
+
+    QuerySet._raw_delete() is private Django API (present through 4.2 and 5.x;
+    comments/tests.py pins it). Compared with QuerySet.delete() it skips:
+
+    - on_delete handling. Nothing cascades, so callers delete dependent rows
+      first: the CommentLike rows of the batch, and replies (parent_comment
+      and root_comment point at Comment) by deleting whole subtrees deepest
+      first.
+    - pre_delete/post_delete signals. The only receivers are
+      decrement_like_count and decrement_reply_count in comments/signals.py;
+      callers recompute those counters with recount_likes/recount_replies.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def recount_replies(comment_ids):
+    """Recompute reply_count (visible replies only) for the given comments."""
+    visible_replies = Comment.objects.filter(
+        parent_comment=OuterRef('pk'), is_hidden=False
+    ).order_by().values('parent_comment').annotate(total=Count('pk')).values('total')
+    Comment.objects.filter(pk__in=comment_ids).update(
+        reply_count=Coalesce(Subquery(visible_replies, output_field=IntegerField()), 0)
+    )
+
+
+def recount_likes(comment_ids):
+    """Recompute like_count for the given comments."""
+    likes = CommentLike.objects.filter(
+        comment=OuterRef('pk')
+    ).order_by().values('comment').annotate(total=Count('pk')).values('total')
+    Comment.objects.filter(pk__in=comment_ids).update(
+        like_count=Coalesce(Subquery(likes, output_field=IntegerField()), 0)
+    )
+
+
+def set_hidden(comment_ids, hidden=True, progress=None):
+    """
+    Hide (soft-delete) or unhide comments in batches.
+
+    comment_ids should include every nested reply (see expand_to_subtrees),
+    so a hidden comment takes its replies with it.
+    """
+    for batch in _batches(comment_ids):
+        with transaction.atomic():
+            Comment.objects.filter(pk__in=batch).update(is_hidden=hidden)
+            parent_ids = Comment.objects.filter(
+                pk__in=batch, parent_comment__isnull=False
+            ).values_list('parent_comment_id', flat=True)
+            recount_replies(set(parent_ids))
+        if progress:
+            progress(len(batch))
+
+
+def delete_comments(comment_ids, progress=None):
+    """
+    Delete comments with set-based SQL.
+
+    comment_ids must already include every nested reply (see
+    expand_to_subtrees). Rows are deleted deepest first so each batch only
+    removes comments whose replies are already gone.
+    """
+    depths = dict(Comment.objects.filter(pk__in=comment_ids).values_list('pk', 'depth'))
+    ordered = sorted(depths, key=depths.get, reverse=True)
+    for batch in _batches(ordered):
+        with transaction.atomic():
+            parent_ids = set(Comment.objects.filter(
+                pk__in=batch, parent_comment__isnull=False
+            ).values_list('parent_comment_id', flat=True))
+            _raw_delete(CommentLike.objects.filter(comment_id__in=batch))
+            _raw_delete(Comment.objects.filter(pk__in=batch))
+            recount_replies(parent_ids)
+        if progress:
+            progress(len(batch))
+    return len(ordered)
+
+
+def delete_thread(comment):
+    """Delete a comment and all of its replies."""
+    return delete_comments(expand_to_subtrees([comment.pk]))
+
+
+def delete_user_likes(user_id):
+    """Remove a user's likes and recount the comments they were on."""
+    with transaction.atomic():
+        liked_ids = set(CommentLike.objects.filter(user_id=user_id).values_list('comment_id', flat=True))
+        _raw_delete(CommentLike.objects.filter(user_id=user_id))
+        recount_likes(liked_ids)
+
+
+def run_job(job_id):
+    """Execute a moderation job, recording progress as batches complete."""
+    job = ModerationJob.objects.get(pk=job_id)
+    ModerationJob.objects.filter(pk=job_id).update(status='running')
+
+    def progress(count):
+        job.processed += count
+        ModerationJob.objects.filter(pk=job_id).update(processed=job.processed)
+
+    try:
+        # Every action applies to whole subtrees: replies are deleted, hidden
+        # or restored together with the comment they answer.
+        selected = expand_to_subtrees(select_comments(job).values_list('pk', flat=True))
+        ModerationJob.objects.filter(pk=job_id).update(total=len(selected))
+
+        if job.action == 'delete':
+            delete_comments(selected, progress=progress)
+            if job.target_user_id is not None:
+                delete_user_likes(job.target_user_id)
+        else:
+            set_hidden(selected, hidden=(job.action == 'hide'), progress=progress)
+
+        ModerationJob.objects.filter(pk=job_id).update(status='completed', completed_at=timezone.now())
+        logger.info(f"Moderation job {job_id} {job.action} processed {job.processed} comments")
+    except Exception as e:
+        logger.exception(f"Moderation job {job_id} failed")
+        ModerationJob.objects.filter(pk=job_id).update(
+            status='failed', error_message=str(e), completed_at=timezone.now()
+        )
+
+
+def _run_job_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        connection.close()
+
+
+def estimate_size(job):
+    """
+    Count the comments a job will touch once selections are expanded to
+    their subtrees, in one query.
+
+    Replies are found through root_comment, so this is exact for selected
+    top-level comments; a selected reply counts without its own replies.
+    """
+    selected = select_comments(job).values('pk')
+    return Comment.objects.filter(Q(pk__in=selected) | Q(root_comment__in=selected)).count()
+
+
+def dispatch_job(job):
+    """
+    Run a moderation job inline when it is small, otherwise in a background
+    thread. Returns True if the job was started asynchronously.
+    """
+    if estimate_size(job) <= ASYNC_THRESHOLD:
+        run_job(job.job_id)
+        return False
+    thread = Thread(target=_run_job_in_thread, args=(job.job_id,))
+    thread.daemon = True
+    thread.start()
+    return True
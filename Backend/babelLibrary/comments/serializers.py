@@ -1,6 +1,67 @@
 from rest_framework import serializers
+from django.db import models
+from .models import Comment, CommentLike, ModerationJob
 from django.contrib.contenttypes.models import ContentType
-from .models import Comment, CommentLike
+from .targets import CONTENT_TARGETS, get_content_type
+
+
+class LikedCommentResolver:
+    """
+    Answers "has the requesting user liked this comment?" for a whole page of
+    comments with a single query instead of one EXISTS query per comment.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._checked = set()
+        self._liked = set()
+
+    def prime(self, comment_ids):
+        """Resolve likes for any of comment_ids not already looked up."""
+        missing = set(comment_ids) - self._checked
+        if not missing:
+            return
+        self._checked.update(missing)
+        if self.user is not None and self.user.is_authenticated:
+            self._liked.update(
+                CommentLike.objects.filter(
+                    user=self.user, comment_id__in=missing
+                ).values_list('comment_id', flat=True)
+            )
+
+    def is_liked(self, comment):
+        self.prime([comment.comment_id])
+        return comment.comment_id in self._liked
+
+
+def get_liked_resolver(context):
+    """Return the per-request LikedCommentResolver stored in serializer context."""
+    if 'liked_comments' not in context:
+        request = context.get('request')
+        context['liked_comments'] = LikedCommentResolver(request.user if request else None)
+    return context['liked_comments']
+
+
+def _prefetched_replies(comment):
+    """Return a comment's replies only if they were prefetched (never queries)."""
+    if hasattr(comment, 'reply_preview'):
+        return comment.reply_preview
+    if 'replies' in getattr(comment, '_prefetched_objects_cache', {}):
+        return comment.replies.all()
+    return []
+
+
+class CommentListSerializer(serializers.ListSerializer):
+    """List serializer that resolves per-user like state for the whole page up front."""
+
+    def to_representation(self, data):
+        comments = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        comment_ids = []
+        for comment in comments:
+            comment_ids.append(comment.comment_id)
+            comment_ids.extend(reply.comment_id for reply in _prefetched_replies(comment))
+        get_liked_resolver(self.context).prime(comment_ids)
+        return super().to_representation(comments)
 
 
 class CommentLikeSerializer(serializers.ModelSerializer):
@@ -26,95 +87,38 @@ class CommentSerializer(serializers.ModelSerializer):
     object_id = serializers.UUIDField(write_only=True, required=False)
     content_type_display = serializers.SerializerMethodField(read_only=True)
     
-    # Additional fields for navigation context
-    series_id = serializers.SerializerMethodField(read_only=True)
-    series_title = serializers.SerializerMethodField(read_only=True)
-    chapter_id = serializers.SerializerMethodField(read_only=True)
-    chapter_title = serializers.SerializerMethodField(read_only=True)
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._content_object_cache = {}
-    
     class Meta:
         model = Comment
         fields = [
             'comment_id', 'user', 'user_username', 'text', 
             'content_type', 'object_id', 'content_type_display',
-            'parent_comment', 'like_count', 'reply_count', 
-            'is_liked_by_user', 'replies', 'created_at', 'updated_at',
+            'parent_comment', 'root_comment', 'depth', 'like_count', 'reply_count', 
+            'is_liked_by_user', 'replies', 'is_hidden', 'created_at', 'updated_at',
+            'series_id', 'series_title', 'chapter_id', 'chapter_title'
+        ]
+        read_only_fields = [
+            'comment_id', 'user', 'like_count', 'reply_count', 'is_hidden', 'created_at', 'updated_at',
             'series_id', 'series_title', 'chapter_id', 'chapter_title'
         ]
-        read_only_fields = ['comment_id', 'user', 'like_count', 'reply_count', 'created_at', 'updated_at']
+        list_serializer_class = CommentListSerializer
     
     def get_content_type_display(self, obj):
         """Return a human-readable content type."""
-        return obj.content_type.model
-    
-    def _get_content_object(self, obj):
-        """Cache and return the content object to avoid multiple queries."""
-        # First check if the view has already cached the content object
-        if hasattr(obj, '_cached_content_object'):
-            return obj._cached_content_object
-        
-        # Otherwise use instance-level cache
-        cache_key = (obj.content_type.id, obj.object_id)
-        if cache_key not in self._content_object_cache:
-            try:
-                # Use the generic relation to get the content object
-                content_obj = obj.content_type.get_object_for_this_type(pk=obj.object_id)
-                self._content_object_cache[cache_key] = content_obj
-            except Exception:
-                self._content_object_cache[cache_key] = None
-        return self._content_object_cache[cache_key]
-    
-    def get_series_id(self, obj):
-        """Get the series ID from the content object."""
-        if obj.content_type.model == 'series':
-            return str(obj.object_id)
-        elif obj.content_type.model == 'chapter':
-            content_obj = self._get_content_object(obj)
-            if content_obj and hasattr(content_obj, 'series'):
-                return str(content_obj.series.series_id)
-        return None
-    
-    def get_series_title(self, obj):
-        """Get the series title from the content object."""
-        if obj.content_type.model == 'series':
-            content_obj = self._get_content_object(obj)
-            if content_obj and hasattr(content_obj, 'title'):
-                return content_obj.title
-        elif obj.content_type.model == 'chapter':
-            content_obj = self._get_content_object(obj)
-            if content_obj and hasattr(content_obj, 'series'):
-                return content_obj.series.title
-        return None
-    
-    def get_chapter_id(self, obj):
-        """Get the chapter ID if the comment is on a chapter."""
-        if obj.content_type.model == 'chapter':
-            return str(obj.object_id)
-        return None
-    
-    def get_chapter_title(self, obj):
-        """Get the chapter number if the comment is on a chapter."""
-        if obj.content_type.model == 'chapter':
-            content_obj = self._get_content_object(obj)
-            if content_obj and hasattr(content_obj, 'chapter_number'):
-                return str(content_obj.chapter_number)
-        return None
+        return ContentType.objects.get_for_id(obj.content_type_id).model
     
     def get_is_liked_by_user(self, obj):
         """Check if the current user has liked this comment."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
-        return False
+        return get_liked_resolver(self.context).is_liked(obj)
     
     def get_replies(self, obj):
-        """Get nested replies (only one level deep to avoid infinite recursion)."""
-        if obj.parent_comment is None:
-            replies = obj.replies.all()
+        """
+        Get nested replies (only one level deep to avoid infinite recursion).
+        Views prefetch a bounded preview; compare with reply_count to page the rest.
+        """
+        if obj.parent_comment_id is None:
+            replies = getattr(obj, 'reply_preview', None)
+            if replies is None:
+                replies = obj.replies.all()
             return CommentReplySerializer(replies, many=True, context=self.context).data
         return []
 
@@ -129,17 +133,15 @@ class CommentReplySerializer(serializers.ModelSerializer):
         model = Comment
         fields = [
             'comment_id', 'user', 'user_username', 'text', 
-            'parent_comment', 'like_count', 'is_liked_by_user', 
+            'parent_comment', 'root_comment', 'depth', 'like_count', 'is_liked_by_user', 
             'created_at', 'updated_at'
         ]
         read_only_fields = ['comment_id', 'user', 'like_count', 'created_at', 'updated_at']
+        list_serializer_class = CommentListSerializer
     
     def get_is_liked_by_user(self, obj):
         """Check if the current user has liked this comment."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
-        return False
+        return get_liked_resolver(self.context).is_liked(obj)
 
 
 class CommentCreateUpdateSerializer(serializers.ModelSerializer):
@@ -154,10 +156,9 @@ class CommentCreateUpdateSerializer(serializers.ModelSerializer):
     
     def validate_content_type(self, value):
         """Validate that the content type is one of the allowed models."""
-        allowed_models = ['series', 'chapter', 'user']
-        if value.lower() not in allowed_models:
+        if value.lower() not in CONTENT_TARGETS:
             raise serializers.ValidationError(
-                f"Content type must be one of: {', '.join(allowed_models)}"
+                f"Content type must be one of: {', '.join(CONTENT_TARGETS)}"
             )
         return value.lower()
     
@@ -172,19 +173,9 @@ class CommentCreateUpdateSerializer(serializers.ModelSerializer):
             validated_data['content_type'] = parent_comment.content_type
             validated_data['object_id'] = parent_comment.object_id
         elif content_type_str and object_id:
-            # Get the ContentType object based on the model name
-            content_type = None
-            try:
-                if content_type_str == 'series':
-                    content_type = ContentType.objects.get(app_label='library', model='series')
-                elif content_type_str == 'chapter':
-                    content_type = ContentType.objects.get(app_label='library', model='chapter')
-                elif content_type_str == 'user':
-                    content_type = ContentType.objects.get(app_label='users', model='user')
-                else:
-                    raise serializers.ValidationError(f"Invalid content type: {content_type_str}")
-            except ContentType.DoesNotExist:
-                raise serializers.ValidationError(f"Content type not found: {content_type_str}")
+            content_type = get_content_type(content_type_str)
+            if content_type is None:
+                raise serializers.ValidationError(f"Invalid content type: {content_type_str}")
             
             validated_data['content_type'] = content_type
             validated_data['object_id'] = object_id
@@ -194,3 +185,41 @@ class CommentCreateUpdateSerializer(serializers.ModelSerializer):
             )
         
         return super().create(validated_data)
+
+
+class ModerationJobSerializer(serializers.ModelSerializer):
+    """Serializer for bulk moderation jobs and their progress."""
+    progress_percentage = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = ModerationJob
+        fields = [
+            'job_id', 'action', 'status', 'requested_by',
+            'comment_ids', 'target_user_id', 'thread_id',
+            'total', 'processed', 'progress_percentage', 'error_message',
+            'created_at', 'completed_at'
+        ]
+        read_only_fields = [
+            'job_id', 'status', 'requested_by', 'total', 'processed',
+            'error_message', 'created_at', 'completed_at'
+        ]
+    
+    def validate_comment_ids(self, value):
+        if value is None:
+            return value
+        if not isinstance(value, list):
+            raise serializers.ValidationError("comment_ids must be a list of comment IDs.")
+        field = serializers.UUIDField()
+        return [str(field.to_internal_value(comment_id)) for comment_id in value]
+    
+    def validate(self, data):
+        """Require exactly one selection: comment_ids, target_user_id or thread_id."""
+        selections = [
+            name for name in ('comment_ids', 'target_user_id', 'thread_id')
+            if data.get(name) is not None
+        ]
+        if len(selections) != 1:
+            raise serializers.ValidationError(
+                "Provide exactly one of comment_ids, target_user_id or thread_id"
+            )
+        return data
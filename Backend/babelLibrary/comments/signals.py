@@ -0,0 +1,60 @@
+"""
+Signal handlers that keep denormalized Comment columns current.
+
+Counters (like_count, reply_count) are adjusted with F() expressions so
+concurrent likes cannot lose updates. When a comment is deleted, the
+cascaded likes/replies update a row that no longer exists, which is a
+harmless no-op.
+
+Navigation context (series_title, chapter_title) is rewritten when the
+series or chapter it was copied from changes.
+"""
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from library.models import Series, Chapter
+from .models import Comment, CommentLike
+
+
+@receiver(post_save, sender=CommentLike)
+def increment_like_count(sender, instance, created, **kwargs):
+    if created:
+        Comment.objects.filter(pk=instance.comment_id).update(like_count=F('like_count') + 1)
+
+
+@receiver(post_delete, sender=CommentLike)
+def decrement_like_count(sender, instance, **kwargs):
+    Comment.objects.filter(pk=instance.comment_id, like_count__gt=0).update(like_count=F('like_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_reply_count(sender, instance, created, **kwargs):
+    if created and instance.parent_comment_id:
+        Comment.objects.filter(pk=instance.parent_comment_id).update(reply_count=F('reply_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_reply_count(sender, instance, **kwargs):
+    # Hidden replies were already removed from the count when they were hidden.
+    if instance.parent_comment_id and not instance.is_hidden:
+        Comment.objects.filter(
+            pk=instance.parent_comment_id, reply_count__gt=0
+        ).update(reply_count=F('reply_count') - 1)
+
+
+@receiver(post_save, sender=Series)
+def refresh_series_title(sender, instance, created, **kwargs):
+    if not created:
+        Comment.objects.filter(series_id=instance.series_id).exclude(
+            series_title=instance.title
+        ).update(series_title=instance.title)
+
+
+@receiver(post_save, sender=Chapter)
+def refresh_chapter_title(sender, instance, created, **kwargs):
+    if not created:
+        chapter_title = str(instance.chapter_number)
+        Comment.objects.filter(chapter_id=instance.chapter_id).exclude(
+            chapter_title=chapter_title
+        ).update(chapter_title=chapter_title)
@@ -0,0 +1,55 @@
+"""
+Registry of the models comments can be attached to.
+
+Short names used by the API ('series', 'chapter', 'user') resolve to
+ContentTypes through Django's ContentType cache, so after the first lookup
+no request queries the django_content_type table again.
+"""
+from django.contrib.contenttypes.models import ContentType
+
+from .models import Comment
+
+CONTENT_TARGETS = {
+    'series': ('library', 'series'),
+    'chapter': ('library', 'chapter'),
+    'user': ('users', 'user'),
+}
+
+
+def get_content_type(name):
+    """Return the ContentType for a target short name, or None if unsupported."""
+    natural_key = CONTENT_TARGETS.get((name or '').lower())
+    if natural_key is None:
+        return None
+    try:
+        # get_by_natural_key is served from the process-wide ContentType cache.
+        return ContentType.objects.get_by_natural_key(*natural_key)
+    except ContentType.DoesNotExist:
+        return None
+
+
+def navigation_context(content_type, object_id):
+    """
+    Return the series/chapter navigation fields stored on a comment.
+
+    Comments on a series or chapter record which series (and chapter) they
+    belong to, so feeds can link to them without loading the generic target.
+    Comments on users, or on targets that no longer exist, get all None.
+    """
+    context = dict.fromkeys(Comment.NAVIGATION_FIELDS)
+    if content_type.app_label != 'library':
+        return context
+    if content_type.model == 'series':
+        title = content_type.model_class().objects.filter(pk=object_id).values_list('title', flat=True).first()
+        if title is not None:
+            context.update(series_id=object_id, series_title=title)
+    elif content_type.model == 'chapter':
+        chapter = content_type.model_class().objects.filter(pk=object_id).values(
+            'series_id', 'series__title', 'chapter_number'
+        ).first()
+        if chapter is not None:
+            context.update(
+                series_id=chapter['series_id'], series_title=chapter['series__title'],
+                chapter_id=object_id, chapter_title=str(chapter['chapter_number']),
+            )
+    return context
@@ -1 +1,425 @@
-# Create your tests here.
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from library.models import Series, Chapter
+from library.tests import QueryBudgetMixin
+from users.models import Role, User
+from .models import Comment, CommentLike, ModerationJob
+from . import moderation
+from .targets import get_content_type
+
+
+class CommentTestMixin:
+    """Shared fixtures: a series with top-level comments, each with replies."""
+
+    def setUp(self):
+        self.client = APIClient()
+        role = Role.objects.create(name='Reader')
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw', role=role)
+        self.other = User.objects.create_user('other', 'other@example.com', 'pw', role=role)
+        self.series = Series.objects.create(title='Commented Series')
+        self.content_type = ContentType.objects.get_for_model(Series)
+
+    def _comment(self, text, parent=None, user=None):
+        return Comment.objects.create(
+            user=user or self.other, text=text, content_type=self.content_type,
+            object_id=self.series.series_id, parent_comment=parent
+        )
+
+    def _thread(self, comment_count, replies_per_comment):
+        comments = []
+        for i in range(comment_count):
+            comment = self._comment(f'Comment {i}')
+            for j in range(replies_per_comment):
+                self._comment(f'Reply {i}.{j}', parent=comment)
+            comments.append(comment)
+        return comments
+
+    def _by_content(self):
+        return self.client.get('/api/comments/by_content/', {
+            'content_type': 'series', 'object_id': str(self.series.series_id)
+        })
+
+
+class LikedByUserTests(CommentTestMixin, TestCase):
+    """is_liked_by_user is resolved for a whole page with one query."""
+
+    def test_liked_state_is_reported_for_comments_and_replies(self):
+        comment = self._thread(1, 2)[0]
+        reply = comment.replies.first()
+        CommentLike.objects.create(comment=comment, user=self.user)
+        CommentLike.objects.create(comment=reply, user=self.user)
+        self.client.force_authenticate(self.user)
+
+        data = self._by_content().data['results'][0]
+
+        self.assertTrue(data['is_liked_by_user'])
+        liked_replies = {r['comment_id']: r['is_liked_by_user'] for r in data['replies']}
+        self.assertTrue(liked_replies[str(reply.comment_id)])
+        self.assertEqual(sum(liked_replies.values()), 1)
+
+    def test_query_count_does_not_grow_with_replies(self):
+        self.client.force_authenticate(self.user)
+        self._thread(2, 2)
+        with CaptureQueriesContext(connection) as small:
+            self._by_content()
+
+        self._thread(8, 5)
+        with CaptureQueriesContext(connection) as large:
+            self._by_content()
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class CommentCounterTests(CommentTestMixin, TestCase):
+    """like_count and reply_count are stored columns kept current by signals."""
+
+    def test_like_and_unlike_update_like_count(self):
+        comment = self._comment('Popular')
+        self.client.force_authenticate(self.user)
+
+        self.client.post(f'/api/comments/{comment.comment_id}/like/')
+        comment.refresh_from_db()
+        self.assertEqual(comment.like_count, 1)
+
+        self.client.delete(f'/api/comments/{comment.comment_id}/unlike/')
+        comment.refresh_from_db()
+        self.assertEqual(comment.like_count, 0)
+
+    def test_replies_update_reply_count(self):
+        comment = self._thread(1, 3)[0]
+        comment.refresh_from_db()
+        self.assertEqual(comment.reply_count, 3)
+
+        comment.replies.first().delete()
+        comment.refresh_from_db()
+        self.assertEqual(comment.reply_count, 2)
+
+    def test_editing_a_comment_keeps_counters(self):
+        comment = self._comment('Original')
+        CommentLike.objects.create(comment=comment, user=self.user)
+
+        comment.text = 'Edited'
+        comment.save()
+        comment.refresh_from_db()
+        self.assertEqual(comment.like_count, 1)
+
+    def test_order_by_like_count(self):
+        quiet = self._comment('Quiet')
+        popular = self._comment('Popular')
+        CommentLike.objects.create(comment=popular, user=self.user)
+        CommentLike.objects.create(comment=popular, user=self.other)
+
+        response = self.client.get('/api/comments/by_content/', {
+            'content_type': 'series', 'object_id': str(self.series.series_id), 'ordering': '-like_count'
+        })
+
+        ids = [c['comment_id'] for c in response.data['results']]
+        self.assertEqual(ids, [str(popular.comment_id), str(quiet.comment_id)])
+        self.assertEqual(response.data['results'][0]['like_count'], 2)
+
+
+class ThreadTests(CommentTestMixin, TestCase):
+    """Threads record their root and depth, and listings carry bounded reply previews."""
+
+    def test_nested_reply_records_root_and_depth(self):
+        root = self._comment('Root')
+        reply = self._comment('Reply', parent=root)
+        nested = self._comment('Nested', parent=reply)
+
+        self.assertEqual((reply.root_comment_id, reply.depth), (root.comment_id, 1))
+        self.assertEqual((nested.root_comment_id, nested.depth), (root.comment_id, 2))
+
+    def test_reply_preview_is_bounded(self):
+        self._thread(2, 10)
+
+        response = self._by_content()
+
+        for comment in response.data['results']:
+            self.assertEqual(comment['reply_count'], 10)
+            self.assertEqual(len(comment['replies']), 3)
+
+    def test_thread_replies_include_nested_comments(self):
+        root = self._comment('Root')
+        reply = self._comment('Reply', parent=root)
+        self._comment('Nested', parent=reply)
+
+        direct = self.client.get(f'/api/comments/{root.comment_id}/replies/')
+        thread = self.client.get(f'/api/comments/{root.comment_id}/replies/', {'thread': 'true'})
+
+        self.assertEqual([c['text'] for c in direct.data['results']], ['Reply'])
+        self.assertEqual([c['text'] for c in thread.data['results']], ['Reply', 'Nested'])
+
+
+class ContentTargetTests(CommentTestMixin, TestCase):
+    """Content types resolve from the registry and comments carry series/chapter context."""
+
+    def _comment_on(self, target):
+        return Comment.objects.create(
+            user=self.user, text='On target', content_type=ContentType.objects.get_for_model(target),
+            object_id=target.pk
+        )
+
+    def _by_user(self):
+        return self.client.get('/api/comments/by_user/', {'user': str(self.user.user_id)})
+
+    def test_short_names_resolve_without_queries(self):
+        get_content_type('series')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_content_type('Series'), self.content_type)
+        self.assertIsNone(get_content_type('genre'))
+
+    def test_by_user_reports_chapter_and_series_context(self):
+        chapter = Chapter.objects.create(series=self.series, chapter_number=7, title='Seven', content='Text')
+        self._comment_on(chapter)
+        self._comment_on(self.series)
+        self.client.force_authenticate(self.user)
+
+        results = self._by_user().data['results']
+
+        by_type = {c['content_type_display']: c for c in results}
+        self.assertEqual(by_type['chapter']['series_title'], 'Commented Series')
+        self.assertEqual(by_type['chapter']['chapter_title'], '7')
+        self.assertEqual(by_type['series']['series_title'], 'Commented Series')
+
+    def test_replies_inherit_context_and_renames_propagate(self):
+        chapter = Chapter.objects.create(series=self.series, chapter_number=7, title='Seven', content='Text')
+        comment = self._comment_on(chapter)
+        reply = Comment.objects.create(
+            user=self.other, text='Reply', content_type=comment.content_type,
+            object_id=comment.object_id, parent_comment=comment
+        )
+        self.assertEqual(reply.series_id, self.series.series_id)
+        self.assertEqual(reply.chapter_id, chapter.chapter_id)
+
+        self.series.title = 'Renamed Series'
+        self.series.save()
+        chapter.chapter_number = 8
+        chapter.save()
+
+        reply.refresh_from_db()
+        self.assertEqual((reply.series_title, reply.chapter_title), ('Renamed Series', '8'))
+
+    def test_filter_by_series_includes_chapter_comments(self):
+        chapter = Chapter.objects.create(series=self.series, chapter_number=1, title='One', content='Text')
+        self._comment_on(chapter)
+        self._comment_on(self.series)
+        self._comment_on(Series.objects.create(title='Elsewhere'))
+
+        response = self.client.get('/api/comments/', {'series_id': str(self.series.series_id)})
+
+        self.assertEqual(response.data['count'], 2)
+
+    def test_query_count_does_not_grow_with_targets(self):
+        self.client.force_authenticate(self.user)
+        self._comment_on(Series.objects.create(title='First'))
+        with CaptureQueriesContext(connection) as small:
+            self._by_user()
+
+        for i in range(5):
+            series = Series.objects.create(title=f'Series {i}')
+            self._comment_on(series)
+            self._comment_on(Chapter.objects.create(series=series, chapter_number=1, title='One', content='Text'))
+        with CaptureQueriesContext(connection) as large:
+            self._by_user()
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class ModerationTests(CommentTestMixin, TestCase):
+    """Bulk moderation hides or deletes comments with set-based queries."""
+
+    def setUp(self):
+        super().setUp()
+        self.staff = User.objects.create_user(
+            'moderator', 'moderator@example.com', 'pw', role=self.user.role, is_staff=True
+        )
+
+    def _moderate(self, **data):
+        self.client.force_authenticate(self.staff)
+        return self.client.post('/api/moderation-jobs/', data, format='json')
+
+    def test_hide_many_removes_comments_from_listings_and_counts(self):
+        comment = self._thread(1, 3)[0]
+        reply = comment.replies.first()
+
+        response = self._moderate(action='hide', comment_ids=[str(reply.comment_id)])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['status'], response.data['processed']), ('completed', 1))
+        comment.refresh_from_db()
+        self.assertEqual(comment.reply_count, 2)
+        self.client.force_authenticate(None)
+        replies = self._by_content().data['results'][0]['replies']
+        self.assertNotIn(str(reply.comment_id), [r['comment_id'] for r in replies])
+
+    def test_hide_covers_replies(self):
+        root = self._comment('Root')
+        reply = self._comment('Reply', parent=root)
+        nested = self._comment('Nested', parent=reply)
+
+        response = self._moderate(action='hide', comment_ids=[str(root.comment_id)])
+
+        self.assertEqual(response.data['processed'], 3)
+        self.assertFalse(Comment.objects.filter(is_hidden=False).exists())
+
+        self._moderate(action='unhide', comment_ids=[str(root.comment_id)])
+        self.assertEqual(Comment.objects.filter(is_hidden=False).count(), 3)
+        reply.refresh_from_db()
+        self.assertEqual(reply.reply_count, 1)
+        self.assertTrue(Comment.objects.filter(pk=nested.pk, is_hidden=False).exists())
+
+    def test_delete_by_user_removes_comments_replies_and_likes(self):
+        spam = self._comment('Spam', user=self.user)
+        self._comment('Reply to spam', parent=spam)
+        keep = self._comment('Legit')
+        CommentLike.objects.create(comment=keep, user=self.user)
+
+        response = self._moderate(action='delete', target_user_id=str(self.user.user_id))
+
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(list(Comment.objects.all()), [keep])
+        keep.refresh_from_db()
+        self.assertEqual(keep.like_count, 0)
+
+    def test_delete_thread_removes_nested_replies(self):
+        root = self._comment('Root')
+        nested = self._comment('Nested', parent=self._comment('Reply', parent=root))
+        CommentLike.objects.create(comment=nested, user=self.user)
+        other = self._comment('Other thread')
+
+        self._moderate(action='delete', thread_id=str(root.comment_id))
+
+        self.assertEqual(list(Comment.objects.all()), [other])
+        self.assertFalse(CommentLike.objects.exists())
+
+    def test_requires_exactly_one_selection(self):
+        response = self._moderate(action='hide')
+        self.assertEqual(response.status_code, 400)
+
+    def test_large_selection_runs_in_background(self):
+        self._thread(3, 0)
+        job = ModerationJob.objects.create(action='hide', target_user_id=self.other.user_id)
+        with mock.patch.object(moderation, 'ASYNC_THRESHOLD', 2), \
+                mock.patch.object(moderation, 'Thread') as thread:
+            self.assertTrue(moderation.dispatch_job(job))
+        thread.return_value.start.assert_called_once()
+
+    def test_single_root_with_large_subtree_runs_in_background(self):
+        root = self._thread(1, 3)[0]
+        job = ModerationJob.objects.create(action='delete', comment_ids=[str(root.comment_id)])
+        with mock.patch.object(moderation, 'ASYNC_THRESHOLD', 2), \
+                mock.patch.object(moderation, 'Thread') as thread:
+            self.assertTrue(moderation.dispatch_job(job))
+        thread.return_value.start.assert_called_once()
+        self.assertEqual(moderation.estimate_size(job), 4)
+
+    def test_raw_delete_assumptions(self):
+        # moderation._raw_delete relies on private Django API and on knowing
+        # every relation that would otherwise cascade; see its docstring.
+        self.assertTrue(callable(getattr(Comment.objects.all(), '_raw_delete', None)))
+        self.assertEqual(
+            sorted(rel.name for rel in Comment._meta.related_objects),
+            ['likes', 'replies', 'thread_comments']
+        )
+        self.assertEqual([rel.name for rel in CommentLike._meta.related_objects], [])
+
+        comment = self._comment('Gone')
+        CommentLike.objects.create(comment=comment, user=self.user)
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=CommentLike)
+        self.addCleanup(post_delete.disconnect, receiver, sender=CommentLike)
+        self.assertEqual(moderation._raw_delete(CommentLike.objects.filter(comment=comment)), 1)
+        receiver.assert_not_called()
+
+    def test_owner_delete_does_not_scale_with_thread_size(self):
+        self.client.force_authenticate(self.other)
+        small, large = self._thread(1, 2)[0], self._thread(1, 30)[0]
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.delete(f'/api/comments/{small.comment_id}/')
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.delete(f'/api/comments/{large.comment_id}/')
+
+        self.assertEqual(len(small_queries.captured_queries), len(large_queries.captured_queries))
+        self.assertFalse(Comment.objects.exists())
+
+
+class CommentQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every comment endpoint stays within its query budget on seeded threads."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Reader')
+        users = User.objects.bulk_create([
+            User(username=f'reader{i}', email=f'reader{i}@example.com', role=role) for i in range(20)
+        ])
+        cls.user = users[0]
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role=role, is_staff=True)
+        cls.series = Series.objects.create(title='Commented Series')
+        content_type = ContentType.objects.get_for_model(Series)
+
+        def comment(i, parent=None):
+            return Comment(
+                user=users[i % len(users)], text=f'Comment {i}', content_type=content_type,
+                object_id=cls.series.series_id, parent_comment=parent,
+                root_comment=parent, depth=1 if parent else 0,
+                series_id=cls.series.series_id, series_title=cls.series.title,
+            )
+
+        top_level = Comment.objects.bulk_create([comment(i) for i in range(500)])
+        Comment.objects.bulk_create(
+            [comment(i, parent) for parent in top_level for i in range(3)], batch_size=1000
+        )
+        CommentLike.objects.bulk_create(
+            [CommentLike(comment=c, user=user) for c in top_level for user in users[:5]], batch_size=1000
+        )
+        Comment.objects.filter(parent_comment=None).update(reply_count=3, like_count=5)
+        cls.comment = top_level[0]
+        cls.job = ModerationJob.objects.create(action='hide', requested_by=cls.admin, comment_ids=[])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _read_budgets(self):
+        """(path, anonymous budget, authenticated budget); readers also load their likes."""
+        comment, series = self.comment.comment_id, self.series.series_id
+        return [
+            ('/api/comments/', 3, 4),
+            (f'/api/comments/{comment}/', 2, 4),
+            (f'/api/comments/by_content/?content_type=series&object_id={series}', 3, 4),
+            (f'/api/comments/{comment}/replies/', 3, 4),
+            (f'/api/comments/{comment}/replies/?thread=true', 3, 4),
+            ('/api/comment-likes/', 2, 2),
+        ]
+
+    def test_anonymous_reads(self):
+        for path, budget, _ in self._read_budgets():
+            with self.subTest(path=path):
+                self.assertWithinBudget('get', path, budget)
+
+    def test_authenticated_reads(self):
+        self.client.force_authenticate(self.user)
+        for path, _, budget in self._read_budgets():
+            with self.subTest(path=path):
+                self.assertWithinBudget('get', path, budget)
+        self.assertWithinBudget('get', f'/api/comments/by_user/?user={self.user.user_id}', 4)
+
+    def test_writes(self):
+        self.client.force_authenticate(User.objects.get(username='reader19'))
+        comment = self.comment.comment_id
+        self.assertWithinBudget('post', '/api/comments/', 2, {
+            'text': 'New comment', 'content_type': 'series', 'object_id': str(self.series.series_id)
+        })
+        self.assertWithinBudget('post', f'/api/comments/{comment}/like/', 4)
+        self.assertWithinBudget('delete', f'/api/comments/{comment}/unlike/', 4)
+
+    def test_moderation_jobs(self):
+        self.client.force_authenticate(self.admin)
+        self.assertWithinBudget('get', '/api/moderation-jobs/', 2)
+        self.assertWithinBudget('get', f'/api/moderation-jobs/{self.job.job_id}/', 1)
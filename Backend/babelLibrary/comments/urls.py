@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import CommentViewSet, CommentLikeViewSet
+from .views import CommentViewSet, CommentLikeViewSet, ModerationJobViewSet
 
 router = DefaultRouter()
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'comment-likes', CommentLikeViewSet, basename='commentlike')
+router.register(r'moderation-jobs', ModerationJobViewSet, basename='moderationjob')
 
 urlpatterns = [
     path('', include(router.urls)),
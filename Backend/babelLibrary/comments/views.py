@@ -1,43 +1,54 @@
-from rest_framework import viewsets, permissions, filters, status
+from rest_framework import viewsets, mixins, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.contrib.contenttypes.models import ContentType
-from .models import Comment, CommentLike
+from django.db.models import Prefetch
+from babelLibrary.instrumentation import InstrumentedViewMixin
+from .models import Comment, CommentLike, ModerationJob
+from .moderation import delete_thread, dispatch_job
+from .targets import CONTENT_TARGETS, get_content_type
 from .serializers import (
     CommentSerializer, CommentCreateUpdateSerializer, 
-    CommentLikeSerializer, CommentReplySerializer
+    CommentLikeSerializer, CommentReplySerializer, ModerationJobSerializer
 )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Comment instances.
     Supports full CRUD operations, nested replies, and filtering by content type.
     """
-    queryset = Comment.objects.all().select_related('user', 'parent_comment', 'content_type').prefetch_related('likes')
+    queryset = Comment.objects.all().select_related('user', 'parent_comment')
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['user', 'parent_comment']
-    ordering_fields = ['created_at', 'updated_at', 'like_count']
+    filterset_fields = ['user', 'parent_comment', 'series_id']
+    ordering_fields = ['created_at', 'updated_at', 'like_count', 'reply_count']
     ordering = ['-created_at']
+    reply_preview_limit = 3
     
     def get_queryset(self):
         """
         Conditionally prefetch 'replies' only for actions that display nested comments.
         This optimizes query performance by avoiding unnecessary prefetching.
-        For by_user action, we need to prefetch the generic relation content objects.
+        Series and chapter titles are stored on the comment, so the commented-on
+        object is never loaded; CommentListSerializer batches the like state per page.
         """
-        qs = super().get_queryset()
-        # Only prefetch replies when displaying top-level comments with nested replies
-        if self.action in ['list', 'by_content', 'retrieve']:
-            return qs.prefetch_related('replies__user', 'replies__likes')
-        elif self.action == 'by_user':
-            # For by_user, prefetch the related Series and Chapter objects to avoid N+1 queries
-            # We can't directly prefetch generic relations, but we can use prefetch_related_objects in the view
-            return qs
+        qs = self._visible(super().get_queryset())
+        # Only prefetch replies when displaying top-level comments with nested replies.
+        # The sliced Prefetch runs as a single ROW_NUMBER() OVER (PARTITION BY parent)
+        # query, so each comment carries at most reply_preview_limit replies no matter
+        # how large its thread is; the rest are paged through the replies action.
+        if self.action in ['list', 'by_content', 'by_user', 'retrieve']:
+            preview = self._visible(Comment.objects.select_related('user'))[:self.reply_preview_limit]
+            return qs.prefetch_related(Prefetch('replies', queryset=preview, to_attr='reply_preview'))
         return qs
     
+    def _visible(self, queryset):
+        """Hide moderated (soft-deleted) comments from everyone but staff."""
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(is_hidden=False)
+    
     def get_serializer_class(self):
         """Use different serializers for different actions."""
         if self.action in ['create', 'update', 'partial_update']:
@@ -65,10 +76,13 @@ class CommentViewSet(viewsets.ModelViewSet):
         serializer.save()
     
     def perform_destroy(self, instance):
-        """Only allow users to delete their own comments."""
+        """
+        Only allow users to delete their own comments.
+        The comment and its replies are removed with set-based deletes.
+        """
         if instance.user != self.request.user and not self.request.user.is_staff:
             raise permissions.PermissionDenied("You can only delete your own comments.")
-        instance.delete()
+        delete_thread(instance)
     
     @action(detail=False, methods=['get'])
     def by_content(self, request):
@@ -85,27 +99,15 @@ class CommentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get the ContentType object
-        try:
-            if content_type_str.lower() == 'series':
-                content_type = ContentType.objects.get(app_label='library', model='series')
-            elif content_type_str.lower() == 'chapter':
-                content_type = ContentType.objects.get(app_label='library', model='chapter')
-            elif content_type_str.lower() == 'user':
-                content_type = ContentType.objects.get(app_label='users', model='user')
-            else:
-                return Response(
-                    {'error': 'content_type must be one of: series, chapter, user'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except ContentType.DoesNotExist:
+        content_type = get_content_type(content_type_str)
+        if content_type is None:
             return Response(
-                {'error': f'Invalid content type: {content_type_str}'},
+                {'error': f"content_type must be one of: {', '.join(CONTENT_TARGETS)}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         # Filter comments by content type and object ID, excluding replies (parent_comment=None)
-        comments = self.queryset.filter(
+        comments = self.get_queryset().filter(
             content_type=content_type,
             object_id=object_id,
             parent_comment=None  # Only get top-level comments
@@ -199,9 +201,17 @@ class CommentViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def replies(self, request, pk=None):
-        """Get all replies to a specific comment."""
+        """
+        Get all replies to a specific comment.
+        Query params: thread=true to page through every comment nested under a
+        top-level comment (oldest first) instead of only its direct replies.
+        """
         comment = self.get_object()
-        replies = comment.replies.all()
+        if request.query_params.get('thread') == 'true':
+            replies = Comment.objects.filter(root_comment=comment).select_related('user').order_by('created_at')
+        else:
+            replies = comment.replies.select_related('user')
+        replies = self._visible(replies)
         
         # Apply pagination
         page = self.paginate_queryset(replies)
@@ -237,57 +247,14 @@ class CommentViewSet(viewsets.ModelViewSet):
         # Apply pagination
         page = self.paginate_queryset(comments)
         if page is not None:
-            # Prefetch generic relation objects to avoid N+1 queries
-            self._prefetch_content_objects(page)
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         
-        # For non-paginated results
-        comments_list = list(comments)
-        self._prefetch_content_objects(comments_list)
-        serializer = self.get_serializer(comments_list, many=True)
+        serializer = self.get_serializer(comments, many=True)
         return Response(serializer.data)
-    
-    def _prefetch_content_objects(self, comments):
-        """
-        Manually prefetch generic relation content objects (Series/Chapter) to avoid N+1 queries.
-        This groups comments by content type and bulk fetches the related objects.
-        """
-        from library.models import Series, Chapter
-        from collections import defaultdict
-        
-        # Group comments by content type
-        series_ids = []
-        chapter_ids = []
-        
-        for comment in comments:
-            if comment.content_type.model == 'series':
-                series_ids.append(comment.object_id)
-            elif comment.content_type.model == 'chapter':
-                chapter_ids.append(comment.object_id)
-        
-        # Bulk fetch Series and Chapter objects
-        series_map = {}
-        chapter_map = {}
-        
-        if series_ids:
-            series_objs = Series.objects.filter(series_id__in=series_ids)
-            series_map = {str(s.series_id): s for s in series_objs}
-        
-        if chapter_ids:
-            # Use select_related to also fetch the related series for chapters
-            chapter_objs = Chapter.objects.filter(chapter_id__in=chapter_ids).select_related('series')
-            chapter_map = {str(c.chapter_id): c for c in chapter_objs}
-        
-        # Cache the content objects on each comment instance
-        for comment in comments:
-            if comment.content_type.model == 'series':
-                comment._cached_content_object = series_map.get(str(comment.object_id))
-            elif comment.content_type.model == 'chapter':
-                comment._cached_content_object = chapter_map.get(str(comment.object_id))
 
 
-class CommentLikeViewSet(viewsets.ReadOnlyModelViewSet):
+class CommentLikeViewSet(InstrumentedViewMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing CommentLike instances.
     Read-only because likes are created/deleted via CommentViewSet actions.
@@ -297,3 +264,40 @@ class CommentLikeViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['comment', 'user']
+
+
+class ModerationJobViewSet(InstrumentedViewMixin, mixins.CreateModelMixin,
+                           mixins.ListModelMixin,
+                           mixins.RetrieveModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    Bulk comment moderation for staff.
+    
+    Endpoints:
+    - POST /api/moderation-jobs/ - Hide, unhide or delete a set of comments
+    - GET /api/moderation-jobs/{id}/ - Job status and progress
+    
+    Request body for create:
+    {
+        "action": "hide" | "unhide" | "delete",
+        "comment_ids": [...] | "target_user_id": "..." | "thread_id": "..."
+    }
+    
+    Small selections are processed before the response (201); larger ones run
+    in the background (202) and report progress through processed/total.
+    """
+    queryset = ModerationJob.objects.all()
+    serializer_class = ModerationJobSerializer
+    permission_classes = [permissions.IsAuthenticated, permissions.IsAdminUser]
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save(requested_by=request.user)
+        
+        started_async = dispatch_job(job)
+        job.refresh_from_db()
+        return Response(
+            self.get_serializer(job).data,
+            status=status.HTTP_202_ACCEPTED if started_async else status.HTTP_201_CREATED
+        )
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LibraryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'library'
+
+    def ready(self):
+        """Connect cache invalidation signals."""
+        from . import signals  # noqa: F401
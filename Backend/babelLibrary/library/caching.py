@@ -0,0 +1,82 @@
+"""
+Response caching for anonymous library reads.
+
+Cached payloads are keyed on version stamps for the scopes they depend on:
+the whole catalog, a single series, or a single chapter. The stamps come
+from babelLibrary.versioning and model signals in library/signals.py bump
+them, so stale entries are never read again and simply expire from the
+cache backend. The stamps are timestamps, which also makes them usable as
+Last-Modified values for conditional requests.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from babelLibrary.versioning import get_version
+
+CATALOG_SCOPE = 'catalog'
+SERIES_SCOPE = 'series'
+CHAPTER_SCOPE = 'chapter'
+
+KEY_PREFIX = 'library'
+
+
+class CachedReadMixin:
+    """
+    Serve cached list/retrieve payloads to anonymous readers.
+
+    Every response from a cached action carries ETag and Last-Modified
+    headers derived from the scope versions, so clients that send
+    If-None-Match or If-Modified-Since receive a 304 without touching the
+    database. Subclasses describe their dependencies via get_cache_scopes().
+    """
+    cached_actions = ['list', 'retrieve']
+
+    def get_cache_scopes(self):
+        """Return (scope, object_id) pairs the current action depends on."""
+        raise NotImplementedError
+
+    def _cache_key(self, request, versions):
+        query = request.GET.urlencode()
+        raw = f'{self.basename}:{self.action}:{self.kwargs}:{query}:{versions}'
+        return f'{KEY_PREFIX}:response:{hashlib.md5(raw.encode()).hexdigest()}'
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        # Versions are read before any data is fetched so a concurrent write
+        # can only ever store fresh data under an already-retired key.
+        versions = [get_version(scope, object_id) for scope, object_id in self.get_cache_scopes()]
+        key = self._cache_key(request, versions)
+        etag = quote_etag(key.rsplit(':', 1)[-1])
+        last_modified = int(max(versions))
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        use_cache = not request.user.is_authenticated
+        data = cache.get(key) if use_cache else None
+        if data is not None:
+            response = Response(data)
+        else:
+            response = handler(request, *args, **kwargs)
+            if use_cache and response.status_code == 200:
+                cache.set(key, response.data, settings.LIBRARY_CACHE_TIMEOUT)
+
+        if response.status_code == 200:
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if 'list' not in self.cached_actions:
+            return super().list(request, *args, **kwargs)
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if 'retrieve' not in self.cached_actions:
+            return super().retrieve(request, *args, **kwargs)
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
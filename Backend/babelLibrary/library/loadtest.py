@@ -0,0 +1,232 @@
+"""
+HTTP load testing against a running server.
+
+A traffic profile is a weighted mix of endpoints. LoadTest replays it from a
+pool of keep-alive client threads for a fixed duration, filling path
+placeholders ({series_id}, {chapter_id}) with ids sampled from the database
+the server uses (populate it with generate_load_data first). Endpoints
+marked "auth" are sent with a JWT for one of the sampled users.
+
+Results are per-endpoint request counts, errors, throughput and p50/p95/p99
+latency, which compare_to_baseline() checks against a stored run. See the
+run_load_test management command.
+
+The reference run lives at DEFAULT_BASELINE (library/baselines/load_test.json).
+Record it on the hardware and dataset you benchmark on with
+"run_load_test --save"; later runs compare against it automatically.
+"""
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from library.models import Chapter, Series
+from users.authentication import tokens_for_user
+from users.models import User
+
+# The production read/write mix: mostly chapter reads, some catalog browsing,
+# one view-tracking write per ten requests, and comment threads.
+DEFAULT_PROFILE = {
+    'endpoints': [
+        {'name': 'chapter_read', 'weight': 70, 'method': 'GET', 'path': '/api/library/chapters/{chapter_id}/'},
+        {'name': 'series_list', 'weight': 15, 'method': 'GET', 'path': '/api/library/series/'},
+        {
+            'name': 'track_view', 'weight': 10, 'method': 'POST', 'auth': True,
+            'path': '/api/library/chapters/{chapter_id}/track_view/',
+        },
+        {
+            'name': 'comments', 'weight': 5, 'method': 'GET',
+            'path': '/api/comments/by_content/?content_type=chapter&object_id={chapter_id}',
+        },
+    ]
+}
+
+PLACEHOLDERS = ('series_id', 'chapter_id')
+
+# Where run_load_test reads and --save writes the reference run by default.
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'load_test.json')
+
+# Ids sampled from the database for each placeholder.
+SAMPLE_SIZE = 1000
+
+
+def load_profile(path=None):
+    """Return the profile stored at path (JSON), or DEFAULT_PROFILE."""
+    if path is None:
+        return DEFAULT_PROFILE
+    with open(path) as f:
+        profile = json.load(f)
+    for endpoint in profile.get('endpoints', []):
+        missing = {'name', 'weight', 'method', 'path'} - set(endpoint)
+        if missing:
+            raise ValueError(f'Endpoint {endpoint!r} is missing {", ".join(sorted(missing))}')
+    if not profile.get('endpoints'):
+        raise ValueError('Profile defines no endpoints')
+    return profile
+
+
+def _fill(template, values):
+    """Substitute placeholders in every string of a JSON-like request body."""
+    if isinstance(template, str):
+        return template.format(**values)
+    if isinstance(template, dict):
+        return {key: _fill(value, values) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_fill(value, values) for value in template]
+    return template
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def sample_targets(user_count=50):
+    """Ids and auth tokens used to fill in request paths."""
+    targets = {
+        'series_id': [str(pk) for pk in Series.objects.values_list('series_id', flat=True)[:SAMPLE_SIZE]],
+        'chapter_id': [str(pk) for pk in Chapter.objects.values_list('chapter_id', flat=True)[:SAMPLE_SIZE]],
+    }
+    users = User.objects.select_related('role').filter(is_active=True)[:user_count]
+    targets['tokens'] = [str(tokens_for_user(user).access_token) for user in users]
+    return targets
+
+
+class EndpointStats:
+    """Latencies (seconds) and error count for one endpoint."""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+    def summary(self, duration):
+        latencies = sorted(self.latencies)
+        return {
+            'requests': len(latencies),
+            'errors': self.errors,
+            'rps': len(latencies) / duration if duration else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+        }
+
+
+class LoadTest:
+    """Replay a traffic profile against base_url from concurrent clients."""
+
+    def __init__(self, base_url, profile, targets, concurrency=8, seed=None, timeout=30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or 'http'
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+        self.endpoints = profile['endpoints']
+        self.weights = [endpoint['weight'] for endpoint in self.endpoints]
+        self.targets = targets
+        self.concurrency = concurrency
+        self.seed = seed
+        self.timeout = timeout
+        for endpoint in self.endpoints:
+            for placeholder in PLACEHOLDERS:
+                if '{%s}' % placeholder in endpoint['path'] and not targets.get(placeholder):
+                    raise ValueError(f"No {placeholder} values for endpoint {endpoint['name']}")
+            if endpoint.get('auth') and not targets.get('tokens'):
+                raise ValueError(f"No users to authenticate endpoint {endpoint['name']}")
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(self.host, timeout=self.timeout)
+
+    def _request(self, rng, endpoint):
+        values = {name: rng.choice(self.targets[name]) for name in PLACEHOLDERS if self.targets.get(name)}
+        path = self.prefix + endpoint['path'].format(**values)
+        headers = {'Accept': 'application/json'}
+        body = None
+        if endpoint.get('body') is not None:
+            body = json.dumps(_fill(endpoint['body'], values))
+            headers['Content-Type'] = 'application/json'
+        if endpoint.get('auth'):
+            headers['Authorization'] = f"Bearer {rng.choice(self.targets['tokens'])}"
+        return endpoint['method'], path, body, headers
+
+    def _worker(self, index, deadline, stats, lock):
+        rng = random.Random(None if self.seed is None else self.seed + index)
+        local = {endpoint['name']: EndpointStats() for endpoint in self.endpoints}
+        connection = self._connect()
+        try:
+            while time.perf_counter() < deadline:
+                endpoint = rng.choices(self.endpoints, weights=self.weights)[0]
+                method, path, body, headers = self._request(rng, endpoint)
+                start = time.perf_counter()
+                try:
+                    connection.request(method, path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    failed = response.status >= 400
+                    if response.getheader('Connection', '').lower() == 'close':
+                        connection.close()
+                except (OSError, http.client.HTTPException):
+                    failed = True
+                    connection.close()
+                    connection = self._connect()
+                elapsed = time.perf_counter() - start
+                endpoint_stats = local[endpoint['name']]
+                if failed:
+                    endpoint_stats.errors += 1
+                else:
+                    endpoint_stats.latencies.append(elapsed)
+        finally:
+            connection.close()
+        with lock:
+            for name, endpoint_stats in local.items():
+                stats[name].latencies.extend(endpoint_stats.latencies)
+                stats[name].errors += endpoint_stats.errors
+
+    def run(self, duration):
+        """Run for duration seconds; returns {endpoint name: summary dict}."""
+        stats = {endpoint['name']: EndpointStats() for endpoint in self.endpoints}
+        lock = threading.Lock()
+        started = time.perf_counter()
+        deadline = started + duration
+        threads = [
+            threading.Thread(target=self._worker, args=(i, deadline, stats, lock), daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        results = {name: endpoint_stats.summary(elapsed) for name, endpoint_stats in stats.items()}
+        total = EndpointStats()
+        for endpoint_stats in stats.values():
+            total.latencies.extend(endpoint_stats.latencies)
+            total.errors += endpoint_stats.errors
+        results['total'] = total.summary(elapsed)
+        return results
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Return a list of (endpoint, metric, baseline, current, change) for every
+    latency that grew, or throughput that fell, by more than tolerance (a
+    fraction, e.g. 0.1 for 10%).
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                change = current[metric] / previous[metric] - 1
+                regressions.append((name, metric, previous[metric], current[metric], change))
+        if previous['rps'] and current['rps'] < previous['rps'] * (1 - tolerance):
+            regressions.append((name, 'rps', previous['rps'], current['rps'], current['rps'] / previous['rps'] - 1))
+    return regressions
@@ -0,0 +1,437 @@
+import io
+import itertools
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from babelLibrary.versioning import bump_version
+from comments.models import Comment, CommentLike
+from library.caching import CATALOG_SCOPE
+from library.models import Genre, Series, SeriesGenre, Chapter, SeriesRating, SeriesView, ChapterView
+from users.models import Role, User
+
+GENRES = [
+    'Action', 'Adventure', 'Comedy', 'Detective', 'Drama',
+    'Fantasy', 'Mystery', 'Regression', 'Romance',
+    'Slice of Life', 'Thriller'
+]
+STATUSES = ['Ongoing', 'Completed', 'Hiatus']
+WORDS = (
+    'the sword moon shadow library empire blade whisper ancient hero village mountain river '
+    'secret promise storm king queen dragon spirit memory journey tower forest night morning '
+    'silver crimson quiet forgotten broken golden hidden final second chance heart letter'
+).split()
+
+# Every timestamp falls within a year after EPOCH so reruns with the same seed
+# produce identical rows. bulk_create still stamps auto_now/auto_now_add
+# fields with the current time; only COPY keeps the generated timestamps.
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+SPAN_SECONDS = 365 * 24 * 3600
+
+# Popularity skew: higher values concentrate views, ratings and comments on
+# fewer series, chapters and comments.
+SKEW = 2.0
+
+
+def _skewed(rng, n):
+    """Pick an index in range(n), favouring low indices."""
+    return min(int(n * rng.random() ** SKEW), n - 1)
+
+
+class RowStream(io.TextIOBase):
+    """File-like object feeding COPY from an iterator of text lines."""
+
+    def __init__(self, lines):
+        self._lines = lines
+        self._buffer = ''
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = ''.join(itertools.islice(self._lines, 1000))
+            if not chunk:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a large, deterministic synthetic dataset (series, chapters, users, '
+        'comments, likes, views, ratings) for load testing and benchmarks'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--series', type=int, default=1000)
+        parser.add_argument('--chapters-per-series', type=int, default=50, help='Average chapters per series')
+        parser.add_argument('--chapter-length', type=int, default=2000, help='Average words per chapter')
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=100000, help='Comments, about 30%% of them replies')
+        parser.add_argument('--likes', type=int, default=200000, help='Comment likes')
+        parser.add_argument('--views', type=int, default=1000000, help='View rows, split between series and chapters')
+        parser.add_argument('--ratings', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=42, help='Same seed, same data')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+        parser.add_argument(
+            '--method', choices=['auto', 'copy', 'bulk'], default='auto',
+            help='copy uses PostgreSQL COPY; auto picks it on PostgreSQL and bulk_create elsewhere'
+        )
+        parser.add_argument('--password', default='loadtest', help='Password for every generated user')
+        parser.add_argument('--skip-search-index', action='store_true', help='Do not rebuild search vectors')
+
+    def handle(self, *args, **options):
+        self.seed = options['seed']
+        self.rng = random.Random(self.seed)
+        self.batch_size = options['batch_size']
+        method = options['method']
+        if method == 'auto':
+            method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+        if method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('--method copy requires PostgreSQL')
+        self.use_copy = method == 'copy'
+
+        self.series_count = options['series']
+        self.user_count = options['users']
+        if self.series_count < 1 or self.user_count < 1:
+            raise CommandError('--series and --users must be at least 1')
+        if User.objects.filter(username=self._username(0)).exists():
+            raise CommandError(f'Load data for seed {self.seed} already exists; use another --seed')
+
+        started = time.perf_counter()
+        self.stdout.write(f'Generating load data with seed {self.seed} using {method}...')
+        with transaction.atomic():
+            self._prepare_lookups(options)
+            self._write(Series, self._series_rows())
+            self._write(SeriesGenre, self._series_genre_rows())
+            self._write(Chapter, self._chapter_rows(options['chapter_length']))
+            self._write(User, self._user_rows(options['password']))
+            self._write(SeriesRating, self._rating_rows(options['ratings']))
+            self._write(SeriesView, self._series_view_rows(options['views'] // 2))
+            self._write(ChapterView, self._chapter_view_rows(options['views'] - options['views'] // 2))
+            self._plan_comments(options['comments'], options['likes'])
+            self._write(Comment, self._comment_rows())
+            self._write(CommentLike, self._like_rows())
+
+        # bulk_create and COPY bypass the signals that maintain these.
+        bump_version(CATALOG_SCOPE)
+        if not options['skip_search_index']:
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Load data generated in {time.perf_counter() - started:.1f}s'
+        ))
+
+    # Identifiers and lookups
+
+    def _uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _timestamp(self):
+        return EPOCH + timedelta(seconds=self.rng.randrange(SPAN_SECONDS))
+
+    def _username(self, index):
+        return f'load{self.seed}_user{index}'
+
+    def _series_title(self, index):
+        rng = random.Random(f'{self.seed}:title:{index}')
+        return f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {index}'
+
+    def _prepare_lookups(self, options):
+        self.genre_ids = [Genre.objects.get_or_create(name=name)[0].genre_id for name in GENRES]
+        self.role_id = Role.objects.get_or_create(
+            name='Reader', defaults={'description': 'Default role with read-only access.'}
+        )[0].role_id
+        self.series_content_type = ContentType.objects.get_for_model(Series).pk
+        self.chapter_content_type = ContentType.objects.get_for_model(Chapter).pk
+
+        # Chapter counts vary per series around the requested average; chapter
+        # i of series s has the global index chapter_offsets[s] + i - 1.
+        average = max(1, options['chapters_per_series'])
+        self.chapter_counts = [self.rng.randint(1, 2 * average - 1) for _ in range(self.series_count)]
+        self.chapter_offsets = list(itertools.accumulate([0] + self.chapter_counts[:-1]))
+        self.chapter_total = sum(self.chapter_counts)
+
+        # Primary keys of rows that others reference are drawn up front.
+        self.series_ids = [self._uuid() for _ in range(self.series_count)]
+        self.chapter_ids = [self._uuid() for _ in range(self.chapter_total)]
+        self.user_ids = [self._uuid() for _ in range(self.user_count)]
+        self.user_visitors = [f'user_{user_id}' for user_id in self.user_ids]
+
+        # A pool of paragraphs that chapter bodies are assembled from.
+        self.paragraphs = [
+            ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(40, 120))).capitalize() + '.'
+            for _ in range(200)
+        ]
+
+    # Row generators yield dicts keyed by field attname.
+
+    def _series_rows(self):
+        for s in range(self.series_count):
+            created = self._timestamp()
+            yield {
+                'series_id': self.series_ids[s],
+                'title': self._series_title(s),
+                'author': f'Author {self.rng.randrange(self.series_count // 5 + 1)}',
+                'description': ' '.join(self.rng.choice(WORDS) for _ in range(40)).capitalize() + '.',
+                'cover_image_url': f'https://placehold.co/400x600?text=Series+{s}',
+                'status': self.rng.choice(STATUSES),
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def _series_genre_rows(self):
+        for s in range(self.series_count):
+            for genre_id in self.rng.sample(self.genre_ids, self.rng.randint(1, 3)):
+                yield {
+                    'series_genre_id': self._uuid(),
+                    'series_id': self.series_ids[s],
+                    'genre_id': genre_id,
+                }
+
+    def _chapter_rows(self, average_words):
+        paragraph_words = sum(len(p.split()) for p in self.paragraphs) / len(self.paragraphs)
+        for s in range(self.series_count):
+            series_id = self.series_ids[s]
+            for number in range(1, self.chapter_counts[s] + 1):
+                target = average_words * self.rng.uniform(0.5, 1.5)
+                paragraphs = self.rng.choices(self.paragraphs, k=max(1, round(target / paragraph_words)))
+                content = '\n\n'.join(paragraphs)
+                created = self._timestamp()
+                yield {
+                    'chapter_id': self.chapter_ids[self.chapter_offsets[s] + number - 1],
+                    'series_id': series_id,
+                    'chapter_number': number,
+                    'title': f'Chapter {number}',
+                    'content': content,
+                    'word_count': len(content.split()),
+                    'publication_date': created,
+                    'created_at': created,
+                    'updated_at': created,
+                }
+
+    def _user_rows(self, password):
+        encoded = make_password(password)
+        for u in range(self.user_count):
+            created = self._timestamp()
+            yield {
+                'password': encoded,
+                'last_login': None,
+                'is_superuser': False,
+                'user_id': self.user_ids[u],
+                'username': self._username(u),
+                'email': f'{self._username(u)}@example.com',
+                'role_id': self.role_id,
+                'is_active': True,
+                'is_staff': False,
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def _distinct_pairs(self, count, rows):
+        """
+        Return count distinct (row, user) pairs, rows favouring low indices.
+
+        Sampling is without replacement: a row whose users are all taken is
+        replaced by a uniformly drawn row that still has some, and a taken
+        user by the next free one, so filling up to every pair stays fast.
+        """
+        count = min(count, rows * self.user_count)
+        taken = {}
+        open_rows = list(range(rows))
+        position = list(range(rows))
+        pairs = []
+        while len(pairs) < count:
+            row = _skewed(self.rng, rows)
+            if len(taken.get(row, ())) == self.user_count:
+                row = open_rows[self.rng.randrange(len(open_rows))]
+            users = taken.setdefault(row, set())
+            user = self.rng.randrange(self.user_count)
+            while user in users:
+                user = (user + 1) % self.user_count
+            users.add(user)
+            pairs.append((row, user))
+            if len(users) == self.user_count:
+                # Swap-remove the full row from open_rows.
+                last = open_rows.pop()
+                if last != row:
+                    open_rows[position[row]] = last
+                    position[last] = position[row]
+        return pairs
+
+    def _rating_rows(self, count):
+        for s, u in self._distinct_pairs(count, self.series_count):
+            created = self._timestamp()
+            yield {
+                'rating_id': self._uuid(),
+                'series_id': self.series_ids[s],
+                'user_id': self.user_ids[u],
+                'rating': self.rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 5, 6])[0],
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def _visitor_id(self, target, visit):
+        """Unique visitor for the visit-th view of a target: users first, then anonymous sessions."""
+        if visit < self.user_count:
+            return self.user_visitors[(target * 7919 + visit) % self.user_count]
+        return f'anon_{visit}'
+
+    def _series_view_rows(self, count):
+        visits = [0] * self.series_count
+        for _ in range(count):
+            s = _skewed(self.rng, self.series_count)
+            yield {
+                'view_id': self._uuid(),
+                'series_id': self.series_ids[s],
+                'visitor_id': self._visitor_id(s, visits[s]),
+                'viewed_at': self._timestamp(),
+            }
+            visits[s] += 1
+
+    def _chapter_view_rows(self, count):
+        visits = [0] * self.chapter_total
+        for _ in range(count):
+            s = _skewed(self.rng, self.series_count)
+            # Early chapters of a series are read far more than later ones.
+            c = self.chapter_offsets[s] + _skewed(self.rng, self.chapter_counts[s])
+            yield {
+                'view_id': self._uuid(),
+                'chapter_id': self.chapter_ids[c],
+                'visitor_id': self._visitor_id(c, visits[c]),
+                'viewed_at': self._timestamp(),
+            }
+            visits[c] += 1
+
+    def _plan_comments(self, count, likes):
+        """Decide targets, parents and like counters before any comment is written."""
+        self.comment_count = count
+        self.comment_ids = [self._uuid() for _ in range(count)]
+        self.comment_parent = [-1] * count
+        self.comment_target = [None] * count
+        self.comment_replies = [0] * count
+        top_level = []
+        for c in range(count):
+            if top_level and self.rng.random() < 0.3:
+                parent = top_level[_skewed(self.rng, len(top_level))]
+                self.comment_parent[c] = parent
+                self.comment_target[c] = self.comment_target[parent]
+                self.comment_replies[parent] += 1
+                continue
+            s = _skewed(self.rng, self.series_count)
+            chapter = None
+            if self.rng.random() < 0.6:
+                chapter = self.rng.randrange(self.chapter_counts[s]) + 1
+            self.comment_target[c] = (s, chapter)
+            top_level.append(c)
+
+        self.likes = set(self._distinct_pairs(likes, count)) if count else set()
+        self.comment_likes = [0] * count
+        for c, _ in self.likes:
+            self.comment_likes[c] += 1
+
+    def _comment_rows(self):
+        for c in range(self.comment_count):
+            s, chapter = self.comment_target[c]
+            parent = self.comment_parent[c]
+            chapter_id = None
+            if chapter is not None:
+                chapter_id = self.chapter_ids[self.chapter_offsets[s] + chapter - 1]
+            created = self._timestamp()
+            yield {
+                'comment_id': self.comment_ids[c],
+                'user_id': self.user_ids[self.rng.randrange(self.user_count)],
+                'text': ' '.join(self.rng.choice(WORDS) for _ in range(self.rng.randint(5, 40))).capitalize(),
+                'content_type_id': self.chapter_content_type if chapter_id else self.series_content_type,
+                'object_id': chapter_id or self.series_ids[s],
+                'parent_comment_id': self.comment_ids[parent] if parent >= 0 else None,
+                'root_comment_id': self.comment_ids[parent] if parent >= 0 else None,
+                'depth': 1 if parent >= 0 else 0,
+                'series_id': self.series_ids[s],
+                'series_title': self._series_title(s),
+                'chapter_id': chapter_id,
+                'chapter_title': str(chapter) if chapter_id else None,
+                'is_hidden': False,
+                'like_count': self.comment_likes[c],
+                'reply_count': self.comment_replies[c],
+                'created_at': created,
+                'updated_at': created,
+            }
+
+    def _like_rows(self):
+        for c, u in sorted(self.likes):
+            yield {
+                'like_id': self._uuid(),
+                'comment_id': self.comment_ids[c],
+                'user_id': self.user_ids[u],
+                'created_at': self._timestamp(),
+            }
+
+    # Writers
+
+    def _write(self, model, rows):
+        started = time.perf_counter()
+        first = next(rows, None)
+        if first is None:
+            self.stdout.write(f'{model._meta.verbose_name_plural}: 0 rows')
+            return
+        columns = list(first)
+        rows = itertools.chain([first], rows)
+        if self.use_copy:
+            count = self._copy(model, columns, rows)
+        else:
+            count = self._bulk_create(model, rows)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {count} rows in {elapsed:.1f}s '
+            f'({count / max(elapsed, 1e-9):.0f} rows/s)'
+        )
+
+    def _bulk_create(self, model, rows):
+        count = 0
+        while True:
+            batch = [model(**row) for row in itertools.islice(rows, self.batch_size)]
+            if not batch:
+                return count
+            model.objects.bulk_create(batch)
+            count += len(batch)
+
+    def _copy(self, model, columns, rows):
+        counter = itertools.count(1)
+        count = 0
+
+        def lines():
+            nonlocal count
+            for row in rows:
+                count = next(counter)
+                yield '\t'.join(_copy_value(row[column]) for column in columns) + '\n'
+
+        db_columns = ', '.join(connection.ops.quote_name(model._meta.get_field(c).column) for c in columns)
+        table = connection.ops.quote_name(model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY {table} ({db_columns}) FROM STDIN', RowStream(lines()))
+        return count
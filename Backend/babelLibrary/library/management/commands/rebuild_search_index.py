@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from library.models import Series, Chapter
+from library.search import search_enabled, update_series_search_vector, chapter_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Recompute full-text search vectors for all series and chapters'
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            self.stdout.write(self.style.WARNING(
+                'Full-text search requires PostgreSQL; nothing to rebuild.'
+            ))
+            return
+
+        series_ids = Series.objects.values_list('series_id', flat=True)
+        for series_id in series_ids.iterator():
+            update_series_search_vector(series_id)
+        self.stdout.write(f'Indexed {series_ids.count()} series')
+
+        # Chapter vectors depend only on their own row, so one UPDATE covers all.
+        chapter_count = Chapter.objects.update(search_vector=chapter_search_vector())
+        self.stdout.write(f'Indexed {chapter_count} chapters')
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt'))
@@ -0,0 +1,95 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from library.loadtest import DEFAULT_BASELINE, LoadTest, compare_to_baseline, load_profile, sample_targets
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a weighted traffic mix against a running server and report '
+        'per-endpoint throughput and p50/p95/p99 latency, optionally against a baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the server under test')
+        parser.add_argument('--profile', help='JSON traffic profile (default: the built-in production mix)')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to measure')
+        parser.add_argument('--warmup', type=float, default=5, help='Seconds of unmeasured traffic first')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+        parser.add_argument('--seed', type=int, help='Seed for request selection')
+        parser.add_argument(
+            '--baseline', default=DEFAULT_BASELINE,
+            help=f'JSON results of a previous run to compare against (default: {DEFAULT_BASELINE}, if present)'
+        )
+        parser.add_argument('--no-baseline', action='store_true', help='Skip the baseline comparison')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.10,
+            help='Allowed regression against the baseline as a fraction (default 0.10)'
+        )
+        parser.add_argument(
+            '--save', nargs='?', const=DEFAULT_BASELINE,
+            help='Write these results as JSON; without a path, replace the default baseline'
+        )
+
+    def handle(self, *args, **options):
+        baseline_path = None if options['no_baseline'] else options['baseline']
+        if baseline_path and not os.path.exists(baseline_path):
+            if baseline_path != DEFAULT_BASELINE:
+                raise CommandError(f'Baseline {baseline_path} does not exist')
+            self.stdout.write(f'No baseline at {baseline_path}; record one with --save')
+            baseline_path = None
+
+        try:
+            profile = load_profile(options['profile'])
+            load_test = LoadTest(
+                options['url'], profile, sample_targets(),
+                concurrency=max(1, options['concurrency']), seed=options['seed']
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['warmup'] > 0:
+            self.stdout.write(f'Warming up for {options["warmup"]:g}s...')
+            load_test.run(options['warmup'])
+
+        self.stdout.write(
+            f'Running {options["duration"]:g}s against {options["url"]} '
+            f'with {load_test.concurrency} connection(s)\n'
+        )
+        results = load_test.run(options['duration'])
+
+        self.stdout.write(
+            f'{"endpoint":<16} {"requests":>9} {"errors":>7} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}'
+        )
+        for name, summary in results.items():
+            self.stdout.write(
+                f'{name:<16} {summary["requests"]:>9} {summary["errors"]:>7} {summary["rps"]:>9.1f} '
+                f'{summary["p50_ms"]:>9.1f} {summary["p95_ms"]:>9.1f} {summary["p99_ms"]:>9.1f}'
+            )
+
+        if baseline_path:
+            # Read before --save can overwrite the same file.
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+
+        if options['save']:
+            os.makedirs(os.path.dirname(os.path.abspath(options['save'])), exist_ok=True)
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f'Results saved to {options["save"]}')
+
+        if baseline_path:
+            regressions = compare_to_baseline(results, baseline, options['tolerance'])
+            if regressions:
+                for name, metric, previous, current, change in regressions:
+                    self.stdout.write(self.style.ERROR(
+                        f'{name} {metric}: {previous:.1f} -> {current:.1f} ({change:+.0%})'
+                    ))
+                raise CommandError(f'{len(regressions)} regression(s) against {baseline_path}')
+            self.stdout.write(self.style.SUCCESS(f'Within {options["tolerance"]:.0%} of {baseline_path}'))
+
+        if results['total']['errors']:
+            self.stdout.write(self.style.WARNING(f'{results["total"]["errors"]} request(s) failed'))
+        self.stdout.write(self.style.SUCCESS('Load test complete'))
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.25 on 2026-10-19 07:41
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# GIN indexes and the initial backfill only apply on PostgreSQL; other
+# backends use the substring fallback in library/search.py.
+CREATE_SEARCH_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS series_search_vector_gin ON series USING gin (search_vector)',
+    'CREATE INDEX IF NOT EXISTS chapter_search_vector_gin ON chapter USING gin (search_vector)',
+    """
+    UPDATE chapter SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(content, '')), 'D')
+    """,
+    """
+    UPDATE series SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce((
+            SELECT string_agg(korean_title, ' ')
+            FROM translationjob
+            WHERE translationjob.imported_series_id = series.series_id
+        ), '')), 'A')
+        || setweight(to_tsvector('english', coalesce(author, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    """,
+]
+
+DROP_SEARCH_INDEXES = [
+    'DROP INDEX IF EXISTS series_search_vector_gin',
+    'DROP INDEX IF EXISTS chapter_search_vector_gin',
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_SEARCH_INDEXES:
+        schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_SEARCH_INDEXES:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0003_series_prompt_dictionary'),
+        ('translator', '0003_translationjob_prompt_dictionary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chapter',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='series',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
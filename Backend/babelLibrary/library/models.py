@@ -1,10 +1,19 @@
 import uuid
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import Avg
+from django.db.models import Avg, Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
 
 
+class SearchVectorDeferringManager(models.Manager):
+    """Manager that leaves the full-text search column unloaded by default."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
 class Genre(models.Model):
     """Stores unique genre categories."""
     genre_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -17,6 +26,34 @@ class Genre(models.Model):
         return self.name
 
 
+class SeriesQuerySet(models.QuerySet):
+    """QuerySet helpers for reading series."""
+
+    def with_stats(self):
+        """
+        Annotate the values SeriesSerializer renders (average rating, total
+        views, chapter count) so serializing a page needs no per-series queries.
+
+        Each value is a correlated subquery rather than a join: joining
+        ratings, views and chapters at once multiplies their row counts.
+        """
+        def per_series(queryset, series_field, aggregate):
+            return Subquery(
+                queryset.filter(**{series_field: OuterRef('pk')})
+                .values(series_field).annotate(value=aggregate).values('value')
+            )
+
+        series_views = per_series(SeriesView.objects.all(), 'series', Count('visitor_id', distinct=True))
+        chapter_views = per_series(ChapterView.objects.all(), 'chapter__series', Count('visitor_id', distinct=True))
+        return self.annotate(
+            avg_rating=per_series(SeriesRating.objects.all(), 'series', Avg('rating')),
+            total_views=Coalesce(series_views, 0) + Coalesce(chapter_views, 0),
+            chapters_count_annotation=Coalesce(
+                per_series(Chapter.objects.all(), 'series', Count('pk')), 0, output_field=IntegerField()
+            )
+        )
+
+
 class Series(models.Model):
     """Stores information about each novel series."""
     STATUS_CHOICES = [
@@ -37,9 +74,12 @@ class Series(models.Model):
         null=True,
         help_text="Dictionary of terms for consistent translation (e.g., character names, organizations)"
     )
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SearchVectorDeferringManager.from_queryset(SeriesQuerySet)()
+
     class Meta:
         db_table = 'series'
         verbose_name_plural = 'Series'
@@ -80,6 +120,14 @@ class SeriesGenre(models.Model):
         return f"{self.series.title} - {self.genre.name}"
 
 
+class ChapterQuerySet(models.QuerySet):
+    """QuerySet helpers for reading chapters."""
+
+    def metadata_only(self):
+        """Defer the chapter body for reads that only need title/number metadata."""
+        return self.defer('content')
+
+
 class Chapter(models.Model):
     """Stores details for each chapter within a series."""
     chapter_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -89,9 +137,12 @@ class Chapter(models.Model):
     content = models.TextField()
     word_count = models.IntegerField(blank=True, null=True)
     publication_date = models.DateTimeField(blank=True, null=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SearchVectorDeferringManager.from_queryset(ChapterQuerySet)()
+
     class Meta:
         db_table = 'chapter'
         unique_together = ('series', 'chapter_number')
@@ -0,0 +1,149 @@
+"""
+Full-text search for series and chapters.
+
+On PostgreSQL, Series and Chapter keep a weighted tsvector in their
+search_vector column (GIN indexed, see migration 0004). The vectors are
+refreshed from library/signals.py whenever a save touches an indexed column,
+so imports and edits are searchable immediately. Korean source titles from translation
+jobs are folded into the series vector with the 'simple' configuration,
+since the English stemmer would mangle them.
+
+Queries match whole words (stemmed) or word prefixes, so partial input
+like "drag" still finds "Dragon".
+
+Other database backends (e.g. the SQLite development setup) fall back to
+case-insensitive substring matching without ranking or highlighting.
+"""
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, SearchVector,
+)
+from django.db import connection
+from django.db.models import Q, TextField, Value
+from rest_framework import filters
+
+from .models import Series, Chapter
+
+SEARCH_CONFIG = 'english'
+# Words of a search term usable in a raw tsquery (no operators or quotes).
+WORD = re.compile(r'[^\W_]+')
+# Columns that feed the search vectors; saves touching none of them skip the refresh.
+SERIES_SEARCH_FIELDS = frozenset({'title', 'author', 'description'})
+CHAPTER_SEARCH_FIELDS = frozenset({'title', 'content'})
+KOREAN_SEARCH_CONFIG = 'simple'
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+
+def search_enabled():
+    """Return True when the database supports the tsvector search index."""
+    return connection.vendor == 'postgresql'
+
+
+def build_query(term):
+    """
+    Match term as a web-style query, or as prefixes of its words.
+
+    The prefix half keeps search-as-you-type working ("drag" finds
+    "Dragon"), which the tsvector index alone would not.
+    """
+    query = SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+    words = WORD.findall(term)
+    if words:
+        prefixes = ' & '.join(f'{word}:*' for word in words)
+        query |= SearchQuery(prefixes, search_type='raw', config=SEARCH_CONFIG)
+    return query
+
+
+def touches(update_fields, indexed_fields):
+    """Whether a save with update_fields may have changed an indexed column."""
+    return update_fields is None or not indexed_fields.isdisjoint(update_fields)
+
+
+def update_series_search_vector(series_id):
+    """Recompute the search vector for one series."""
+    if not search_enabled():
+        return
+    korean_titles = Series.objects.filter(
+        series_id=series_id, translation_jobs__korean_title__isnull=False
+    ).values_list('translation_jobs__korean_title', flat=True)
+    korean_text = ' '.join(korean_titles)
+
+    Series.objects.filter(series_id=series_id).update(
+        search_vector=(
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(Value(korean_text, output_field=TextField()), weight='A', config=KOREAN_SEARCH_CONFIG)
+            + SearchVector('author', weight='B', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        )
+    )
+
+
+def chapter_search_vector():
+    """Expression computing a chapter's weighted search vector in SQL."""
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_chapter_search_vector(chapter_id):
+    """Recompute the search vector for one chapter."""
+    if not search_enabled():
+        return
+    Chapter.objects.filter(chapter_id=chapter_id).update(search_vector=chapter_search_vector())
+
+
+def search_series(term, limit):
+    """Return series matching term, best matches first."""
+    queryset = Series.objects.all()
+    if not search_enabled():
+        return queryset.filter(
+            Q(title__icontains=term)
+            | Q(description__icontains=term)
+            | Q(translation_jobs__korean_title__icontains=term)
+        ).distinct().order_by('title')[:limit]
+
+    query = build_query(term)
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank('search_vector', query),
+        headline=SearchHeadline(
+            'description', query, config=SEARCH_CONFIG,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+        ),
+    ).order_by('-rank')[:limit]
+
+
+def search_chapters(term, limit):
+    """Return chapters whose title or text match term, best matches first."""
+    queryset = Chapter.objects.metadata_only().select_related('series')
+    if not search_enabled():
+        return queryset.filter(
+            Q(title__icontains=term) | Q(content__icontains=term)
+        ).order_by('series', 'chapter_number')[:limit]
+
+    query = build_query(term)
+    # PostgreSQL evaluates ts_headline after ORDER BY/LIMIT, so only the
+    # returned page pays for highlighting the chapter text.
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank('search_vector', query),
+        headline=SearchHeadline(
+            'content', query, config=SEARCH_CONFIG,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+            max_fragments=2, max_words=35, min_words=15,
+        ),
+    ).order_by('-rank')[:limit]
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """SearchFilter that uses the tsvector index instead of ILIKE scans."""
+
+    def filter_queryset(self, request, queryset, view):
+        if not search_enabled():
+            return super().filter_queryset(request, queryset, view)
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        return queryset.filter(search_vector=build_query(term))
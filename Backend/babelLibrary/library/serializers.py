@@ -71,6 +71,11 @@ class SeriesSerializer(serializers.ModelSerializer):
         read_only_fields = ['series_id', 'average_rating', 'total_view_count', 'created_at', 'updated_at']
 
     def get_chapters_count(self, obj):
+        # Prefer the queryset annotation; fall back to a COUNT query for
+        # series that were loaded without it (e.g. nested serializers).
+        count = getattr(obj, 'chapters_count_annotation', None)
+        if count is not None:
+            return count
         return obj.chapters.count()
 
 
@@ -82,6 +87,27 @@ class SeriesDetailSerializer(SeriesSerializer):
         fields = SeriesSerializer.Meta.fields + ['chapters']
 
 
+class SeriesSearchResultSerializer(serializers.ModelSerializer):
+    """Series search hit with relevance rank and highlighted description."""
+    rank = serializers.FloatField(read_only=True, default=None)
+    headline = serializers.CharField(read_only=True, default=None)
+
+    class Meta:
+        model = Series
+        fields = ['series_id', 'title', 'author', 'cover_image_url', 'status', 'rank', 'headline']
+
+
+class ChapterSearchResultSerializer(serializers.ModelSerializer):
+    """Chapter search hit with relevance rank and highlighted text fragments."""
+    series_title = serializers.CharField(source='series.title', read_only=True)
+    rank = serializers.FloatField(read_only=True, default=None)
+    headline = serializers.CharField(read_only=True, default=None)
+
+    class Meta:
+        model = Chapter
+        fields = ['chapter_id', 'series', 'series_title', 'chapter_number', 'title', 'rank', 'headline']
+
+
 class SeriesRatingSerializer(serializers.ModelSerializer):
     """Serializer for rating a series."""
     user_username = serializers.CharField(source='user.username', read_only=True)
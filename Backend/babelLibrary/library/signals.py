@@ -0,0 +1,67 @@
+"""
+Signal handlers that keep derived library data current: cached responses
+and full-text search vectors.
+
+View tracking (SeriesView/ChapterView) deliberately does not invalidate:
+view counts in cached responses are allowed to lag by LIBRARY_CACHE_TIMEOUT
+rather than evicting the catalog on every page view.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from babelLibrary.versioning import bump_version
+from .caching import CATALOG_SCOPE, SERIES_SCOPE, CHAPTER_SCOPE
+from .models import Genre, Series, SeriesGenre, Chapter, SeriesRating
+from .search import (
+    CHAPTER_SEARCH_FIELDS, SERIES_SEARCH_FIELDS, touches,
+    update_chapter_search_vector, update_series_search_vector,
+)
+
+
+def _invalidate_series(series_id, modified_at=None, include_chapters=False):
+    bump_version(CATALOG_SCOPE, modified_at=modified_at)
+    bump_version(SERIES_SCOPE, series_id, modified_at=modified_at)
+    if include_chapters:
+        # Chapter payloads embed the series title.
+        chapter_ids = Chapter.objects.filter(series_id=series_id).values_list('chapter_id', flat=True)
+        for chapter_id in chapter_ids:
+            bump_version(CHAPTER_SCOPE, chapter_id, modified_at=modified_at)
+
+
+@receiver(post_save, sender=Series)
+def series_saved(sender, instance, update_fields=None, **kwargs):
+    if touches(update_fields, SERIES_SEARCH_FIELDS):
+        update_series_search_vector(instance.series_id)
+    _invalidate_series(instance.series_id, instance.updated_at, include_chapters=True)
+
+
+@receiver(post_delete, sender=Series)
+def series_deleted(sender, instance, **kwargs):
+    _invalidate_series(instance.series_id)
+
+
+@receiver(post_save, sender=Chapter)
+def chapter_saved(sender, instance, update_fields=None, **kwargs):
+    if touches(update_fields, CHAPTER_SEARCH_FIELDS):
+        update_chapter_search_vector(instance.chapter_id)
+    bump_version(CHAPTER_SCOPE, instance.chapter_id, modified_at=instance.updated_at)
+    _invalidate_series(instance.series_id, instance.updated_at)
+
+
+@receiver(post_delete, sender=Chapter)
+def chapter_deleted(sender, instance, **kwargs):
+    bump_version(CHAPTER_SCOPE, instance.chapter_id)
+    _invalidate_series(instance.series_id)
+
+
+@receiver([post_save, post_delete], sender=SeriesGenre)
+@receiver([post_save, post_delete], sender=SeriesRating)
+def invalidate_series_relation(sender, instance, **kwargs):
+    _invalidate_series(instance.series_id)
+
+
+@receiver([post_save, post_delete], sender=Genre)
+def invalidate_genre(sender, instance, **kwargs):
+    bump_version(CATALOG_SCOPE)
+    for series_id in SeriesGenre.objects.filter(genre=instance).values_list('series_id', flat=True):
+        bump_version(SERIES_SCOPE, series_id)
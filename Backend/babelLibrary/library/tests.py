@@ -1,3 +1,566 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from babelLibrary.instrumentation import registry
+from comments.models import Comment, CommentLike
+from users.models import Role, User
+from .loadtest import DEFAULT_PROFILE, LoadTest, compare_to_baseline, sample_targets
+from .models import Genre, Series, SeriesGenre, Chapter, ChapterView, SeriesRating, SeriesView
+
+
+def _make_series(count, chapters_per_series=5, content_size=20000):
+    """Create series with chapters whose bodies are large enough to matter."""
+    genre, _ = Genre.objects.get_or_create(name='Fantasy')
+    body = 'x' * content_size
+    for i in range(count):
+        series = Series.objects.create(title=f'Series {i}', description='Test series')
+        SeriesGenre.objects.create(series=series, genre=genre)
+        Chapter.objects.bulk_create([
+            Chapter(series=series, chapter_number=n, title=f'Chapter {n}', content=body)
+            for n in range(1, chapters_per_series + 1)
+        ])
+
+
+def _seed_catalog(series_count, chapters_per_series, views_per_series, users):
+    """Bulk-create a catalog with ratings and view rows; returns the series."""
+    genres = Genre.objects.bulk_create([Genre(name=f'Genre {i}') for i in range(10)])
+    series = Series.objects.bulk_create([
+        Series(title=f'Series {i}', description='Load test series', status='Ongoing')
+        for i in range(series_count)
+    ])
+    SeriesGenre.objects.bulk_create([
+        SeriesGenre(series=s, genre=genres[(i + offset) % len(genres)])
+        for i, s in enumerate(series) for offset in range(3)
+    ])
+    chapters = Chapter.objects.bulk_create([
+        Chapter(series=s, chapter_number=n, title=f'Chapter {n}', content='Body text. ' * 50)
+        for s in series for n in range(1, chapters_per_series + 1)
+    ], batch_size=1000)
+    SeriesRating.objects.bulk_create([
+        SeriesRating(series=s, user=user, rating=(i + j) % 5 + 1)
+        for i, s in enumerate(series) for j, user in enumerate(users)
+    ], batch_size=1000)
+    SeriesView.objects.bulk_create([
+        SeriesView(series=s, visitor_id=f'visitor-{v}') for s in series for v in range(views_per_series)
+    ], batch_size=5000)
+    ChapterView.objects.bulk_create([
+        ChapterView(chapter=c, visitor_id=f'visitor-{v}')
+        for c in chapters[::chapters_per_series] for v in range(views_per_series)
+    ], batch_size=5000)
+    return series
+
+
+class QueryBudgetMixin:
+    """
+    Assert per-endpoint query-count and latency budgets.
+
+    The query budget is exact enough to catch an N+1 regression on seeded
+    data; the latency budget is loose and only catches gross slowdowns.
+    The cache is cleared first so cached reads are measured cold.
+    """
+    latency_budget = 2.0
+
+    def assertWithinBudget(self, method, path, max_queries, data=None, client=None):
+        cache.clear()
+        client = client or self.client
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = getattr(client, method)(path, data, format='json')
+            elapsed = time.perf_counter() - start
+
+        label = f'{method.upper()} {path}'
+        self.assertLess(response.status_code, 400, f'{label} returned {response.status_code}')
+        self.assertLessEqual(
+            len(queries.captured_queries), max_queries,
+            f'{label} ran {len(queries.captured_queries)} queries (budget {max_queries}):\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+        self.assertLess(elapsed, self.latency_budget, f'{label} took {elapsed:.2f}s')
+        return response
+
+
+class SeriesListQueryTests(TestCase):
+    """The series catalog must not load chapter rows to count them."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _capture_list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/library/series/')
+        self.assertEqual(response.status_code, 200)
+        return response, ctx.captured_queries
+
+    def test_list_query_count_is_constant(self):
+        _make_series(2)
+        _, small_queries = self._capture_list()
+
+        _make_series(10)
+        response, large_queries = self._capture_list()
+
+        self.assertEqual(len(response.data), 12)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 2)
+
+    def test_list_reports_chapter_counts_without_fetching_content(self):
+        _make_series(3, chapters_per_series=4)
+        response, queries = self._capture_list()
+
+        self.assertTrue(all(item['chapters_count'] == 4 for item in response.data))
+        for query in queries:
+            self.assertNotIn('"chapter"."content"', query['sql'])
+        # Each chapter body is 20 KB; the listing must stay far below that.
+        self.assertLess(len(response.content), 20000)
+
+    def test_retrieve_defers_chapter_content(self):
+        _make_series(1, chapters_per_series=3)
+        series = Series.objects.get()
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'/api/library/series/{series.series_id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['chapters_count'], 3)
+        self.assertEqual(len(response.data['chapters']), 3)
+        for query in ctx.captured_queries:
+            self.assertNotIn('"chapter"."content"', query['sql'])
+
+
+class ChapterMetadataQueryTests(TestCase):
+    """Chapter endpoints that do not render body text must not select it."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        _make_series(1, chapters_per_series=3)
+        self.chapter = Chapter.objects.first()
+
+    def test_metadata_only_defers_content(self):
+        chapter = Chapter.objects.metadata_only().get(pk=self.chapter.pk)
+        self.assertIn('content', chapter.get_deferred_fields())
+
+    def test_chapter_list_does_not_select_content(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/library/chapters/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        for query in ctx.captured_queries:
+            self.assertNotIn('"chapter"."content"', query['sql'])
+
+    def test_chapter_retrieve_includes_content(self):
+        response = self.client.get(f'/api/library/chapters/{self.chapter.chapter_id}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['content']), 20000)
+
+
+class AnonymousReadCacheTests(TestCase):
+    """Anonymous catalog and chapter reads are cached and revalidated."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        _make_series(2, chapters_per_series=2, content_size=100)
+        self.series = Series.objects.first()
+        self.chapter = self.series.chapters.first()
+
+    def test_series_list_is_served_from_cache(self):
+        first = self.client.get('/api/library/series/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/library/series/')
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_chapter_save_invalidates_series_and_list(self):
+        detail_url = f'/api/library/series/{self.series.series_id}/'
+        self.client.get('/api/library/series/')
+        self.client.get(detail_url)
+
+        Chapter.objects.create(series=self.series, chapter_number=3, title='New', content='...')
+
+        listing = self.client.get('/api/library/series/')
+        detail = self.client.get(detail_url)
+        counts = {item['series_id']: item['chapters_count'] for item in listing.data}
+        self.assertEqual(counts[str(self.series.series_id)], 3)
+        self.assertEqual(len(detail.data['chapters']), 3)
+
+    def test_series_rename_invalidates_chapter(self):
+        url = f'/api/library/chapters/{self.chapter.chapter_id}/'
+        self.client.get(url)
+
+        self.series.title = 'Renamed'
+        self.series.save()
+
+        self.assertEqual(self.client.get(url).data['series_title'], 'Renamed')
+
+    def test_matching_etag_returns_not_modified(self):
+        url = f'/api/library/chapters/{self.chapter.chapter_id}/'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        self.chapter.title = 'Edited'
+        self.chapter.save()
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.data['title'], 'Edited')
+
+
+class SearchTests(TestCase):
+    """The search endpoint finds series by English or Korean title and chapters by text."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.series = Series.objects.create(
+            title='The Crimson Blade', description='A legendary warrior defends the realm.'
+        )
+        Chapter.objects.create(
+            series=self.series, chapter_number=1, title='Awakening',
+            content='The swordsman opened his eyes beneath the ancient willow.'
+        )
+
+    def test_requires_query(self):
+        response = self.client.get('/api/library/search/')
+        self.assertEqual(response.status_code, 400)
+
+    def test_finds_series_and_chapters(self):
+        response = self.client.get('/api/library/search/', {'q': 'crimson'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s['title'] for s in response.data['series']], ['The Crimson Blade'])
+
+        response = self.client.get('/api/library/search/', {'q': 'willow', 'type': 'chapters'})
+        self.assertNotIn('series', response.data)
+        self.assertEqual([c['title'] for c in response.data['chapters']], ['Awakening'])
+
+    def test_finds_series_by_korean_source_title(self):
+        from translator.models import TranslationJob
+        TranslationJob.objects.create(
+            novel_url='https://example.com/novel/1', korean_title='붉은 검',
+            chapters_requested=1, imported_series=self.series
+        )
+
+        response = self.client.get('/api/library/search/', {'q': '붉은', 'type': 'series'})
+
+        self.assertEqual([s['series_id'] for s in response.data['series']], [str(self.series.series_id)])
+
+    def test_saves_outside_indexed_columns_skip_vector_refresh(self):
+        chapter = self.series.chapters.get()
+        with mock.patch('library.signals.update_chapter_search_vector') as refresh:
+            chapter.save(update_fields=['word_count'])
+            refresh.assert_not_called()
+            chapter.save(update_fields=['title'])
+            refresh.assert_called_once_with(chapter.chapter_id)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'tsvector search needs PostgreSQL')
+class PostgresSearchTests(TestCase):
+    """On PostgreSQL, search uses the tsvector index and still matches word prefixes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.series = Series.objects.create(title='Dragon Emperor', description='Wings over the capital.')
+        Series.objects.create(title='Quiet Harbor', description='A fishing village.')
+
+    def test_ranked_search_matches_prefixes(self):
+        response = self.client.get('/api/library/search/', {'q': 'drag', 'type': 'series'})
+        self.assertEqual([s['title'] for s in response.data['series']], ['Dragon Emperor'])
+
+        response = self.client.get('/api/library/search/', {'q': 'emperors', 'type': 'series'})
+        self.assertEqual([s['title'] for s in response.data['series']], ['Dragon Emperor'])
+
+    def test_search_filter_matches_prefixes(self):
+        response = self.client.get('/api/library/series/', {'search': 'capit'})
+        self.assertEqual([s['title'] for s in response.data], ['Dragon Emperor'])
+
+    def test_unindexed_save_does_not_touch_vector(self):
+        self.series.status = 'Completed'
+        with CaptureQueriesContext(connection) as queries:
+            self.series.save(update_fields=['status'])
+        self.assertFalse([q for q in queries.captured_queries if 'search_vector' in q['sql']])
+
+
+class GenreFilterTests(TestCase):
+    """Multi-genre filtering matches series having ALL requested genres."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.genres = {name: Genre.objects.create(name=name) for name in ['Action', 'Fantasy', 'Romance', 'Mystery']}
+        self._series('Blade', ['Action', 'Fantasy'])
+        self._series('Courtship', ['Fantasy', 'Romance'])
+        self._series('Everything', ['Action', 'Fantasy', 'Romance', 'Mystery'])
+
+    def _series(self, title, genre_names):
+        series = Series.objects.create(title=title)
+        for name in genre_names:
+            SeriesGenre.objects.create(series=series, genre=self.genres[name])
+
+    def _genre_params(self, *names):
+        return {'genre': [str(self.genres[name].genre_id) for name in names]}
+
+    def test_requires_all_genres(self):
+        response = self.client.get('/api/library/series/', self._genre_params('Action', 'Fantasy'))
+        self.assertEqual(sorted(s['title'] for s in response.data), ['Blade', 'Everything'])
+
+    def test_query_count_does_not_grow_with_genres(self):
+        with CaptureQueriesContext(connection) as one:
+            self.client.get('/api/library/series/', self._genre_params('Fantasy'))
+        cache.clear()
+        with CaptureQueriesContext(connection) as four:
+            response = self.client.get(
+                '/api/library/series/', self._genre_params('Action', 'Fantasy', 'Romance', 'Mystery')
+            )
+
+        self.assertEqual([s['title'] for s in response.data], ['Everything'])
+        self.assertEqual(len(one.captured_queries), len(four.captured_queries))
+
+    def test_facets_count_remaining_genres(self):
+        params = self._genre_params('Fantasy')
+        params['include_facets'] = 'true'
+        response = self.client.get('/api/library/series/', params)
+
+        self.assertEqual(len(response.data['results']), 3)
+        facets = {f['name']: f['count'] for f in response.data['genre_facets']}
+        self.assertEqual(facets, {'Action': 2, 'Romance': 2, 'Mystery': 1})
+
+    def test_invalid_genre_id_is_rejected(self):
+        response = self.client.get('/api/library/series/', {'genre': 'not-a-uuid'})
+        self.assertEqual(response.status_code, 400)
+
+
+class InstrumentationTests(TestCase):
+    """Requests report query and serializer time and feed /metrics."""
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.client = APIClient()
+        _make_series(2, content_size=10)
+
+    def test_server_timing_header(self):
+        role = Role.objects.create(name='Admin')
+        staff = User.objects.create_user('staff', 'staff@example.com', 'pw', role=role, is_staff=True)
+        self.client.force_authenticate(staff)
+        response = self.client.get('/api/library/series/')
+
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_server_timing_hidden_from_public(self):
+        response = self.client.get('/api/library/series/')
+        self.assertNotIn('Server-Timing', response)
+
+        with override_settings(DEBUG=True):
+            self.assertIn('Server-Timing', self.client.get('/api/library/series/'))
+
+    @override_settings(DEBUG=True)
+    def test_metrics_endpoint_aggregates_by_view(self):
+        self.client.get('/api/library/series/')
+        self.client.get('/api/library/series/')
+
+        body = self.client.get('/metrics').content.decode()
+
+        self.assertIn('babel_http_requests_total{view="series-list",method="GET",status="200"} 2', body)
+        self.assertIn('babel_db_queries_per_request_count{view="series-list"} 2', body)
+        self.assertIn('babel_http_response_bytes_total{view="series-list"}', body)
+
+    def test_metrics_closed_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(SLOW_REQUEST_QUERY_THRESHOLD=1)
+    def test_slow_request_logs_sql(self):
+        with self.assertLogs('babelLibrary.instrumentation', 'WARNING') as logs:
+            self.client.get('/api/library/series/')
+
+        self.assertIn('series-list', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+
+class LibraryQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every library endpoint stays within its query budget on a seeded catalog."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Reader')
+        users = [
+            User.objects.create_user(f'reader{i}', f'reader{i}@example.com', 'pw', role=role) for i in range(5)
+        ]
+        cls.user = users[0]
+        cls.series = _seed_catalog(200, 10, 50, users)[0]
+        cls.genre = Genre.objects.first()
+        cls.chapter = Chapter.objects.filter(series=cls.series, chapter_number=2).first()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _read_budgets(self):
+        series, chapter = self.series.series_id, self.chapter.chapter_id
+        return [
+            ('/api/library/genres/', 1),
+            (f'/api/library/genres/{self.genre.genre_id}/', 1),
+            (f'/api/library/genres/{self.genre.genre_id}/series/', 3),
+            ('/api/library/series/', 2),
+            (f'/api/library/series/{series}/', 3),
+            (f'/api/library/series/{series}/chapters/', 2),
+            ('/api/library/series/by_genre/?genre=Genre%200', 2),
+            ('/api/library/series-genres/', 2),
+            ('/api/library/chapters/', 2),
+            (f'/api/library/chapters/{chapter}/', 1),
+            (f'/api/library/chapters/{chapter}/next/', 2),
+            (f'/api/library/chapters/{chapter}/previous/', 2),
+            ('/api/library/search/?q=Series', 2),
+        ]
+
+    def test_anonymous_reads(self):
+        for path, budget in self._read_budgets():
+            with self.subTest(path=path):
+                self.assertWithinBudget('get', path, budget)
+
+    def test_authenticated_reads(self):
+        self.client.force_authenticate(self.user)
+        for path, budget in self._read_budgets():
+            with self.subTest(path=path):
+                self.assertWithinBudget('get', path, budget)
+
+    def test_track_view(self):
+        self.client.force_authenticate(self.user)
+        self.assertWithinBudget('post', f'/api/library/series/{self.series.series_id}/track_view/', 6)
+        self.assertWithinBudget('post', f'/api/library/chapters/{self.chapter.chapter_id}/track_view/', 6)
+
+    def test_rate(self):
+        self.client.force_authenticate(User.objects.create_user('critic', 'critic@example.com', 'pw', role=self.user.role))
+        self.assertWithinBudget('post', f'/api/library/series/{self.series.series_id}/rate/', 4, {'rating': 5})
+
+
+class GenerateLoadDataTests(TestCase):
+    """generate_load_data creates consistent, reproducible data."""
+
+    def _generate(self, seed=7):
+        call_command(
+            'generate_load_data', series=5, chapters_per_series=4, chapter_length=50, users=10,
+            comments=60, likes=80, views=300, ratings=20, seed=seed, skip_search_index=True, stdout=StringIO()
+        )
+
+    def _snapshot(self):
+        return (
+            list(Series.objects.order_by('series_id').values_list('series_id', 'title')),
+            list(Chapter.objects.order_by('chapter_id').values_list('chapter_id', 'word_count')),
+            list(SeriesView.objects.order_by('view_id').values_list('series_id', 'visitor_id')),
+        )
+
+    def test_counts_and_counters(self):
+        self._generate()
+
+        self.assertEqual(Series.objects.count(), 5)
+        self.assertEqual(User.objects.count(), 10)
+        self.assertEqual(SeriesView.objects.count() + ChapterView.objects.count(), 300)
+        self.assertEqual(SeriesRating.objects.count(), 20)
+        self.assertEqual(Comment.objects.count(), 60)
+        self.assertEqual(CommentLike.objects.count(), 80)
+        for comment in Comment.objects.all():
+            self.assertEqual(comment.like_count, comment.likes.count())
+            self.assertEqual(comment.reply_count, comment.replies.count())
+
+    def test_same_seed_same_data(self):
+        with transaction.atomic():
+            self._generate()
+            first = self._snapshot()
+            transaction.set_rollback(True)
+
+        self._generate()
+        self.assertEqual(self._snapshot(), first)
+
+    def test_fills_every_rating_and_like_pair(self):
+        call_command(
+            'generate_load_data', series=5, chapters_per_series=4, chapter_length=50, users=10,
+            comments=20, likes=200, views=0, ratings=50, seed=3, skip_search_index=True, stdout=StringIO()
+        )
+
+        self.assertEqual(SeriesRating.objects.count(), 50)
+        self.assertEqual(CommentLike.objects.count(), 200)
+        numbers = dict(Chapter.objects.values_list('chapter_id', 'chapter_number'))
+        for comment in Comment.objects.exclude(chapter_id=None):
+            self.assertEqual(comment.chapter_title, str(numbers[comment.chapter_id]))
+
+    def test_refuses_to_duplicate_a_seed(self):
+        self._generate()
+        with self.assertRaises(CommandError):
+            self._generate()
+
+
+class LoadTestHarnessTests(LiveServerTestCase):
+    """The default profile runs cleanly against a live server."""
+
+    def test_default_profile(self):
+        role = Role.objects.create(name='Reader')
+        _seed_catalog(series_count=3, chapters_per_series=3, views_per_series=0, users=[
+            User.objects.create_user(f'reader{i}', f'reader{i}@example.com', 'pw', role=role) for i in range(2)
+        ])
+
+        results = LoadTest(self.live_server_url, DEFAULT_PROFILE, sample_targets(), concurrency=2, seed=1).run(1)
+
+        self.assertGreater(results['total']['requests'], 0)
+        self.assertEqual(results['total']['errors'], 0)
+        self.assertEqual(set(results), {endpoint['name'] for endpoint in DEFAULT_PROFILE['endpoints']} | {'total'})
+
+    def test_command_saves_and_compares_baseline(self):
+        _seed_catalog(series_count=1, chapters_per_series=2, views_per_series=0, users=[
+            User.objects.create_user('reader', 'reader@example.com', 'pw', role=Role.objects.create(name='Reader'))
+        ])
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        baseline = os.path.join(directory, 'baselines', 'load_test.json')
+        options = {'url': self.live_server_url, 'duration': 0.5, 'warmup': 0, 'concurrency': 1, 'seed': 1}
+
+        with mock.patch('library.management.commands.run_load_test.DEFAULT_BASELINE', baseline):
+            out = StringIO()
+            call_command('run_load_test', save=baseline, stdout=out, **options)
+            self.assertIn('No baseline at', out.getvalue())
+            self.assertTrue(os.path.exists(baseline))
+
+            out = StringIO()
+            call_command('run_load_test', tolerance=100, stdout=out, **options)
+            self.assertIn(f'of {baseline}', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('run_load_test', baseline=baseline + '.missing', stdout=StringIO(), **options)
+
+    def test_compare_to_baseline(self):
+        baseline = {'total': {'rps': 100.0, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 40.0}}
+        within = {'total': {'rps': 95.0, 'p50_ms': 10.5, 'p95_ms': 21.0, 'p99_ms': 30.0}}
+        worse = {'total': {'rps': 80.0, 'p50_ms': 10.0, 'p95_ms': 30.0, 'p99_ms': 40.0}}
+
+        self.assertEqual(compare_to_baseline(within, baseline, 0.1), [])
+        self.assertEqual(
+            [(name, metric) for name, metric, *_ in compare_to_baseline(worse, baseline, 0.1)],
+            [('total', 'p95_ms'), ('total', 'rps')],
+        )
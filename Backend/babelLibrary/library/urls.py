@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import GenreViewSet, SeriesViewSet, SeriesGenreViewSet, ChapterViewSet
+from .views import GenreViewSet, SeriesViewSet, SeriesGenreViewSet, ChapterViewSet, SearchViewSet
 
 router = DefaultRouter()
 router.register(r'genres', GenreViewSet, basename='genre')
 router.register(r'series', SeriesViewSet, basename='series')
 router.register(r'series-genres', SeriesGenreViewSet, basename='seriesgenre')
 router.register(r'chapters', ChapterViewSet, basename='chapter')
+router.register(r'search', SearchViewSet, basename='search')
 
 urlpatterns = [
     path('', include(router.urls)),
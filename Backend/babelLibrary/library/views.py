@@ -2,15 +2,23 @@ from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Avg, Count
+from django.db.models import Count, Prefetch
+from babelLibrary.instrumentation import InstrumentedViewMixin
+from .caching import CachedReadMixin, CATALOG_SCOPE, SERIES_SCOPE, CHAPTER_SCOPE
 from .models import Genre, Series, SeriesGenre, Chapter, SeriesRating, SeriesView, ChapterView
+from .genres import parse_genre_ids, filter_series_by_genres, count_genre_facets
+from .search import FullTextSearchFilter, search_series, search_chapters
 from .serializers import (
     GenreSerializer, SeriesSerializer, SeriesDetailSerializer,
-    SeriesGenreSerializer, ChapterSerializer, ChapterListSerializer, SeriesRatingSerializer
+    SeriesGenreSerializer, ChapterSerializer, ChapterListSerializer, SeriesRatingSerializer,
+    SeriesSearchResultSerializer, ChapterSearchResultSerializer
 )
 
 
 class ViewTrackingMixin:
+    # View tracking only needs the user id, which the token carries.
+    stateless_auth_actions = ['track_view']
+
     def _get_client_ip(self, request):
         """Get client IP address from request."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -22,7 +30,7 @@ class ViewTrackingMixin:
         return ip
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class GenreViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Genre instances.
     """
@@ -37,22 +45,19 @@ class GenreViewSet(viewsets.ModelViewSet):
     def series(self, request, pk=None):
         """Get all series for this genre"""
         genre = self.get_object()
-        series = genre.series.all()
+        series = Series.objects.with_stats().prefetch_related('genres').filter(genres=genre)
         serializer = SeriesSerializer(series, many=True)
         return Response(serializer.data)
 
 
-class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
+class SeriesViewSet(InstrumentedViewMixin, CachedReadMixin, ViewTrackingMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Series instances.
     """
-    queryset = Series.objects.all().prefetch_related('genres', 'chapters').annotate(
-        avg_rating=Avg('ratings__rating'),
-        total_views=Count('series_views__visitor_id', distinct=True) + Count('chapters__chapter_views__visitor_id', distinct=True)
-    )
+    queryset = Series.objects.with_stats().prefetch_related('genres')
     pagination_class = None
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'genres']
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'updated_at', 'title']
@@ -60,22 +65,42 @@ class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Override to support filtering by multiple genre IDs."""
+        # Actions that only need the series row skip the stats and genres.
+        if self.action in ['chapters', 'rate', 'track_view']:
+            return Series.objects.all()
+
         queryset = super().get_queryset()
+
+        # Only the detail view renders the chapter list; prefetch chapter
+        # metadata there without pulling every chapter body into memory.
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'chapters',
+                    queryset=Chapter.objects.metadata_only().order_by('chapter_number')
+                )
+            )
         
         # Handle multiple genre filtering via query params
-        genre_ids = self.request.query_params.getlist('genre')
-        if genre_ids:
-            # Filter series that have ALL of the specified genres
-            # Use a separate filter for each genre to ensure ALL are present
-            # This allows users to find series that match multiple genre criteria simultaneously
-            # (e.g., both Fantasy AND Romance), rather than just any one of the selected genres.
-            for genre_id in genre_ids:
-                queryset = queryset.filter(genres__genre_id=genre_id)
-            # .distinct() is required because filtering on the many-to-many 'genres' relationship
-            # can cause the same series to appear multiple times
-            queryset = queryset.distinct()
-        
-        return queryset
+        # Series must have ALL of the specified genres (e.g., both Fantasy AND Romance),
+        # rather than just any one of the selected genres.
+        genre_ids = parse_genre_ids(self.request.query_params.getlist('genre'))
+        return filter_series_by_genres(queryset, genre_ids)
+
+    def list(self, request, *args, **kwargs):
+        """
+        List series. With include_facets=true, the response becomes
+        {"results": [...], "genre_facets": [{"genre_id", "name", "count"}]}
+        where the facets count the remaining genres among the results.
+        """
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and request.query_params.get('include_facets') == 'true':
+            selected = parse_genre_ids(request.query_params.getlist('genre'))
+            response.data = {
+                'results': response.data,
+                'genre_facets': count_genre_facets(response.data, exclude_ids=selected),
+            }
+        return response
 
     def get_permissions(self):
         """
@@ -85,6 +110,11 @@ class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return super().get_permissions()
 
+    def get_cache_scopes(self):
+        if self.action == 'retrieve':
+            return [(SERIES_SCOPE, self.kwargs['pk'])]
+        return [(CATALOG_SCOPE, None)]
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return SeriesDetailSerializer
@@ -94,7 +124,7 @@ class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
     def chapters(self, request, pk=None):
         """Get all chapters for this series"""
         series = self.get_object()
-        chapters = series.chapters.all().order_by('chapter_number')
+        chapters = series.chapters.metadata_only().order_by('chapter_number')
         serializer = ChapterListSerializer(chapters, many=True)
         return Response(serializer.data)
 
@@ -103,7 +133,7 @@ class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
         """Filter series by genre name"""
         genre_name = request.query_params.get('genre', None)
         if genre_name:
-            series = Series.objects.filter(genres__name__iexact=genre_name)
+            series = Series.objects.with_stats().prefetch_related('genres').filter(genres__name__iexact=genre_name)
             serializer = self.get_serializer(series, many=True)
             return Response(serializer.data)
         return Response({'error': 'genre parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
@@ -165,7 +195,7 @@ class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
         
         # Get visitor ID (user ID if authenticated, otherwise session/IP)
         if request.user.is_authenticated:
-            visitor_id = f"user_{request.user.user_id}"
+            visitor_id = f"user_{request.user.pk}"
         else:
             # Use session key or IP address as fallback
             visitor_id = request.session.session_key
@@ -188,16 +218,16 @@ class SeriesViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
             'view_count': series.total_view_count
         }, status=status.HTTP_200_OK)
 
-class SeriesGenreViewSet(viewsets.ModelViewSet):
+class SeriesGenreViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Series-Genre relationships.
     """
-    queryset = SeriesGenre.objects.all()
+    queryset = SeriesGenre.objects.select_related('series', 'genre')
     serializer_class = SeriesGenreSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
 
-class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
+class ChapterViewSet(InstrumentedViewMixin, CachedReadMixin, ViewTrackingMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Chapter instances.
     """
@@ -209,6 +239,7 @@ class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
     filterset_fields = ['series']
     ordering_fields = ['chapter_number', 'publication_date', 'created_at']
     ordering = ['series', 'chapter_number']
+    cached_actions = ['retrieve']
 
     def get_permissions(self):
         """
@@ -218,6 +249,16 @@ class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
             return [permissions.AllowAny()]
         return super().get_permissions()
 
+    def get_queryset(self):
+        """Skip loading chapter bodies for actions that never render them."""
+        queryset = super().get_queryset()
+        if self.action in ['list', 'track_view']:
+            queryset = queryset.metadata_only()
+        return queryset
+
+    def get_cache_scopes(self):
+        return [(CHAPTER_SCOPE, self.kwargs['pk'])]
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ChapterListSerializer
@@ -227,8 +268,8 @@ class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
     def next(self, request, pk=None):
         """Get the next chapter in the series"""
         chapter = self.get_object()
-        next_chapter = Chapter.objects.filter(
-            series=chapter.series,
+        next_chapter = self.get_queryset().filter(
+            series=chapter.series_id,
             chapter_number=chapter.chapter_number + 1
         ).first()
         if next_chapter:
@@ -240,8 +281,8 @@ class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
     def previous(self, request, pk=None):
         """Get the previous chapter in the series"""
         chapter = self.get_object()
-        prev_chapter = Chapter.objects.filter(
-            series=chapter.series,
+        prev_chapter = self.get_queryset().filter(
+            series=chapter.series_id,
             chapter_number=chapter.chapter_number - 1
         ).first()
         if prev_chapter:
@@ -256,7 +297,7 @@ class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
         
         # Get visitor ID (user ID if authenticated, otherwise session/IP)
         if request.user.is_authenticated:
-            visitor_id = f"user_{request.user.user_id}"
+            visitor_id = f"user_{request.user.pk}"
         else:
             # Use session key or IP address as fallback
             visitor_id = request.session.session_key
@@ -278,3 +319,41 @@ class ChapterViewSet(ViewTrackingMixin, viewsets.ModelViewSet):
             'message': 'View tracked' if created else 'View already recorded',
             'view_count': chapter.view_count
         }, status=status.HTTP_200_OK)
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """
+    Ranked full-text search across series and chapters.
+
+    Query params: q (search terms), type (series/chapters, default both),
+    limit (results per type, default 20, max 50)
+    """
+    permission_classes = [permissions.AllowAny]
+    default_limit = 20
+    max_limit = 50
+
+    def list(self, request):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            return Response({'error': 'q parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        search_type = request.query_params.get('type')
+        if search_type not in (None, 'series', 'chapters'):
+            return Response(
+                {'error': 'type must be one of: series, chapters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = {'query': term}
+        if search_type in (None, 'series'):
+            results['series'] = SeriesSearchResultSerializer(search_series(term, limit), many=True).data
+        if search_type in (None, 'chapters'):
+            results['chapters'] = ChapterSearchResultSerializer(search_chapters(term, limit), many=True).data
+        return Response(results)
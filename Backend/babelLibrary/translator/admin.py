@@ -2,9 +2,19 @@
 Django admin configuration for translator app.
 """
 from django.contrib import admin
+from django.db.models import Sum
+from django.utils.html import format_html, format_html_join
 from .models import TranslationJob, TranslatedChapterCache
 
 
+def _format_duration(duration):
+    if duration is None:
+        return '-'
+    minutes, seconds = divmod(int(duration.total_seconds()), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}h {minutes:02d}m' if hours else f'{minutes}m {seconds:02d}s'
+
+
 @admin.register(TranslationJob)
 class TranslationJobAdmin(admin.ModelAdmin):
     """Admin interface for TranslationJob."""
@@ -14,6 +24,9 @@ class TranslationJobAdmin(admin.ModelAdmin):
         'status',
         'chapters_completed',
         'chapters_requested',
+        'throughput_display',
+        'eta_display',
+        'total_tokens',
         'created_at',
     ]
     list_filter = ['status', 'created_at']
@@ -22,8 +35,12 @@ class TranslationJobAdmin(admin.ModelAdmin):
         'job_id',
         'created_at',
         'updated_at',
+        'started_at',
         'completed_at',
         'progress_percentage',
+        'throughput_display',
+        'eta_display',
+        'telemetry_summary',
     ]
     
     fieldsets = (
@@ -60,10 +77,18 @@ class TranslationJobAdmin(admin.ModelAdmin):
                 'progress_percentage',
             )
         }),
+        ('Telemetry', {
+            'fields': (
+                'throughput_display',
+                'eta_display',
+                'telemetry_summary',
+            )
+        }),
         ('Timestamps', {
             'fields': (
                 'created_at',
                 'updated_at',
+                'started_at',
                 'completed_at',
             )
         }),
@@ -71,6 +96,42 @@ class TranslationJobAdmin(admin.ModelAdmin):
             'fields': ('imported_series',)
         }),
     )
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            token_total=Sum('cached_chapters__input_tokens') + Sum('cached_chapters__output_tokens')
+        )
+    
+    @admin.display(description='Chapters/hour')
+    def throughput_display(self, obj):
+        return f'{obj.throughput:.1f}' if obj.throughput else '-'
+    
+    @admin.display(description='ETA')
+    def eta_display(self, obj):
+        return _format_duration(obj.eta)
+    
+    @admin.display(description='Tokens', ordering='token_total')
+    def total_tokens(self, obj):
+        return obj.token_total or 0
+    
+    @admin.display(description='Stage totals')
+    def telemetry_summary(self, obj):
+        totals = obj.telemetry()
+        chapters = totals['chapters'] or 1
+        rows = [
+            ('Chapters', totals['chapters'], ''),
+            ('Scrape', f"{totals['scrape_ms'] / 1000:.1f}s", f"{totals['scrape_ms'] / chapters / 1000:.1f}s"),
+            ('Translate', f"{totals['translate_ms'] / 1000:.1f}s", f"{totals['translate_ms'] / chapters / 1000:.1f}s"),
+            ('Polish', f"{totals['polish_ms'] / 1000:.1f}s", f"{totals['polish_ms'] / chapters / 1000:.1f}s"),
+            ('Retries', totals['retries'], f"{totals['retries'] / chapters:.2f}"),
+            ('Input tokens', totals['input_tokens'], f"{totals['input_tokens'] // chapters}"),
+            ('Output tokens', totals['output_tokens'], f"{totals['output_tokens'] // chapters}"),
+            ('Estimated cost', f"${totals['estimated_cost']:.4f}", f"${totals['estimated_cost'] / chapters:.4f}"),
+        ]
+        return format_html(
+            '<table><tr><th></th><th>Total</th><th>Per chapter</th></tr>{}</table>',
+            format_html_join('', '<tr><th>{}</th><td>{}</td><td>{}</td></tr>', rows),
+        )
 
 
 @admin.register(TranslatedChapterCache)
@@ -83,6 +144,10 @@ class TranslatedChapterCacheAdmin(admin.ModelAdmin):
         'english_title',
         'status',
         'word_count',
+        'scrape_ms',
+        'translate_ms',
+        'polish_ms',
+        'retries',
     ]
     list_filter = ['status', 'job']
     search_fields = ['english_title', 'korean_title', 'job__english_title']
@@ -91,6 +156,12 @@ class TranslatedChapterCacheAdmin(admin.ModelAdmin):
         'created_at',
         'updated_at',
         'word_count',
+        'scrape_ms',
+        'translate_ms',
+        'polish_ms',
+        'retries',
+        'input_tokens',
+        'output_tokens',
     ]
     
     fieldsets = (
@@ -118,6 +189,16 @@ class TranslatedChapterCacheAdmin(admin.ModelAdmin):
                 'word_count',
             )
         }),
+        ('Telemetry', {
+            'fields': (
+                'scrape_ms',
+                'translate_ms',
+                'polish_ms',
+                'retries',
+                'input_tokens',
+                'output_tokens',
+            )
+        }),
         ('Timestamps', {
             'fields': (
                 'created_at',
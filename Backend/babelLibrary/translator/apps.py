@@ -6,5 +6,6 @@ class TranslatorConfig(AppConfig):
     name = 'translator'
     
     def ready(self):
-        """Import checks when app is ready."""
+        """Import checks and signal handlers when app is ready."""
         from . import checks  # noqa: F401
+        from . import signals  # noqa: F401
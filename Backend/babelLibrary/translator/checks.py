@@ -40,3 +40,30 @@ def check_scraper_domain_whitelist(app_configs, **kwargs):
             )
     
     return errors
+
+
+@register(Tags.security, deploy=True)
+def check_pipeline_stubs(app_configs, **kwargs):
+    """
+    Check that the offline FlareSolverr and Gemini stubs are not enabled in production.
+    
+    Runs during: python manage.py check --deploy
+    """
+    errors = []
+    
+    if not settings.DEBUG:
+        stubbed = [
+            name for name, real in (('FLARESOLVERR_BACKEND', 'flaresolverr'), ('GEMINI_BACKEND', 'api'))
+            if getattr(settings, name, real) == 'stub'
+        ]
+        for name in stubbed:
+            errors.append(
+                Warning(
+                    f'{name} is set to the benchmarking stub.',
+                    hint='Translation jobs will produce placeholder text. Unset it outside of benchmarks.',
+                    obj=f'settings.{name}',
+                    id='translator.W002',
+                )
+            )
+    
+    return errors
@@ -0,0 +1,108 @@
+"""
+Offline stand-in for the Gemini API, for benchmarking the pipeline.
+
+Enabled with GEMINI_BACKEND = 'stub', which makes call_gemini() use
+generate_content() instead of the API. The response carries the text and
+usage metadata with token counts estimated from the text. The text is
+deterministic: the same prompt and input always give the same output, one
+paragraph per input paragraph and roughly as long as a real translation
+(Korean input expands about twofold in English). Each call sleeps for
+
+    GEMINI_STUB_LATENCY_MS + GEMINI_STUB_LATENCY_PER_1K_CHARS_MS * output chars / 1000
+
+to mimic request overhead plus generation time, and a GEMINI_STUB_ERROR_RATE
+fraction of calls raises ResourceExhausted like a rate-limited API key would.
+"""
+from django.conf import settings
+from google.api_core.exceptions import ResourceExhausted
+import hashlib
+import random
+import threading
+import time
+
+# Characters of English output per input character.
+HANGUL_EXPANSION = 2.0
+LATIN_EXPANSION = 1.0
+
+WORDS = (
+    'the', 'tower', 'silver', 'mage', 'light', 'door', 'slowly', 'opened', 'and', 'a', 'cold', 'wind',
+    'carried', 'scent', 'of', 'old', 'paper', 'he', 'she', 'said', 'quietly', 'into', 'dark', 'hall',
+    'every', 'step', 'echoed', 'against', 'stone', 'while', 'lanterns', 'drifted', 'above', 'them',
+    'nobody', 'had', 'ever', 'solved', 'this', 'problem', 'before', 'but', 'father', 'left', 'journal',
+    'with', 'circle', 'drawn', 'on', 'its', 'last', 'page', 'morning', 'mist', 'was', 'already', 'late',
+)
+
+# Token estimate: a Hangul syllable is about one token, other text about
+# four characters per token.
+CHARS_PER_TOKEN = 4
+
+_error_rng = random.Random()
+_error_lock = threading.Lock()
+
+
+def stub_enabled():
+    """Whether call_gemini() uses the stub."""
+    return getattr(settings, 'GEMINI_BACKEND', 'api') == 'stub'
+
+
+class UsageMetadata:
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+
+class StubResponse:
+    """The parts of a GenerateContentResponse that call_gemini() uses."""
+
+    def __init__(self, text, usage_metadata):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+def count_tokens(text):
+    hangul = sum('가' <= char <= '힣' for char in text)
+    return hangul + -(-(len(text) - hangul) // CHARS_PER_TOKEN)
+
+
+def _paragraph(rng, length):
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    words[0] = words[0].capitalize()
+    return ' '.join(words) + '.'
+
+
+def generate_content(system_prompt: str, user_text: str) -> StubResponse:
+    """Return a deterministic stand-in response for a prompt.
+
+    Raises:
+        ResourceExhausted: For the GEMINI_STUB_ERROR_RATE fraction of calls
+    """
+    error_rate = settings.GEMINI_STUB_ERROR_RATE
+    if error_rate:
+        with _error_lock:
+            failed = _error_rng.random() < error_rate
+        if failed:
+            time.sleep(settings.GEMINI_STUB_LATENCY_MS / 1000)
+            raise ResourceExhausted('Resource has been exhausted (injected by the Gemini stub)')
+
+    digest = hashlib.sha256(f'{system_prompt}\0{user_text}'.encode()).digest()
+    rng = random.Random(digest)
+    paragraphs = []
+    for source in user_text.split('\n\n'):
+        source = source.strip()
+        if not source:
+            continue
+        hangul = sum('가' <= char <= '힣' for char in source)
+        expansion = HANGUL_EXPANSION if hangul * 2 > len(source) else LATIN_EXPANSION
+        paragraphs.append(_paragraph(rng, int(len(source) * expansion)))
+    text = '\n\n'.join(paragraphs)
+
+    latency = settings.GEMINI_STUB_LATENCY_MS + settings.GEMINI_STUB_LATENCY_PER_1K_CHARS_MS * len(text) / 1000
+    if latency:
+        time.sleep(latency / 1000)
+    return StubResponse(text, UsageMetadata(count_tokens(system_prompt) + count_tokens(user_text), count_tokens(text)))
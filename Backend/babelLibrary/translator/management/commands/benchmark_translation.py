@@ -0,0 +1,135 @@
+import time
+from threading import Thread
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Avg, Sum
+from django.test.utils import override_settings
+
+from translator.models import TranslatedChapterCache, TranslationJob
+from translator.scraper import cleanup_browser
+from translator.translator_service import start_translation_job
+
+# Novel page served by the default fixtures in translator/scraping/fixtures.
+FIXTURE_NOVEL_URL = 'https://novel.invalid/novel/1001'
+
+
+class Command(BaseCommand):
+    help = (
+        'Run translation jobs end to end against the FlareSolverr and Gemini stubs and report '
+        'chapters/hour and mean stage timings at each concurrency level (concurrent jobs)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', default='1,2,4,8',
+            help='Comma-separated numbers of jobs to run at once (default: 1,2,4,8)'
+        )
+        parser.add_argument('--chapters', type=int, default=5, help='Chapters per job')
+        parser.add_argument(
+            '--novel-url', default=FIXTURE_NOVEL_URL,
+            help='Novel page to translate; must be routed by the fixtures in FLARESOLVERR_STUB_FIXTURES'
+        )
+        parser.add_argument(
+            '--scrape-latency', type=int, default=settings.FLARESOLVERR_STUB_LATENCY_MS,
+            help='Milliseconds per page fetch (default: FLARESOLVERR_STUB_LATENCY_MS)'
+        )
+        parser.add_argument(
+            '--gemini-latency', type=int, default=settings.GEMINI_STUB_LATENCY_MS,
+            help='Milliseconds per Gemini call (default: GEMINI_STUB_LATENCY_MS)'
+        )
+        parser.add_argument(
+            '--gemini-latency-per-1k', type=int, default=settings.GEMINI_STUB_LATENCY_PER_1K_CHARS_MS,
+            help='Extra milliseconds per 1000 generated characters (default: GEMINI_STUB_LATENCY_PER_1K_CHARS_MS)'
+        )
+        parser.add_argument(
+            '--error-rate', type=float, default=settings.GEMINI_STUB_ERROR_RATE,
+            help='Fraction of Gemini calls that fail (default: GEMINI_STUB_ERROR_RATE)'
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep the benchmark jobs instead of deleting them')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['concurrency'].split(',')]
+        except ValueError:
+            raise CommandError('--concurrency must be a comma-separated list of integers')
+        if not levels or min(levels) < 1 or options['chapters'] < 1:
+            raise CommandError('Concurrency levels and --chapters must be at least 1')
+
+        stubs = override_settings(
+            FLARESOLVERR_BACKEND='stub',
+            FLARESOLVERR_STUB_LATENCY_MS=options['scrape_latency'],
+            GEMINI_BACKEND='stub',
+            GEMINI_STUB_LATENCY_MS=options['gemini_latency'],
+            GEMINI_STUB_LATENCY_PER_1K_CHARS_MS=options['gemini_latency_per_1k'],
+            GEMINI_STUB_ERROR_RATE=options['error_rate'],
+        )
+        self.stdout.write(
+            f'{options["chapters"]} chapter(s) per job; page fetch {options["scrape_latency"]}ms, '
+            f'Gemini {options["gemini_latency"]}ms + {options["gemini_latency_per_1k"]}ms/1k chars, '
+            f'error rate {options["error_rate"]:.0%}\n'
+        )
+        self.stdout.write(
+            f'{"jobs":>5} {"chapters":>9} {"failed":>7} {"seconds":>9} {"chapters/h":>11} {"speedup":>8} '
+            f'{"scrape ms":>10} {"translate ms":>13} {"polish ms":>10} {"retries":>8} {"tokens/ch":>10}'
+        )
+
+        baseline = None
+        with stubs:
+            for level in levels:
+                completed, failed, elapsed, stages = self._run_level(level, options)
+                rate = completed / elapsed * 3600 if elapsed else 0.0
+                if baseline is None:
+                    baseline = rate
+                speedup = rate / baseline if baseline else 0.0
+                self.stdout.write(
+                    f'{level:>5} {completed:>9} {failed:>7} {elapsed:>9.2f} {rate:>11.0f} {speedup:>7.2f}x '
+                    f'{stages["scrape_ms"] or 0:>10.0f} {stages["translate_ms"] or 0:>13.0f} '
+                    f'{stages["polish_ms"] or 0:>10.0f} {stages["retries"] or 0:>8} {stages["tokens"] or 0:>10.0f}'
+                )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    def _run_level(self, level, options):
+        jobs = [
+            TranslationJob.objects.create(novel_url=options['novel_url'], chapters_requested=options['chapters'])
+            for _ in range(level)
+        ]
+        threads = [Thread(target=self._run_job, args=(job.job_id,), daemon=True) for job in jobs]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        job_ids = [job.job_id for job in jobs]
+        finished = TranslationJob.objects.filter(job_id__in=job_ids)
+        completed = sum(job.chapters_completed for job in finished)
+        failed = sum(job.chapters_failed for job in finished)
+        # Mean stage timings and tokens of the polished chapters; retries over all of them.
+        stages = TranslatedChapterCache.objects.filter(job_id__in=job_ids, status='polished').aggregate(
+            scrape_ms=Avg('scrape_ms'),
+            translate_ms=Avg('translate_ms'),
+            polish_ms=Avg('polish_ms'),
+            tokens=Avg('input_tokens') + Avg('output_tokens'),
+        )
+        stages['retries'] = TranslatedChapterCache.objects.filter(job_id__in=job_ids).aggregate(
+            retries=Sum('retries')
+        )['retries']
+        for job in finished:
+            if job.status == 'failed':
+                self.stdout.write(self.style.WARNING(f'Job {job.job_id} failed: {job.error_message}'))
+        if not options['keep']:
+            finished.delete()
+        return completed, failed, elapsed, stages
+
+    @staticmethod
+    def _run_job(job_id):
+        try:
+            start_translation_job(job_id)
+        finally:
+            cleanup_browser()
+            connection.close()
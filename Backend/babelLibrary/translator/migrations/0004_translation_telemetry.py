@@ -0,0 +1,48 @@
+# Generated by Django 4.2.25 on 2026-10-19 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0003_translationjob_prompt_dictionary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translatedchaptercache',
+            name='input_tokens',
+            field=models.PositiveIntegerField(default=0, help_text='Gemini prompt tokens'),
+        ),
+        migrations.AddField(
+            model_name='translatedchaptercache',
+            name='output_tokens',
+            field=models.PositiveIntegerField(default=0, help_text='Gemini response tokens'),
+        ),
+        migrations.AddField(
+            model_name='translatedchaptercache',
+            name='polish_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Time spent polishing the translation', null=True),
+        ),
+        migrations.AddField(
+            model_name='translatedchaptercache',
+            name='retries',
+            field=models.PositiveIntegerField(default=0, help_text='Gemini calls retried after transient errors'),
+        ),
+        migrations.AddField(
+            model_name='translatedchaptercache',
+            name='scrape_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Time spent fetching the chapter page', null=True),
+        ),
+        migrations.AddField(
+            model_name='translatedchaptercache',
+            name='translate_ms',
+            field=models.PositiveIntegerField(blank=True, help_text='Time spent translating title and content', null=True),
+        ),
+        migrations.AddField(
+            model_name='translationjob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, help_text='When the first chapter started processing', null=True),
+        ),
+    ]
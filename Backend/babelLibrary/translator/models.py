@@ -1,6 +1,10 @@
 import uuid
+from datetime import timedelta
+from django.conf import settings
 from django.db import models
+from django.db.models import Count, Sum
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 
 
 class TranslationJob(models.Model):
@@ -49,6 +53,7 @@ class TranslationJob(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(blank=True, null=True, help_text="When the first chapter started processing")
     completed_at = models.DateTimeField(blank=True, null=True, help_text="When the job completed or failed")
     
     # Link to created series (after import)
@@ -75,6 +80,56 @@ class TranslationJob(models.Model):
         if self.chapters_requested == 0:
             return 0
         return (self.chapters_completed / self.chapters_requested) * 100
+    
+    @property
+    def throughput(self):
+        """Chapters processed (completed or failed) per hour since the first chapter started."""
+        processed = self.chapters_completed + self.chapters_failed
+        if not self.started_at or not processed:
+            return None
+        elapsed = ((self.completed_at or timezone.now()) - self.started_at).total_seconds()
+        return processed / elapsed * 3600 if elapsed > 0 else None
+    
+    @property
+    def eta(self):
+        """Estimated time left at the current throughput, or None if unknown or finished."""
+        remaining = self.chapters_requested - self.chapters_completed - self.chapters_failed
+        throughput = self.throughput
+        if self.completed_at or remaining <= 0 or not throughput:
+            return None
+        return timedelta(hours=remaining / throughput)
+    
+    @property
+    def eta_seconds(self):
+        """The ETA in whole seconds, as exposed by the API and progress stream."""
+        eta = self.eta
+        return round(eta.total_seconds()) if eta is not None else None
+    
+    def telemetry(self):
+        """Aggregate the per-chapter stage timings, retries and token usage of this job."""
+        totals = self.cached_chapters.aggregate(
+            chapters=Count('cache_id'),
+            scrape_ms=Sum('scrape_ms'),
+            translate_ms=Sum('translate_ms'),
+            polish_ms=Sum('polish_ms'),
+            retries=Sum('retries'),
+            input_tokens=Sum('input_tokens'),
+            output_tokens=Sum('output_tokens'),
+        )
+        totals = {key: value or 0 for key, value in totals.items()}
+        totals['estimated_cost'] = (
+            totals['input_tokens'] * settings.GEMINI_INPUT_COST_PER_MILLION
+            + totals['output_tokens'] * settings.GEMINI_OUTPUT_COST_PER_MILLION
+        ) / 1_000_000
+        return totals
+
+
+class TranslatedChapterCacheQuerySet(models.QuerySet):
+    """QuerySet helpers for reading cached chapters."""
+
+    def metadata_only(self):
+        """Defer the Korean and English chapter text for metadata-only reads."""
+        return self.defer('korean_content', 'english_content_raw', 'english_content_final')
 
 
 class TranslatedChapterCache(models.Model):
@@ -108,6 +163,14 @@ class TranslatedChapterCache(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     error_message = models.TextField(blank=True, null=True)
     
+    # Stage telemetry
+    scrape_ms = models.PositiveIntegerField(blank=True, null=True, help_text="Time spent fetching the chapter page")
+    translate_ms = models.PositiveIntegerField(blank=True, null=True, help_text="Time spent translating title and content")
+    polish_ms = models.PositiveIntegerField(blank=True, null=True, help_text="Time spent polishing the translation")
+    retries = models.PositiveIntegerField(default=0, help_text="Gemini calls retried after transient errors")
+    input_tokens = models.PositiveIntegerField(default=0, help_text="Gemini prompt tokens")
+    output_tokens = models.PositiveIntegerField(default=0, help_text="Gemini response tokens")
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -122,6 +185,8 @@ class TranslatedChapterCache(models.Model):
         help_text="Chapter created from this cache"
     )
 
+    objects = TranslatedChapterCacheQuerySet.as_manager()
+
     class Meta:
         db_table = 'translatedchaptercache'
         unique_together = ('job', 'chapter_number')
@@ -0,0 +1,278 @@
+"""
+Live translation job progress for Server-Sent Events.
+
+The job runner saves TranslationJob and TranslatedChapterCache rows as it
+goes; post_save handlers in signals.py hand those rows to the broker, which
+turns them into small events:
+
+- "job": the job fields that changed (status, current_operation, counts...),
+- "chapter": the metadata of a chapter whose status, title or counters
+  changed (never its text).
+
+stream_job_progress() opens with a "snapshot" event (the job plus the
+metadata of every chapter), then relays events as they are published and
+ends with an "end" event once the job has completed or failed. Every event
+has an id, so a client that reconnects with Last-Event-ID is sent only what
+it missed, as long as the broker still has it. Ids are "<epoch>-<sequence>",
+where the epoch is random per broker: an id issued by another process (or
+before a restart) never matches, and the client gets a fresh snapshot
+instead of a resume from the wrong point.
+
+The broker lives in the process that runs the job. A stream served by a
+different worker process would never see those events, so a stream that has
+been quiet for JOB_PROGRESS_POLL_INTERVAL seconds reloads the job and its
+chapter metadata from the database and publishes whatever changed. Rows
+carry updated_at, so a reload never overwrites newer state.
+"""
+from collections import OrderedDict, deque
+import json
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+from .models import TranslatedChapterCache, TranslationJob
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+JOB_FIELDS = (
+    'job_id', 'novel_url', 'status', 'current_operation', 'error_message',
+    'chapters_requested', 'chapters_completed', 'chapters_failed',
+    'korean_title', 'korean_author', 'korean_genre', 'korean_description', 'cover_image_url',
+    'english_title', 'english_author', 'english_genre', 'english_description',
+    'created_at', 'started_at', 'completed_at', 'updated_at', 'imported_series_id',
+)
+CHAPTER_FIELDS = (
+    'cache_id', 'chapter_number', 'chapter_url', 'korean_title', 'english_title', 'status',
+    'word_count', 'error_message', 'scrape_ms', 'translate_ms', 'polish_ms', 'retries',
+    'input_tokens', 'output_tokens', 'updated_at',
+)
+# Sent along with a change, but never a change by themselves.
+VOLATILE_FIELDS = ('updated_at', 'throughput', 'eta_seconds')
+
+# Events kept per job for Last-Event-ID resumption, and jobs kept in memory.
+HISTORY_SIZE = 500
+MAX_CHANNELS = 256
+
+
+def _json_default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def job_state(job):
+    state = {field: getattr(job, field) for field in JOB_FIELDS}
+    state['imported_series'] = state.pop('imported_series_id')
+    state['progress_percentage'] = job.progress_percentage
+    state['throughput'] = job.throughput
+    state['eta_seconds'] = job.eta_seconds
+    return state
+
+
+def chapter_state(cache):
+    return {field: getattr(cache, field) for field in CHAPTER_FIELDS}
+
+
+def _changes(previous, current):
+    """The fields of current that differ from previous, or {} if only volatile ones did."""
+    changed = {key: value for key, value in current.items() if previous.get(key) != value}
+    if not set(changed) - set(VOLATILE_FIELDS):
+        return {}
+    for key in VOLATILE_FIELDS:
+        if key in current:
+            changed[key] = current[key]
+    return changed
+
+
+class Event:
+    def __init__(self, epoch, seq, kind, data):
+        self.epoch = epoch
+        self.seq = seq
+        self.kind = kind
+        self.data = data
+
+    @property
+    def id(self):
+        return f'{self.epoch}-{self.seq}'
+
+    def encode(self):
+        payload = json.dumps(self.data, default=_json_default, ensure_ascii=False)
+        return f'id: {self.id}\nevent: {self.kind}\ndata: {payload}\n\n'
+
+
+class Channel:
+    """Latest known state and recent events of one job."""
+
+    def __init__(self, base_id):
+        self.job = None
+        self.chapters = {}
+        self.events = deque()
+        # Events up to base_id were never seen here (or have been evicted).
+        self.base_id = base_id
+        self.touched = 0.0
+
+    @property
+    def status(self):
+        return self.job['status'] if self.job else None
+
+
+class JobProgressBroker:
+    """Thread-safe, per-process fan-out of job progress events."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._channels = OrderedDict()
+        self._last_id = 0
+        self.epoch = uuid.uuid4().hex[:12]
+
+    def event(self, seq, kind, data):
+        return Event(self.epoch, seq, kind, data)
+
+    def parse_event_id(self, event_id):
+        """The sequence number of an id issued by this broker, else None."""
+        epoch, _, seq = (event_id or '').partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def _channel(self, job_id):
+        # Called with the condition held.
+        key = str(job_id)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = Channel(self._last_id)
+            while len(self._channels) > MAX_CHANNELS:
+                self._channels.popitem(last=False)
+        else:
+            self._channels.move_to_end(key)
+        return channel
+
+    def _append(self, channel, kind, data):
+        self._last_id += 1
+        channel.events.append(self.event(self._last_id, kind, data))
+        if len(channel.events) > HISTORY_SIZE:
+            channel.base_id = channel.events.popleft().seq
+        channel.touched = time.monotonic()
+        self._condition.notify_all()
+
+    def publish_job(self, job):
+        state = job_state(job)
+        with self._condition:
+            channel = self._channel(job.job_id)
+            if channel.job is None:
+                channel.job = state
+                self._append(channel, 'job', state)
+                return
+            if state['updated_at'] and channel.job['updated_at'] and state['updated_at'] < channel.job['updated_at']:
+                return
+            changed = _changes(channel.job, state)
+            channel.job = state
+            if changed:
+                self._append(channel, 'job', changed)
+
+    def publish_chapter(self, cache):
+        state = chapter_state(cache)
+        with self._condition:
+            channel = self._channel(cache.job_id)
+            previous = channel.chapters.get(cache.chapter_number)
+            if previous is not None:
+                if state['updated_at'] and previous['updated_at'] and state['updated_at'] < previous['updated_at']:
+                    return
+                if not _changes(previous, state):
+                    channel.chapters[cache.chapter_number] = state
+                    return
+            channel.chapters[cache.chapter_number] = state
+            self._append(channel, 'chapter', state)
+
+    def discard(self, job_id):
+        with self._condition:
+            self._channels.pop(str(job_id), None)
+
+    def refresh(self, job_id):
+        """Publish what changed in the database; returns False if the job no longer exists."""
+        job = TranslationJob.objects.filter(job_id=job_id).first()
+        if job is None:
+            return False
+        for cache in TranslatedChapterCache.objects.metadata_only().filter(job_id=job_id):
+            self.publish_chapter(cache)
+        self.publish_job(job)
+        with self._condition:
+            self._channel(job_id).touched = time.monotonic()
+        return True
+
+    def snapshot(self, job_id):
+        """Return (last event id, {'job': ..., 'chapters': [...]}) for the job."""
+        with self._condition:
+            channel = self._channel(job_id)
+            last_id = channel.events[-1].seq if channel.events else channel.base_id
+            chapters = [channel.chapters[number] for number in sorted(channel.chapters)]
+            return last_id, {'job': channel.job, 'chapters': chapters}
+
+    def can_resume(self, job_id, last_id):
+        """Whether every event of the job after last_id is still here."""
+        with self._condition:
+            channel = self._channels.get(str(job_id))
+            return channel is not None and channel.job is not None and channel.base_id <= last_id <= self._last_id
+
+    def wait(self, job_id, last_id, timeout):
+        """
+        Block up to timeout seconds for events after last_id or a finished job.
+
+        Returns (events, job status after those events, seconds since the
+        channel last changed or was refreshed).
+        """
+        with self._condition:
+            channel = self._channel(job_id)
+
+            def ready():
+                return (channel.events and channel.events[-1].seq > last_id) or channel.status in TERMINAL_STATUSES
+
+            self._condition.wait_for(ready, timeout)
+            events = [event for event in channel.events if event.seq > last_id]
+            return events, channel.status, time.monotonic() - channel.touched
+
+
+broker = JobProgressBroker()
+
+
+def _comment(text):
+    return f': {text}\n\n'
+
+
+def stream_job_progress(job_id, last_event_id=None):
+    """Yield Server-Sent Events for a job; see the module docstring."""
+    started = time.monotonic()
+    yield f'retry: {settings.JOB_PROGRESS_RETRY_MS}\n\n'
+
+    last_id = broker.parse_event_id(last_event_id)
+    if last_id is None or not broker.can_resume(job_id, last_id):
+        if not broker.refresh(job_id):
+            yield broker.event(0, 'end', {'status': 'deleted'}).encode()
+            return
+        last_id, snapshot = broker.snapshot(job_id)
+        yield broker.event(last_id, 'snapshot', snapshot).encode()
+    last_sent = time.monotonic()
+
+    while True:
+        events, status, idle = broker.wait(job_id, last_id, settings.JOB_PROGRESS_POLL_INTERVAL)
+        for event in events:
+            yield event.encode()
+            last_id = event.seq
+        now = time.monotonic()
+        if events:
+            last_sent = now
+
+        if status in TERMINAL_STATUSES:
+            yield broker.event(last_id, 'end', {'status': status}).encode()
+            return
+        if now - started >= settings.JOB_PROGRESS_STREAM_TIMEOUT:
+            # Let the client reconnect with Last-Event-ID rather than hold a worker indefinitely.
+            return
+        if idle >= settings.JOB_PROGRESS_POLL_INTERVAL and not broker.refresh(job_id):
+            yield broker.event(last_id, 'end', {'status': 'deleted'}).encode()
+            return
+        if now - last_sent >= settings.JOB_PROGRESS_HEARTBEAT:
+            yield _comment('keep-alive')
+            last_sent = now
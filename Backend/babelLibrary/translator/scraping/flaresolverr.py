@@ -13,6 +13,7 @@ import atexit
 import json
 
 from .config import FLARESOLVERR_URL, FLARESOLVERR_TIMEOUT_MS, NETWORK_OVERHEAD_TIMEOUT_SECONDS
+from .stub import get_stub, stub_enabled
 from .validation import validate_url
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,13 @@ _cleanup_lock = threading.Lock()
 _cleaning_sessions = set()
 
 
+def _post(payload, timeout):
+    """Sends a command to FlareSolverr, or to the offline stub when enabled."""
+    if stub_enabled():
+        return get_stub().post(FLARESOLVERR_URL, json=payload, timeout=timeout)
+    return requests.post(FLARESOLVERR_URL, json=payload, timeout=timeout)
+
+
 def _create_flaresolverr_session():
     """Creates a new FlareSolverr session.
     
@@ -39,11 +47,7 @@ def _create_flaresolverr_session():
         ValueError: If FlareSolverr returns invalid JSON or missing session ID
     """
     try:
-        response = requests.post(
-            FLARESOLVERR_URL,
-            json={"cmd": "sessions.create"},
-            timeout=10
-        )
+        response = _post({"cmd": "sessions.create"}, timeout=10)
         response.raise_for_status()
         
         # Parse JSON response with error handling
@@ -135,8 +139,9 @@ def fetch_page_content(url: str, retry_on_stale_session: bool = True) -> str:
         ConnectionError: If FlareSolverr is not available
         Exception: If page fails to load or FlareSolverr returns an error
     """
-    # Validate URL before processing
-    validate_url(url)
+    # Validate URL before processing (the offline stub never makes a request)
+    if not stub_enabled():
+        validate_url(url)
     
     session_id = _get_flaresolverr_session()
     
@@ -154,11 +159,7 @@ def fetch_page_content(url: str, retry_on_stale_session: bool = True) -> str:
         if session_id:
             payload["session"] = session_id
         
-        response = requests.post(
-            FLARESOLVERR_URL,
-            json=payload,
-            timeout=payload["maxTimeout"]/1000 + NETWORK_OVERHEAD_TIMEOUT_SECONDS
-        )
+        response = _post(payload, timeout=payload["maxTimeout"]/1000 + NETWORK_OVERHEAD_TIMEOUT_SECONDS)
         response.raise_for_status()
         
         # Parse JSON response with error handling
@@ -265,11 +266,7 @@ def cleanup_browser():
     try:
         # Perform cleanup outside lock to avoid holding it during network call
         try:
-            response = requests.post(
-                FLARESOLVERR_URL,
-                json={"cmd": "sessions.destroy", "session": session_id},
-                timeout=10
-            )
+            response = _post({"cmd": "sessions.destroy", "session": session_id}, timeout=10)
             response.raise_for_status()
             logger.info(f"Destroyed FlareSolverr session: {session_id}")
         except requests.exceptions.RequestException as e:
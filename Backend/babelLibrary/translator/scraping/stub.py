@@ -0,0 +1,123 @@
+"""
+In-process stand-in for FlareSolverr, for benchmarking the pipeline offline.
+
+Enabled with FLARESOLVERR_BACKEND = 'stub'. StubFlareSolverr answers the same
+JSON commands fetch_page_content() sends to FlareSolverr (sessions.create,
+request.get, sessions.destroy) with the same response shapes, so the session
+handling and parsers run unchanged. Pages come from saved HTML fixtures:
+FLARESOLVERR_STUB_FIXTURES is a directory containing routes.json, a list of
+{"pattern": <regex searched in the URL>, "fixture": <file name>} entries
+tried in order. Every request.get waits FLARESOLVERR_STUB_LATENCY_MS first to
+stand in for the browser solving the page.
+
+Nothing leaves the process, so URL validation (and its DNS lookups) is
+skipped while the stub is enabled.
+"""
+from django.conf import settings
+import json
+import logging
+import os
+import re
+import requests
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class StubResponse:
+    """The parts of requests.Response that flaresolverr.py uses."""
+
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self.text = json.dumps(data)
+        self._data = data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Server Error: {self._data.get('message')}", response=self)
+
+    def json(self):
+        return self._data
+
+
+class StubFlareSolverr:
+    """Serve fixture pages through the FlareSolverr command protocol."""
+
+    def __init__(self, fixtures_dir):
+        self.fixtures_dir = fixtures_dir
+        with open(os.path.join(fixtures_dir, 'routes.json'), encoding='utf-8') as f:
+            self.routes = [
+                (re.compile(route['pattern']), route['fixture'])
+                for route in json.load(f)['routes']
+            ]
+        self._pages = {}
+        self._sessions = set()
+        self._lock = threading.Lock()
+
+    def _page(self, url):
+        for pattern, fixture in self.routes:
+            if pattern.search(url):
+                break
+        else:
+            return None
+        page = self._pages.get(fixture)
+        if page is None:
+            with open(os.path.join(self.fixtures_dir, fixture), encoding='utf-8') as f:
+                page = self._pages[fixture] = f.read()
+        return page
+
+    def post(self, url, json=None, timeout=None):
+        command = (json or {}).get('cmd')
+
+        if command == 'sessions.create':
+            session_id = str(uuid.uuid4())
+            with self._lock:
+                self._sessions.add(session_id)
+            return StubResponse({'status': 'ok', 'message': 'Session created successfully.', 'session': session_id})
+
+        if command == 'sessions.destroy':
+            with self._lock:
+                self._sessions.discard(json.get('session'))
+            return StubResponse({'status': 'ok', 'message': 'The session has been removed.'})
+
+        if command == 'request.get':
+            session_id = json.get('session')
+            if session_id and session_id not in self._sessions:
+                return StubResponse({'status': 'error', 'message': 'Error: This session does not exist.'}, 500)
+
+            latency = settings.FLARESOLVERR_STUB_LATENCY_MS
+            if latency:
+                time.sleep(latency / 1000)
+
+            page = self._page(json['url'])
+            if page is None:
+                return StubResponse({'status': 'error', 'message': f"Error: No fixture for {json['url']}"}, 500)
+            return StubResponse({
+                'status': 'ok',
+                'message': 'Challenge not detected!',
+                'solution': {'url': json['url'], 'status': 200, 'response': page},
+            })
+
+        return StubResponse({'status': 'error', 'message': f'Error: Request parameter \'cmd\' = \'{command}\' is invalid.'}, 500)
+
+
+_stub = None
+_stub_lock = threading.Lock()
+
+
+def get_stub():
+    """Return the process-wide stub for the configured fixture directory."""
+    global _stub
+    fixtures_dir = settings.FLARESOLVERR_STUB_FIXTURES
+    with _stub_lock:
+        if _stub is None or _stub.fixtures_dir != fixtures_dir:
+            logger.info(f"Serving FlareSolverr requests from fixtures in {fixtures_dir}")
+            _stub = StubFlareSolverr(fixtures_dir)
+        return _stub
+
+
+def stub_enabled():
+    """Whether FlareSolverr requests go to the stub."""
+    return getattr(settings, 'FLARESOLVERR_BACKEND', 'flaresolverr') == 'stub'
@@ -5,8 +5,8 @@ from rest_framework import serializers
 from .models import TranslationJob, TranslatedChapterCache
 
 
-class TranslatedChapterCacheSerializer(serializers.ModelSerializer):
-    """Serializer for translated chapter cache."""
+class TranslatedChapterCacheListSerializer(serializers.ModelSerializer):
+    """Serializer for listing cached chapters without their text."""
     
     class Meta:
         model = TranslatedChapterCache
@@ -15,28 +15,51 @@ class TranslatedChapterCacheSerializer(serializers.ModelSerializer):
             'chapter_number',
             'chapter_url',
             'korean_title',
-            'korean_content',
             'english_title',
-            'english_content_raw',
-            'english_content_final',
             'word_count',
             'status',
             'error_message',
+            'scrape_ms',
+            'translate_ms',
+            'polish_ms',
+            'retries',
+            'input_tokens',
+            'output_tokens',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = [
-            'cache_id',
-            'created_at',
-            'updated_at',
-            'word_count',
+        read_only_fields = fields
+
+
+class TranslatedChapterCacheSerializer(TranslatedChapterCacheListSerializer):
+    """
+    Serializer for a cached chapter with its text.
+    
+    Pass content_fields to include only some of CONTENT_FIELDS, e.g. when the
+    other text columns were deferred.
+    """
+    CONTENT_FIELDS = ['korean_content', 'english_content_raw', 'english_content_final']
+    
+    class Meta(TranslatedChapterCacheListSerializer.Meta):
+        fields = TranslatedChapterCacheListSerializer.Meta.fields + [
+            'korean_content',
+            'english_content_raw',
+            'english_content_final',
         ]
+    
+    def __init__(self, *args, content_fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if content_fields is not None:
+            for name in set(self.CONTENT_FIELDS) - set(content_fields):
+                self.fields.pop(name)
 
 
 class TranslationJobSerializer(serializers.ModelSerializer):
-    """Serializer for translation job list/detail."""
+    """Serializer for translation job detail, with chapter metadata but no chapter text."""
     progress_percentage = serializers.ReadOnlyField()
-    cached_chapters = TranslatedChapterCacheSerializer(many=True, read_only=True)
+    throughput = serializers.ReadOnlyField()
+    eta_seconds = serializers.ReadOnlyField()
+    cached_chapters = TranslatedChapterCacheListSerializer(many=True, read_only=True)
     
     class Meta:
         model = TranslationJob
@@ -58,10 +81,13 @@ class TranslationJobSerializer(serializers.ModelSerializer):
             'chapters_completed',
             'chapters_failed',
             'progress_percentage',
+            'throughput',
+            'eta_seconds',
             'current_operation',
             'error_message',
             'created_at',
             'updated_at',
+            'started_at',
             'completed_at',
             'imported_series',
             'cached_chapters',
@@ -84,6 +110,7 @@ class TranslationJobSerializer(serializers.ModelSerializer):
             'error_message',
             'created_at',
             'updated_at',
+            'started_at',
             'completed_at',
             'imported_series',
         ]
@@ -92,6 +119,8 @@ class TranslationJobSerializer(serializers.ModelSerializer):
 class TranslationJobListSerializer(serializers.ModelSerializer):
     """Simplified serializer for job list (without chapters)."""
     progress_percentage = serializers.ReadOnlyField()
+    throughput = serializers.ReadOnlyField()
+    eta_seconds = serializers.ReadOnlyField()
     
     class Meta:
         model = TranslationJob
@@ -106,10 +135,13 @@ class TranslationJobListSerializer(serializers.ModelSerializer):
             'chapters_completed',
             'chapters_failed',
             'progress_percentage',
+            'throughput',
+            'eta_seconds',
             'current_operation',
             'error_message',
             'created_at',
             'updated_at',
+            'started_at',
             'completed_at',
             'imported_series',
         ]
@@ -192,7 +224,7 @@ class TranslationJobPreviewSerializer(serializers.ModelSerializer):
     
     def get_chapters(self, obj):
         """Get simplified chapter preview data."""
-        chapters = obj.cached_chapters.filter(status='polished').order_by('chapter_number')
+        chapters = obj.cached_chapters.metadata_only().filter(status='polished').order_by('chapter_number')
         return [{
             'cache_id': ch.cache_id,
             'chapter_number': ch.chapter_number,
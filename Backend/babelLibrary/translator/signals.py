@@ -0,0 +1,57 @@
+"""
+Signal handlers for the translator app.
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from library.search import touches, update_series_search_vector
+from .models import TranslatedChapterCache, TranslationJob
+from .progress import broker
+
+
+# TranslationJob fields that feed the imported series' search vector.
+SEARCH_FIELDS = frozenset({'korean_title', 'imported_series'})
+
+
+def _indexed_state(instance):
+    # Read from __dict__ so deferred fields are never loaded just for this.
+    return instance.__dict__.get('korean_title'), instance.__dict__.get('imported_series_id')
+
+
+@receiver(post_init, sender=TranslationJob)
+def remember_indexed_state(sender, instance, **kwargs):
+    instance._indexed_state = _indexed_state(instance)
+
+
+@receiver(post_save, sender=TranslationJob)
+def index_korean_title(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Make the Korean source title searchable once a job is imported.
+
+    The pipeline saves jobs after every chapter; those saves change neither
+    the title nor the series and skip the refresh.
+    """
+    if not instance.imported_series_id or not touches(update_fields, SEARCH_FIELDS):
+        return
+    state = _indexed_state(instance)
+    if not created and state == instance._indexed_state:
+        return
+    update_series_search_vector(instance.imported_series_id)
+    instance._indexed_state = state
+
+
+@receiver(post_save, sender=TranslationJob)
+def publish_job_progress(sender, instance, **kwargs):
+    """Push job status and counter changes to progress streams."""
+    broker.publish_job(instance)
+
+
+@receiver(post_save, sender=TranslatedChapterCache)
+def publish_chapter_progress(sender, instance, **kwargs):
+    """Push chapter status changes to progress streams."""
+    broker.publish_chapter(instance)
+
+
+@receiver(post_delete, sender=TranslationJob)
+def discard_job_progress(sender, instance, **kwargs):
+    broker.discard(instance.job_id)
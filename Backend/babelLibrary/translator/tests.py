@@ -1 +1,331 @@
-# Create your tests here.
+from datetime import timedelta
+import json
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from google.api_core.exceptions import ResourceExhausted
+from rest_framework.test import APIClient
+
+from library.models import Series
+from library.tests import QueryBudgetMixin
+from users.models import Role, User
+from .management.commands.benchmark_translation import FIXTURE_NOVEL_URL
+from .models import TranslatedChapterCache, TranslationJob
+from .scraper import cleanup_browser, get_chapter_pages, scrape_chapter_page, scrape_novel_page
+from .translator_service import TRANSLATOR_SYSTEM_PROMPT, GeminiUsage, call_gemini, start_translation_job
+
+
+class TranslationJobQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every translator endpoint stays within its query budget on seeded jobs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Admin')
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role=role, is_staff=True)
+        jobs = TranslationJob.objects.bulk_create([
+            TranslationJob(
+                novel_url=f'https://example.com/novel/{i}', status='completed', korean_title=f'소설 {i}',
+                english_title=f'Novel {i}', chapters_requested=20, chapters_completed=20
+            )
+            for i in range(50)
+        ])
+        TranslatedChapterCache.objects.bulk_create([
+            TranslatedChapterCache(
+                job=job, chapter_number=n, chapter_url=f'{job.novel_url}/{n}', korean_title=f'{n}화',
+                korean_content='본문 ' * 500, english_title=f'Chapter {n}',
+                english_content_raw='Text ' * 500, english_content_final='Text ' * 500, status='polished'
+            )
+            for job in jobs for n in range(1, 21)
+        ], batch_size=500)
+        cls.job = jobs[0]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_reads(self):
+        job = self.job.job_id
+        budgets = [
+            ('/api/translator/jobs/', 2),
+            (f'/api/translator/jobs/{job}/', 2),
+            (f'/api/translator/jobs/{job}/preview/', 2),
+            (f'/api/translator/jobs/{job}/chapters/', 2),
+            (f'/api/translator/jobs/{job}/chapters/3/', 2),
+            (f'/api/translator/jobs/{job}/chapters/3/?fields=english_content_final', 2),
+        ]
+        for path, budget in budgets:
+            with self.subTest(path=path):
+                self.assertWithinBudget('get', path, budget)
+
+    def test_detail_and_chapters_omit_text(self):
+        content_fields = {'korean_content', 'english_content_raw', 'english_content_final'}
+        detail = self.client.get(f'/api/translator/jobs/{self.job.job_id}/')
+        chapters = self.client.get(f'/api/translator/jobs/{self.job.job_id}/chapters/')
+        self.assertEqual(len(detail.data['cached_chapters']), 20)
+        self.assertEqual([c['chapter_number'] for c in chapters.data], list(range(1, 21)))
+        for chapter in detail.data['cached_chapters'] + chapters.data:
+            self.assertFalse(content_fields & set(chapter))
+
+    def test_chapter_content(self):
+        base = f'/api/translator/jobs/{self.job.job_id}/chapters/3/'
+        full = self.client.get(base)
+        self.assertEqual(full.data['chapter_number'], 3)
+        self.assertEqual(full.data['korean_content'], '본문 ' * 500)
+        self.assertEqual(full.data['english_content_final'], 'Text ' * 500)
+
+        selected = self.client.get(base, {'fields': 'english_content_final'})
+        self.assertIn('english_content_final', selected.data)
+        self.assertNotIn('korean_content', selected.data)
+        self.assertNotIn('english_content_raw', selected.data)
+
+        self.assertEqual(self.client.get(base, {'fields': 'content'}).status_code, 400)
+        self.assertEqual(self.client.get(f'/api/translator/jobs/{self.job.job_id}/chapters/99/').status_code, 404)
+
+    def test_chapter_content_range(self):
+        base = f'/api/translator/jobs/{self.job.job_id}/chapters/3/?fields=korean_content'
+        text = ('본문 ' * 500).encode('utf-8')
+
+        response = self.client.get(base, HTTP_RANGE='bytes=0-6')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertEqual(response['Content-Range'], f'bytes 0-6/{len(text)}')
+        self.assertEqual(response.content.decode('utf-8'), '본문 ')
+
+        response = self.client.get(base, HTTP_RANGE='bytes=-7')
+        self.assertEqual(response['Content-Range'], f'bytes {len(text) - 7}-{len(text) - 1}/{len(text)}')
+        self.assertEqual(response.content, text[-7:])
+
+        response = self.client.get(base, HTTP_RANGE=f'bytes={len(text)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(text)}')
+
+        # Malformed ranges, and ranges over several fields, are ignored.
+        self.assertEqual(self.client.get(base, HTTP_RANGE='bytes=0-1,4-5').status_code, 200)
+        both = f'/api/translator/jobs/{self.job.job_id}/chapters/3/?fields=korean_content,english_content_final'
+        self.assertEqual(self.client.get(both, HTTP_RANGE='bytes=0-6').status_code, 200)
+
+
+class KoreanTitleIndexTests(TestCase):
+    """Imported jobs refresh the series search vector only when the title or series change."""
+
+    def test_progress_saves_skip_refresh(self):
+        series = Series.objects.create(title='Imported')
+        job = TranslationJob.objects.create(novel_url=FIXTURE_NOVEL_URL, chapters_requested=2, korean_title='소설')
+        with mock.patch('translator.signals.update_series_search_vector') as refresh:
+            job.imported_series = series
+            job.save()
+            refresh.assert_called_once_with(series.series_id)
+
+            job.chapters_completed = 1
+            job.save()
+            TranslationJob.objects.get(pk=job.pk).save(update_fields=['current_operation'])
+            self.assertEqual(refresh.call_count, 1)
+
+            job.korean_title = '새 소설'
+            job.save()
+            self.assertEqual(refresh.call_count, 2)
+
+
+PIPELINE_STUBS = override_settings(
+    FLARESOLVERR_BACKEND='stub', FLARESOLVERR_STUB_LATENCY_MS=0, GEMINI_BACKEND='stub', GEMINI_STUB_LATENCY_MS=0,
+    GEMINI_STUB_LATENCY_PER_1K_CHARS_MS=0, GEMINI_STUB_ERROR_RATE=0, GEMINI_RETRY_BACKOFF=0,
+)
+
+
+@PIPELINE_STUBS
+class PipelineStubTests(TestCase):
+    """The stubs stand in for FlareSolverr and Gemini without network access."""
+
+    def setUp(self):
+        self.addCleanup(cleanup_browser)
+
+    def test_scrapers_parse_fixtures(self):
+        novel = scrape_novel_page(FIXTURE_NOVEL_URL)
+        self.assertEqual(novel['Title'], '은빛 탑의 마법사')
+        self.assertEqual(novel['Author'], '한서윤')
+
+        chapters = get_chapter_pages(FIXTURE_NOVEL_URL, limit=3, start_from=2)
+        self.assertEqual([c['number'] for c in chapters], ['2', '3', '4'])
+        self.assertEqual(chapters[0]['url'], 'https://novel.invalid/novel/1001/chapter/2')
+
+        chapter = scrape_chapter_page(chapters[0]['url'])
+        self.assertEqual(chapter['Chapter Title'], '은빛 탑의 마법사 1화')
+        self.assertGreater(len(chapter['Chapter Content']), 1000)
+
+    def test_gemini_stub_is_deterministic(self):
+        text = '첫 문단입니다.\n\n두 번째 문단입니다.'
+        first = call_gemini(TRANSLATOR_SYSTEM_PROMPT, text)
+        self.assertEqual(call_gemini(TRANSLATOR_SYSTEM_PROMPT, text), first)
+        self.assertEqual(len(first.split('\n\n')), 2)
+        self.assertNotEqual(call_gemini(TRANSLATOR_SYSTEM_PROMPT, text, {'이안': 'Ian'}), first)
+
+    def test_gemini_stub_error_injection(self):
+        usage = GeminiUsage()
+        with override_settings(GEMINI_STUB_ERROR_RATE=1.0, GEMINI_MAX_RETRIES=2):
+            with self.assertRaises(ResourceExhausted):
+                call_gemini(TRANSLATOR_SYSTEM_PROMPT, '본문', usage=usage)
+        self.assertEqual(usage.retries, 2)
+
+
+@PIPELINE_STUBS
+class TranslationTelemetryTests(TestCase):
+    """Jobs record per-chapter stage timings and token usage."""
+
+    def setUp(self):
+        self.addCleanup(cleanup_browser)
+
+    def test_job_telemetry(self):
+        job = TranslationJob.objects.create(novel_url=FIXTURE_NOVEL_URL, chapters_requested=3)
+        start_translation_job(job.job_id)
+        job.refresh_from_db()
+
+        self.assertEqual((job.status, job.chapters_completed), ('completed', 3))
+        for chapter in job.cached_chapters.all():
+            self.assertIsNotNone(chapter.scrape_ms)
+            self.assertIsNotNone(chapter.translate_ms)
+            self.assertIsNotNone(chapter.polish_ms)
+            self.assertGreater(chapter.output_tokens, chapter.input_tokens / 3)
+
+        totals = job.telemetry()
+        self.assertEqual(totals['chapters'], 3)
+        self.assertEqual(totals['input_tokens'], sum(c.input_tokens for c in job.cached_chapters.all()))
+        self.assertGreater(totals['estimated_cost'], 0)
+        self.assertIsNotNone(job.started_at)
+        self.assertIsNone(job.eta)
+        self.assertIsNone(job.eta_seconds)
+
+    def test_eta(self):
+        now = timezone.now()
+        job = TranslationJob(
+            chapters_requested=10, chapters_completed=3, chapters_failed=1, started_at=now - timedelta(minutes=4)
+        )
+        self.assertAlmostEqual(job.throughput, 60, delta=1)
+        self.assertAlmostEqual(job.eta.total_seconds(), 360, delta=10)
+        self.assertEqual(job.eta_seconds, round(job.eta.total_seconds()))
+
+    def test_admin_pages(self):
+        admin = User.objects.create_superuser('root', 'root@example.com', 'pw', role=Role.objects.create(name='Admin'))
+        job = TranslationJob.objects.create(novel_url=FIXTURE_NOVEL_URL, chapters_requested=1)
+        start_translation_job(job.job_id)
+        self.client.force_login(admin)
+
+        self.assertEqual(self.client.get('/admin/translator/translationjob/').status_code, 200)
+        response = self.client.get(f'/admin/translator/translationjob/{job.job_id}/change/')
+        self.assertContains(response, 'Per chapter')
+
+
+class BenchmarkTranslationTests(TransactionTestCase):
+    """benchmark_translation runs real jobs against the stubs and cleans up."""
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_translation', concurrency='1,2', chapters=2, stdout=out)
+
+        rows = [line.split() for line in out.getvalue().splitlines() if line.strip().endswith(tuple('0123456789'))]
+        self.assertEqual([row[0] for row in rows], ['1', '2'])
+        # Only the single-job level is exact: concurrent writers can hit table
+        # locks on the shared in-memory SQLite test database.
+        self.assertEqual(rows[0][1:3], ['2', '0'])
+        self.assertFalse(TranslationJob.objects.exists())
+
+
+@override_settings(JOB_PROGRESS_POLL_INTERVAL=0.05, JOB_PROGRESS_HEARTBEAT=15)
+class JobProgressStreamTests(TestCase):
+    """The progress stream sends a snapshot, then small deltas as the runner saves."""
+
+    @classmethod
+    def setUpTestData(cls):
+        role = Role.objects.create(name='Admin')
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role=role, is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.job = TranslationJob.objects.create(
+            novel_url=FIXTURE_NOVEL_URL, chapters_requested=2, status='translating', korean_title='소설'
+        )
+        self.chapter = TranslatedChapterCache.objects.create(
+            job=self.job, chapter_number=1, chapter_url=f'{FIXTURE_NOVEL_URL}/chapter/1',
+            korean_title='1화', korean_content='본문 ' * 1000, status='scraped'
+        )
+
+    def _open(self, **headers):
+        response = self.client.get(f'/api/translator/jobs/{self.job.job_id}/progress/', **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return iter(response.streaming_content)
+
+    def _next_event(self, stream):
+        for chunk in stream:
+            chunk = chunk.decode()
+            if chunk.startswith('id:'):
+                fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+                return fields['id'], fields['event'], json.loads(fields['data'])
+        self.fail('Stream ended')
+
+    def test_snapshot_then_deltas(self):
+        stream = self._open()
+        _, kind, snapshot = self._next_event(stream)
+        self.assertEqual(kind, 'snapshot')
+        self.assertEqual(snapshot['job']['status'], 'translating')
+        self.assertEqual([c['chapter_number'] for c in snapshot['chapters']], [1])
+        self.assertNotIn('korean_content', snapshot['chapters'][0])
+
+        self.chapter.status = 'translated'
+        self.chapter.save()
+        _, kind, data = self._next_event(stream)
+        self.assertEqual((kind, data['chapter_number'], data['status']), ('chapter', 1, 'translated'))
+
+        self.job.chapters_completed = 1
+        self.job.current_operation = 'Polishing chapter 1'
+        self.job.save()
+        _, kind, data = self._next_event(stream)
+        self.assertEqual(kind, 'job')
+        self.assertEqual(data['chapters_completed'], 1)
+        self.assertNotIn('korean_title', data)
+
+        # Saving without changes publishes nothing.
+        self.job.save()
+        self.job.status = 'completed'
+        self.job.completed_at = timezone.now()
+        self.job.save()
+        _, kind, data = self._next_event(stream)
+        self.assertEqual((kind, data['status']), ('job', 'completed'))
+        _, kind, data = self._next_event(stream)
+        self.assertEqual((kind, data), ('end', {'status': 'completed'}))
+
+    def test_resume_from_last_event_id(self):
+        stream = self._open()
+        last_id, _, _ = self._next_event(stream)
+        self.chapter.status = 'polished'
+        self.chapter.save()
+
+        stream = self._open(HTTP_LAST_EVENT_ID=last_id)
+        _, kind, data = self._next_event(stream)
+        self.assertEqual((kind, data['status']), ('chapter', 'polished'))
+
+    def test_event_id_from_another_process_gets_snapshot(self):
+        stream = self._open()
+        last_id, _, _ = self._next_event(stream)
+        self.chapter.status = 'polished'
+        self.chapter.save()
+
+        # Same sequence number, but issued by a broker in another process.
+        foreign_id = 'otherprocess-' + last_id.split('-')[1]
+        stream = self._open(HTTP_LAST_EVENT_ID=foreign_id)
+        _, kind, data = self._next_event(stream)
+        self.assertEqual(kind, 'snapshot')
+        self.assertEqual(data['chapters'][0]['status'], 'polished')
+
+    def test_picks_up_changes_from_other_processes(self):
+        stream = self._open()
+        self._next_event(stream)
+        # update() bypasses the signals, like a save made by another worker process.
+        TranslationJob.objects.filter(pk=self.job.pk).update(
+            status='failed', error_message='boom', updated_at=timezone.now(), completed_at=timezone.now()
+        )
+        _, kind, data = self._next_event(stream)
+        self.assertEqual((kind, data['status'], data['error_message']), ('job', 'failed', 'boom'))
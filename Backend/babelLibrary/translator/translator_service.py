@@ -2,9 +2,12 @@
 Adapted from Rosetta project for Django integration.
 """
 import google.generativeai as genai
+from google.api_core.exceptions import DeadlineExceeded, InternalServerError, ResourceExhausted, ServiceUnavailable
 from django.conf import settings
 from django.utils import timezone
 import logging
+import time
+from . import gemini_stub
 from .models import TranslationJob, TranslatedChapterCache
 from .scraper import scrape_novel_page, get_chapter_pages, scrape_chapter_page
 
@@ -59,21 +62,64 @@ Provide only the final, polished English text.
 """
 
 
+# Gemini errors worth retrying: rate limits and temporary unavailability
+RETRYABLE_GEMINI_ERRORS = (ResourceExhausted, ServiceUnavailable, DeadlineExceeded, InternalServerError)
+
+
+class GeminiUsage:
+    """Tokens and retries accumulated over Gemini calls (e.g. for one chapter)."""
+    
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.retries = 0
+    
+    def record(self, response):
+        """Add the token counts from a response's usage metadata."""
+        usage_metadata = getattr(response, 'usage_metadata', None)
+        if usage_metadata:
+            self.input_tokens += usage_metadata.prompt_token_count or 0
+            self.output_tokens += usage_metadata.candidates_token_count or 0
+
+
+def _elapsed_ms(started):
+    return int((time.perf_counter() - started) * 1000)
+
+
 def configure_gemini():
     """Configure Gemini API with key from settings."""
+    if gemini_stub.stub_enabled():
+        return
     api_key = getattr(settings, 'GEMINI_API_KEY', None)
     if not api_key:
         raise ValueError("GEMINI_API_KEY not found in settings")
     genai.configure(api_key=api_key)
 
 
-def call_gemini(system_prompt: str, user_text: str, prompt_dictionary: dict = None) -> str:
+def _generate_content(system_prompt: str, user_text: str):
+    """Sends one request to Gemini (or the offline stub) and returns the response."""
+    if gemini_stub.stub_enabled():
+        return gemini_stub.generate_content(system_prompt, user_text)
+    
+    model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.0-flash-exp')
+    model = genai.GenerativeModel(
+        model_name,
+        system_instruction=system_prompt
+    )
+    return model.generate_content(user_text)
+
+
+def call_gemini(system_prompt: str, user_text: str, prompt_dictionary: dict = None, usage: GeminiUsage = None) -> str:
     """Calls the Gemini API with a system prompt and user text.
     
+    Rate-limited or temporarily failing calls are retried up to GEMINI_MAX_RETRIES
+    times with exponential backoff.
+    
     Args:
         system_prompt: System instruction for the model
         user_text: User text to process
         prompt_dictionary: Optional dictionary of terms for consistent translation
+        usage: Optional GeminiUsage that token counts and retries are added to
         
     Returns:
         Generated text response
@@ -89,12 +135,23 @@ def call_gemini(system_prompt: str, user_text: str, prompt_dictionary: dict = No
                 dictionary_str += f"- {key}: {value}\n"
             user_text = dictionary_str + "\n" + user_text
         
-        model_name = getattr(settings, 'GEMINI_MODEL', 'gemini-2.0-flash-exp')
-        model = genai.GenerativeModel(
-            model_name,
-            system_instruction=system_prompt
-        )
-        response = model.generate_content(user_text)
+        attempt = 0
+        while True:
+            try:
+                response = _generate_content(system_prompt, user_text)
+                break
+            except RETRYABLE_GEMINI_ERRORS as e:
+                if attempt >= settings.GEMINI_MAX_RETRIES:
+                    raise
+                delay = settings.GEMINI_RETRY_BACKOFF * 2 ** attempt
+                attempt += 1
+                if usage is not None:
+                    usage.retries += 1
+                logger.warning(f"Gemini call failed ({e}), retry {attempt} in {delay:g}s")
+                time.sleep(delay)
+        
+        if usage is not None:
+            usage.record(response)
         return response.text
     except Exception as e:
         logger.error(f"Error calling Gemini API: {e}")
@@ -193,6 +250,15 @@ def process_novel_metadata(job: TranslationJob) -> bool:
         return False
 
 
+def _record_telemetry(cache: TranslatedChapterCache, timings: dict, usage: GeminiUsage):
+    """Store the stage timings, retries and token usage of a chapter on its cache entry."""
+    for field, value in timings.items():
+        setattr(cache, field, value)
+    cache.retries = usage.retries
+    cache.input_tokens = usage.input_tokens
+    cache.output_tokens = usage.output_tokens
+
+
 def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
     """Scrape, translate, and cache a single chapter.
     
@@ -205,6 +271,8 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
     """
     chapter_num = chapter_info['number']
     chapter_url = chapter_info['url']
+    usage = GeminiUsage()
+    timings = {}
     
     try:
         logger.info(f"Processing chapter {chapter_num}")
@@ -226,7 +294,9 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
         job.current_operation = f'Scraping chapter {chapter_num}'
         job.save()
         
+        started = time.perf_counter()
         chapter_data = scrape_chapter_page(chapter_url)
+        timings['scrape_ms'] = _elapsed_ms(started)
         
         if not chapter_data or not chapter_data.get('Chapter Content'):
             raise ValueError("Failed to scrape chapter content")
@@ -250,6 +320,7 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
         job.save()
         
         configure_gemini()
+        started = time.perf_counter()
         
         # If title is the default "Chapter X", keep it as is in English
         if cache.korean_title == default_title:
@@ -257,7 +328,7 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
             logger.info(f"Using default title: {cache.english_title}")
         else:
             # Translate the Korean title
-            cache.english_title = call_gemini(METADATA_TRANSLATOR_PROMPT, cache.korean_title, job.prompt_dictionary)
+            cache.english_title = call_gemini(METADATA_TRANSLATOR_PROMPT, cache.korean_title, job.prompt_dictionary, usage)
             logger.info(f"Translated title: {cache.english_title}")
         
         cache.save()
@@ -266,7 +337,8 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
         job.current_operation = f'Translating chapter {chapter_num} content'
         job.save()
         
-        cache.english_content_raw = call_gemini(TRANSLATOR_SYSTEM_PROMPT, cache.korean_content, job.prompt_dictionary)
+        cache.english_content_raw = call_gemini(TRANSLATOR_SYSTEM_PROMPT, cache.korean_content, job.prompt_dictionary, usage)
+        timings['translate_ms'] = _elapsed_ms(started)
         cache.status = 'translated'
         cache.save()
         
@@ -276,8 +348,11 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
         job.current_operation = f'Polishing chapter {chapter_num}'
         job.save()
         
-        cache.english_content_final = call_gemini(EDITOR_SYSTEM_PROMPT, cache.english_content_raw, job.prompt_dictionary)
+        started = time.perf_counter()
+        cache.english_content_final = call_gemini(EDITOR_SYSTEM_PROMPT, cache.english_content_raw, job.prompt_dictionary, usage)
+        timings['polish_ms'] = _elapsed_ms(started)
         cache.status = 'polished'
+        _record_telemetry(cache, timings, usage)
         cache.save()
         
         logger.info(f"Polished chapter {chapter_num}")
@@ -296,6 +371,7 @@ def process_chapter(job: TranslationJob, chapter_info: dict) -> bool:
             cache = TranslatedChapterCache.objects.get(job=job, chapter_number=chapter_num)
             cache.status = 'failed'
             cache.error_message = str(e)
+            _record_telemetry(cache, timings, usage)
             cache.save()
         except TranslatedChapterCache.DoesNotExist:
             logger.info(f"Cache entry does not exist for job {job.job_id}, chapter {chapter_num} when marking as failed. This may be expected if the cache was not created yet.")
@@ -340,7 +416,7 @@ def start_translation_job(job_id):
             logger.info(f"Found existing series: {existing_series.title} ({existing_series.series_id})")
             
             # Find the highest chapter number already translated
-            highest_chapter = Chapter.objects.filter(
+            highest_chapter = Chapter.objects.metadata_only().filter(
                 series=existing_series
             ).order_by('-chapter_number').first()
             
@@ -391,6 +467,8 @@ def start_translation_job(job_id):
         logger.info(f"Found {len(all_available_chapters)} available chapters. Processing {len(chapters)} chapters starting from chapter {start_from_chapter}")
         
         # Process each chapter
+        job.started_at = timezone.now()
+        job.save()
         for chapter in chapters:
             process_chapter(job, chapter)
         
@@ -1,21 +1,27 @@
 """
 API views for the translator app.
 """
-from rest_framework import viewsets, status
+from rest_framework import renderers, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.db import transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
 from threading import Thread
 import logging
+import re
 
-from .models import TranslationJob
+from babelLibrary.instrumentation import InstrumentedViewMixin
+from .models import TranslatedChapterCache, TranslationJob
+from .progress import stream_job_progress
 from .serializers import (
     TranslationJobSerializer,
     TranslationJobListSerializer,
     CreateTranslationJobSerializer,
     TranslationJobPreviewSerializer,
     ImportTranslationSerializer,
+    TranslatedChapterCacheListSerializer,
     TranslatedChapterCacheSerializer,
 )
 from .translator_service import start_translation_job
@@ -23,15 +29,56 @@ from library.models import Series, Chapter, Genre, SeriesGenre
 
 logger = logging.getLogger(__name__)
 
+BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
 
-class TranslationJobViewSet(viewsets.ModelViewSet):
+
+def parse_byte_range(header, length):
+    """
+    Parse a single-range Range header against a body of length bytes.
+    
+    Returns (start, end) with end inclusive, None if the header should be
+    ignored (malformed or several ranges), or False if it is unsatisfiable.
+    """
+    match = BYTE_RANGE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes.
+        suffix = int(last)
+        if suffix == 0 or length == 0:
+            return False
+        return max(length - suffix, 0), length - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= length:
+        return False
+    end = min(int(last), length - 1) if last else length - 1
+    return start, end
+
+
+class EventStreamRenderer(renderers.JSONRenderer):
+    """
+    Lets requests that only accept text/event-stream (EventSource) reach the
+    progress action. Only error responses are rendered (as JSON); the stream
+    itself bypasses rendering.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+
+class TranslationJobViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing translation jobs.
     
     Endpoints:
     - GET /api/translator/jobs/ - List all translation jobs
     - POST /api/translator/jobs/ - Create new translation job
-    - GET /api/translator/jobs/{id}/ - Get job details with chapters
+    - GET /api/translator/jobs/{id}/ - Get job details with chapter metadata
+    - GET /api/translator/jobs/{id}/chapters/ - List chapter metadata
+    - GET /api/translator/jobs/{id}/chapters/{number}/ - Get one chapter's text
+    - GET /api/translator/jobs/{id}/progress/ - Stream progress as Server-Sent Events
     - GET /api/translator/jobs/{id}/preview/ - Preview translation before import
     - POST /api/translator/jobs/{id}/import/ - Import to library
     - DELETE /api/translator/jobs/{id}/ - Delete a job
@@ -40,6 +87,18 @@ class TranslationJobViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsAdminUser]
     lookup_field = 'job_id'
     
+    def get_queryset(self):
+        """Prefetch chapter metadata, never chapter text, for the detail view."""
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'cached_chapters',
+                    queryset=TranslatedChapterCache.objects.metadata_only().order_by('chapter_number')
+                )
+            )
+        return queryset
+    
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'list':
@@ -83,6 +142,29 @@ class TranslationJobViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
     
+    @action(detail=True, methods=['get'], renderer_classes=[EventStreamRenderer, renderers.JSONRenderer])
+    def progress(self, request, job_id=None):
+        """
+        Stream job progress as Server-Sent Events.
+        
+        Sends a "snapshot" event (job fields and chapter metadata, no chapter
+        text), then "job" and "chapter" events with what changed, and an "end"
+        event once the job has completed or failed. Clients reconnecting with a
+        Last-Event-ID header (or ?last_event_id=) resume where they left off,
+        or get a fresh snapshot if the id came from another worker process.
+        See translator/progress.py.
+        """
+        job = self.get_object()
+        last_event_id = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        
+        response = StreamingHttpResponse(
+            stream_job_progress(job.job_id, last_event_id),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+        return response
+    
     @action(detail=True, methods=['get'])
     def preview(self, request, job_id=None):
         """
@@ -199,11 +281,68 @@ class TranslationJobViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def chapters(self, request, job_id=None):
         """
-        Get all cached chapters for a job with full details.
+        Get the metadata of all cached chapters for a job.
+        
+        Chapter text is served one chapter at a time by chapter_content.
+        """
+        job = self.get_object()
+        chapters = job.cached_chapters.metadata_only().order_by('chapter_number')
+        serializer = TranslatedChapterCacheListSerializer(chapters, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path=r'chapters/(?P<chapter_number>[0-9]+)')
+    def chapter_content(self, request, job_id=None, chapter_number=None):
+        """
+        Get one cached chapter with its text.
+        
+        Query params: fields (comma-separated korean_content,
+        english_content_raw, english_content_final; default all three). Only
+        the selected text columns are read from the database.
+        
+        With exactly one field selected, a "Range: bytes=start-end" header
+        returns that slice of the field's UTF-8 text as text/plain (206
+        Partial Content), so long chapters can be fetched in pieces.
         """
+        content_fields = TranslatedChapterCacheSerializer.CONTENT_FIELDS
+        requested = request.query_params.get('fields')
+        if requested:
+            selected = [name.strip() for name in requested.split(',') if name.strip()]
+            unknown = sorted(set(selected) - set(content_fields))
+            if unknown:
+                return Response(
+                    {'error': f"Unknown fields: {', '.join(unknown)}. Choose from {', '.join(content_fields)}"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            selected = content_fields
+        
         job = self.get_object()
-        chapters = job.cached_chapters.all().order_by('chapter_number')
-        serializer = TranslatedChapterCacheSerializer(chapters, many=True)
+        cache = job.cached_chapters.defer(
+            *(name for name in content_fields if name not in selected)
+        ).filter(chapter_number=chapter_number).first()
+        if cache is None:
+            return Response({'error': 'Chapter not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        range_header = request.headers.get('Range')
+        if range_header and len(selected) == 1:
+            body = (getattr(cache, selected[0]) or '').encode('utf-8')
+            byte_range = parse_byte_range(range_header, len(body))
+            if byte_range is False:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{len(body)}'
+                return response
+            if byte_range is not None:
+                start, end = byte_range
+                response = HttpResponse(
+                    body[start:end + 1],
+                    content_type='text/plain; charset=utf-8',
+                    status=status.HTTP_206_PARTIAL_CONTENT
+                )
+                response['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+                response['Accept-Ranges'] = 'bytes'
+                return response
+        
+        serializer = TranslatedChapterCacheSerializer(cache, content_fields=selected)
         return Response(serializer.data)
     
     def destroy(self, request, *args, **kwargs):
@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        """Connect library dashboard invalidation signals."""
+        from . import signals  # noqa: F401
+
+        # login_view sends user_logged_in for the auth signal receivers, but
+        # django.contrib.auth's update_last_login would add an UPDATE to every
+        # login. Follow SIMPLE_JWT's UPDATE_LAST_LOGIN instead; this also
+        # applies to admin session logins.
+        if not settings.SIMPLE_JWT.get('UPDATE_LAST_LOGIN', False):
+            from django.contrib.auth.models import update_last_login
+            from django.contrib.auth.signals import user_logged_in
+            user_logged_in.disconnect(update_last_login, dispatch_uid='update_last_login')
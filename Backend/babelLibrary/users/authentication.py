@@ -0,0 +1,107 @@
+"""
+JWT authentication with a short-lived in-process user cache.
+
+simplejwt's JWTAuthentication loads the user row on every authenticated
+request. CachedJWTAuthentication keeps recently seen users (with their role)
+in a per-process cache for AUTH_USER_CACHE_TTL seconds. users/signals.py
+evicts entries when a user is saved (activate/deactivate, role or password
+changes) or a role changes, so this process sees those changes immediately
+and other worker processes within the TTL.
+
+Views can also list actions in stateless_auth_actions. Those requests are
+authenticated from the token claims alone (see tokens_for_user) and get a
+TokenUser instead of a User instance, so they never touch the users table.
+The claims are trusted for the whole life of the access token
+(SIMPLE_JWT['ACCESS_TOKEN_LIFETIME']): a user deactivated or given another
+role within that window still passes as before. Only list actions that need
+nothing beyond the user id, with no is_active or role check (view tracking
+is one). Tokens issued without these claims fall back to the database.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class UserStateCache:
+    """Thread-safe per-process cache of active users keyed by user_id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(str(user_id))
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        # Hand out copies so per-request mutations never leak between requests.
+        return copy.copy(entry[1])
+
+    def set(self, user, ttl):
+        with self._lock:
+            self._entries[str(user.pk)] = (time.monotonic() + ttl, user)
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_state_cache = UserStateCache()
+
+# Claims added by tokens_for_user; tokens without them take the database path.
+STATELESS_CLAIMS = frozenset({'username', 'is_staff', 'role', 'role_id'})
+
+
+def tokens_for_user(user):
+    """Issue a refresh token carrying the claims stateless endpoints rely on."""
+    refresh = RefreshToken.for_user(user)
+    refresh['username'] = user.username
+    refresh['is_staff'] = user.is_staff
+    refresh['role'] = user.role.name
+    refresh['role_id'] = str(user.role_id)
+    return refresh
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that serves users from UserStateCache or token claims."""
+
+    def authenticate(self, request):
+        view = request.parser_context.get('view') if request.parser_context else None
+        self.stateless = getattr(view, 'action', None) in getattr(view, 'stateless_auth_actions', ())
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        if getattr(self, 'stateless', False) and STATELESS_CLAIMS.issubset(validated_token.payload):
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        ttl = settings.AUTH_USER_CACHE_TTL
+        user = user_state_cache.get(user_id) if ttl > 0 else None
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related('role').get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            if ttl > 0 and user.is_active:
+                user_state_cache.set(user, ttl)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
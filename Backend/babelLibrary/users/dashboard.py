@@ -0,0 +1,67 @@
+"""
+Per-user library dashboard: bookmarked series with reading progress.
+
+Each row combines a bookmark, the user's last-read chapter for that series
+and the number of chapters published after it. Everything is computed in a
+single SQL statement with correlated subqueries, and the serialized result
+is cached per user until users/signals.py bumps the user's version stamp
+(new or removed chapters in a followed series, bookmark or history changes).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from babelLibrary.versioning import get_version, bump_version
+from library.models import Chapter
+from .models import Bookmark, ReadingHistory
+from .serializers import LibraryEntrySerializer
+
+USER_LIBRARY_SCOPE = 'user-library'
+
+
+def _cache_key(user_id):
+    return f'users:library:{user_id}:{get_version(USER_LIBRARY_SCOPE, user_id)}'
+
+
+def invalidate_user_library(user_ids):
+    """Retire the cached dashboards of the given users."""
+    for user_id in set(user_ids):
+        bump_version(USER_LIBRARY_SCOPE, user_id)
+
+
+def library_queryset(user_id):
+    """Bookmarks of a user annotated with last-read chapter and unread count."""
+    history = ReadingHistory.objects.filter(user_id=user_id, series=OuterRef('series'))
+    series_chapters = Chapter.objects.filter(series=OuterRef('series')).order_by().values('series')
+    unread = Chapter.objects.filter(
+        series=OuterRef('series'), chapter_number__gt=OuterRef('read_up_to')
+    ).order_by().values('series').annotate(total=Count('pk')).values('total')
+
+    return Bookmark.objects.filter(user_id=user_id).select_related('series').only(
+        'bookmark_id', 'created_at', 'series__series_id', 'series__title',
+        'series__cover_image_url', 'series__status',
+    ).annotate(
+        last_read_chapter_id=Subquery(history.values('chapter_id')[:1]),
+        last_read_chapter_number=Subquery(history.values('chapter__chapter_number')[:1]),
+        last_read_at=Subquery(history.values('last_read_at')[:1]),
+        read_up_to=Coalesce(F('last_read_chapter_number'), 0),
+        latest_chapter_number=Subquery(
+            series_chapters.annotate(latest=Max('chapter_number')).values('latest')
+        ),
+        unread_count=Coalesce(Subquery(unread, output_field=IntegerField()), 0),
+    ).order_by(F('last_read_at').desc(nulls_last=True), '-created_at')
+
+
+def get_user_library(user_id):
+    """Return the (cached) dashboard payload for a user."""
+    key = _cache_key(user_id)
+    data = cache.get(key)
+    if data is None:
+        entries = list(LibraryEntrySerializer(library_queryset(user_id), many=True).data)
+        data = {
+            'results': entries,
+            'total_unread': sum(entry['unread_count'] for entry in entries),
+        }
+        cache.set(key, data, settings.LIBRARY_CACHE_TIMEOUT)
+    return data
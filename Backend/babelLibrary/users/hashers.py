@@ -0,0 +1,34 @@
+"""
+Password hashers whose cost is read from settings.
+
+Both keep Django's algorithm names, so existing hashes keep verifying. When
+the configured cost (or the preferred algorithm) changes, Django reports the
+stored hash as outdated and users/login.py rehashes it on the next
+successful login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id with time/memory/parallelism cost from ARGON2_* settings."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count from PBKDF2_ITERATIONS."""
+
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
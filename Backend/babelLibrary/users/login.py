@@ -0,0 +1,157 @@
+"""
+Login pipeline: failed-attempt throttling, bounded password hashing and
+transparent rehashing.
+
+1. LoginThrottle counts failed attempts per client IP and per username in
+   the default cache. Once either limit is reached, further attempts are
+   rejected before any password hashing happens. The counters are only
+   shared between worker processes when CACHES is a shared backend; with
+   the default per-process LocMemCache each worker enforces the limits on
+   its own, so an attacker spread over N workers gets N times the attempts.
+2. verify_credentials() goes through django.contrib.auth.authenticate(), so
+   AUTHENTICATION_BACKENDS and the user_login_failed signal apply.
+   PooledModelBackend runs every hash in a fixed-size thread pool
+   (LOGIN_HASH_WORKERS). A login spike therefore queues for a hashing slot
+   instead of oversubscribing the CPU; if no slot frees up within
+   LOGIN_HASH_TIMEOUT the caller gets LoginBusy.
+3. After a successful check, hashes made with an older algorithm or cost
+   are replaced with one from the preferred hasher (see settings
+   PASSWORD_HASHERS).
+
+Database access stays on the request thread; pool threads only hash.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, get_hasher, identify_hasher, make_password
+from django.core.cache import cache
+
+from .models import User
+
+
+class LoginBusy(Exception):
+    """Raised when no hashing slot became free within LOGIN_HASH_TIMEOUT."""
+
+
+class LoginThrottle:
+    """Failed login counters for one client IP and username."""
+
+    def __init__(self, ip, username):
+        self.ip_key = f'users:login-failures:ip:{ip}'
+        self.username_key = f'users:login-failures:user:{username.lower()}'
+
+    def is_blocked(self):
+        counts = cache.get_many([self.ip_key, self.username_key])
+        return (
+            counts.get(self.ip_key, 0) >= settings.LOGIN_FAILURE_LIMIT_PER_IP
+            or counts.get(self.username_key, 0) >= settings.LOGIN_FAILURE_LIMIT_PER_USERNAME
+        )
+
+    def record_failure(self):
+        for key in (self.ip_key, self.username_key):
+            # add() starts the window on the first failure; incr() keeps its expiry.
+            cache.add(key, 0, settings.LOGIN_FAILURE_WINDOW)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, settings.LOGIN_FAILURE_WINDOW)
+
+    def reset(self):
+        cache.delete(self.username_key)
+
+
+class HashingPool:
+    """Thread pool for password hashing with a bounded number of waiting jobs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._executor is None:
+                workers = max(1, settings.LOGIN_HASH_WORKERS)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='login-hash')
+                # Allow one queued job per worker on top of the running ones.
+                self._slots = threading.BoundedSemaphore(workers * 2)
+
+    def run(self, func, *args):
+        self._ensure_started()
+        if not self._slots.acquire(timeout=settings.LOGIN_HASH_TIMEOUT):
+            raise LoginBusy()
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+
+hashing_pool = HashingPool()
+
+
+def needs_rehash(encoded):
+    """Return True if encoded was not made by the preferred hasher at its current cost."""
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that hashes on hashing_pool and loads the user with its role.
+
+    Unknown usernames still pay for one hash so response timing does not
+    reveal which accounts exist.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = User.objects.select_related('role').filter(**{User.USERNAME_FIELD: username}).first()
+        if user is None or not user.has_usable_password():
+            hashing_pool.run(make_password, password)
+            return None
+
+        if not hashing_pool.run(check_password, password, user.password):
+            return None
+
+        if needs_rehash(user.password):
+            user.password = hashing_pool.run(make_password, password)
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
+
+
+def verify_credentials(request, username, password):
+    """
+    Return the user if username/password are valid, otherwise None.
+
+    Raises:
+        LoginBusy: If no hashing slot became free within LOGIN_HASH_TIMEOUT
+    """
+    return authenticate(request, username=username, password=password)
+
+
+def get_client_ip(request):
+    """
+    Get the client IP address from the request.
+
+    X-Forwarded-For is only trusted when LOGIN_TRUSTED_PROXIES says how many
+    reverse proxies append to it; the client address is then that many
+    entries from the right. Otherwise any client could pick its own address.
+    """
+    proxies = settings.LOGIN_TRUSTED_PROXIES
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies > 0 and x_forwarded_for:
+        addresses = [address.strip() for address in x_forwarded_for.split(',')]
+        if len(addresses) >= proxies:
+            return addresses[-proxies]
+    return request.META.get('REMOTE_ADDR')
@@ -0,0 +1,77 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure password verifications (the dominant cost of a login) per second, '
+        'single-threaded and through a thread pool, for each preferred hasher'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5, help='Duration of each measurement')
+        parser.add_argument(
+            '--workers', type=int, default=settings.LOGIN_HASH_WORKERS,
+            help='Thread pool size for the concurrent measurement (default: LOGIN_HASH_WORKERS)'
+        )
+        parser.add_argument(
+            '--hasher', action='append', dest='hashers',
+            help='Hasher algorithm to benchmark (e.g. argon2, pbkdf2_sha256); repeatable'
+        )
+
+    def handle(self, *args, **options):
+        seconds = options['seconds']
+        workers = max(1, options['workers'])
+        cores = min(workers, os.cpu_count() or 1)
+        algorithms = options['hashers'] or self._available_algorithms()
+
+        self.stdout.write(f'{workers} worker(s) on {os.cpu_count()} CPU(s), {seconds:g}s per run\n')
+        self.stdout.write(f'{"hasher":<16} {"1 thread/s":>12} {"pool/s":>10} {"per core/s":>12}  parameters')
+        for algorithm in algorithms:
+            hasher = get_hasher(algorithm)
+            encoded = hasher.encode('benchmark-password', hasher.salt())
+
+            single = self._measure(hasher, encoded, seconds, 1)
+            pooled = self._measure(hasher, encoded, seconds, workers)
+            params = {
+                key: value for key, value in hasher.decode(encoded).items()
+                if key not in ('algorithm', 'hash', 'salt')
+            }
+            self.stdout.write(
+                f'{algorithm:<16} {single:>12.1f} {pooled:>10.1f} {pooled / cores:>12.1f}  {params}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    def _available_algorithms(self):
+        algorithms = []
+        for algorithm in ('argon2', 'pbkdf2_sha256'):
+            hasher = get_hasher(algorithm)
+            if hasher.library is not None:
+                try:
+                    hasher._load_library()
+                except ValueError:
+                    self.stdout.write(self.style.WARNING(f'Skipping {algorithm}: library not installed'))
+                    continue
+            algorithms.append(algorithm)
+        return algorithms
+
+    def _measure(self, hasher, encoded, seconds, workers):
+        deadline = time.perf_counter() + seconds
+
+        def verify_until_deadline():
+            count = 0
+            while time.perf_counter() < deadline:
+                hasher.verify('benchmark-password', encoded)
+                count += 1
+            return count
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            total = sum(executor.map(lambda _: verify_until_deadline(), range(workers)))
+        return total / (time.perf_counter() - start)
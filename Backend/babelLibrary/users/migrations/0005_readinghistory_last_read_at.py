@@ -0,0 +1,19 @@
+# Generated by Django 4.2.25 on 2026-10-19 08:43
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_readinghistory_bookmark'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='readinghistory',
+            name='last_read_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.utils import timezone
 
 
 class Role(models.Model):
@@ -118,7 +119,10 @@ class ReadingHistory(models.Model):
     user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='reading_history')
     series = models.ForeignKey('library.Series', on_delete=models.CASCADE, related_name='read_by')
     chapter = models.ForeignKey('library.Chapter', on_delete=models.CASCADE, related_name='reading_records')
-    last_read_at = models.DateTimeField(auto_now=True)
+    # Not auto_now: the reading-progress buffer (users/progress.py) bulk-writes
+    # the time each chapter was opened, which auto_now would overwrite with
+    # the flush time. save() still stamps it like auto_now.
+    last_read_at = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -130,5 +134,9 @@ class ReadingHistory(models.Model):
             models.Index(fields=['user', '-last_read_at']),
         ]
 
+    def save(self, *args, **kwargs):
+        self.last_read_at = timezone.now()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.user.username} last read {self.series.title} - Chapter {self.chapter.chapter_number}"
@@ -0,0 +1,98 @@
+"""
+Role-based permission checks backed by a per-process cache.
+
+Each role's permission names are loaded into a frozenset and reused by
+every request for up to ROLE_PERMISSIONS_CACHE_TTL seconds, so
+HasRolePermission answers in O(1) without queries. The cache is also stamped
+with a version (babelLibrary.versioning) that users/signals.py bumps whenever a
+RolePermission, Permission or Role changes. The process that made the change
+sees it on its next check, and so does every other worker when CACHES is a
+shared backend. With the default per-process LocMemCache other workers do
+not see the bump, so a revocation reaches them only once their entry
+expires, i.e. within ROLE_PERMISSIONS_CACHE_TTL seconds.
+"""
+import threading
+import time
+
+from django.conf import settings
+from rest_framework import permissions
+
+from babelLibrary.versioning import bump_version, get_version
+from .models import Permission
+
+ROLE_PERMISSIONS_SCOPE = 'role-permissions'
+
+# Required to create, edit or delete roles, permissions and role grants.
+MANAGE_ROLES = 'manage_roles'
+WRITE_ACTIONS = ('create', 'update', 'partial_update', 'destroy')
+
+_lock = threading.Lock()
+_cache = {'version': None, 'roles': {}}
+
+
+def invalidate_role_permissions():
+    """Drop cached permission sets in every process."""
+    bump_version(ROLE_PERMISSIONS_SCOPE)
+
+
+def get_role_permissions(role_id):
+    """Return the frozenset of permission names granted to a role."""
+    if role_id is None:
+        return frozenset()
+    role_id = str(role_id)
+    version = get_version(ROLE_PERMISSIONS_SCOPE)
+    now = time.monotonic()
+    with _lock:
+        if _cache['version'] != version:
+            _cache['version'] = version
+            _cache['roles'] = {}
+        cached = _cache['roles'].get(role_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    names = frozenset(
+        Permission.objects.filter(permission_roles__role_id=role_id).values_list('name', flat=True)
+    )
+    ttl = settings.ROLE_PERMISSIONS_CACHE_TTL
+    if ttl > 0:
+        with _lock:
+            if _cache['version'] == version:
+                _cache['roles'][role_id] = (now + ttl, names)
+    return names
+
+
+def _user_role_id(user):
+    role_id = getattr(user, 'role_id', None)
+    if role_id is None and hasattr(user, 'token'):
+        # Stateless TokenUser (see users/authentication.py)
+        role_id = user.token.get('role_id')
+    return role_id
+
+
+def user_has_permission(user, name):
+    """Return True if user's role grants the named permission."""
+    if not user or not user.is_authenticated:
+        return False
+    if getattr(user, 'is_superuser', False):
+        return True
+    return name in get_role_permissions(_user_role_id(user))
+
+
+class HasRolePermission(permissions.BasePermission):
+    """
+    Grant access when the user's role holds the permission required for the
+    current action.
+
+    Views declare requirements as a mapping of action name to permission
+    name; actions not listed are allowed:
+
+        permission_classes = [IsAuthenticated, HasRolePermission]
+        required_role_permissions = {'create': 'create_series', 'destroy': 'delete_series'}
+    """
+    message = 'Your role does not grant permission to perform this action.'
+
+    def has_permission(self, request, view):
+        required = getattr(view, 'required_role_permissions', {}).get(getattr(view, 'action', None))
+        if required is None:
+            return True
+        return user_has_permission(request.user, required)
@@ -0,0 +1,118 @@
+"""
+Debounced reading-progress ingestion.
+
+Chapter opens are recorded in an in-process buffer keyed by (user, series)
+that keeps only the highest chapter seen. A daemon thread flushes the buffer
+every READING_PROGRESS_FLUSH_INTERVAL seconds with one bulk upsert
+(INSERT ... ON CONFLICT (user_id, series_id) DO UPDATE), and a final flush
+runs at interpreter shutdown. An interval of 0 writes each record through
+immediately, which is what tests and single-request scripts want.
+
+Each worker process keeps its own buffer, so a reader whose requests hit
+different workers is coalesced per worker; the last flush wins.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import ReadingHistory
+
+logger = logging.getLogger(__name__)
+
+
+class ReadingProgressBuffer:
+    """Coalesces reading progress per (user, series) until the next flush."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._flusher = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def record(self, user_id, series_id, chapter_id, chapter_number):
+        """Remember a chapter open, keeping the highest chapter per series."""
+        with self._lock:
+            key = (user_id, series_id)
+            current = self._pending.get(key)
+            if current is None or chapter_number >= current[1]:
+                self._pending[key] = (chapter_id, chapter_number, timezone.now())
+
+        if self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    @property
+    def flush_interval(self):
+        return settings.READING_PROGRESS_FLUSH_INTERVAL
+
+    def flush(self):
+        """Write all pending progress with a single bulk upsert. Returns the row count."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        rows = [
+            ReadingHistory(user_id=user_id, series_id=series_id, chapter_id=chapter_id, last_read_at=read_at)
+            for (user_id, series_id), (chapter_id, _, read_at) in pending.items()
+        ]
+        try:
+            ReadingHistory.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['user', 'series'],
+                update_fields=['chapter', 'last_read_at'],
+            )
+        except Exception:
+            self._restore(pending)
+            raise
+
+        # bulk_create sends no post_save signals, so retire dashboards here.
+        from .dashboard import invalidate_user_library
+        invalidate_user_library(user_id for user_id, _ in pending)
+        return len(rows)
+
+    def _restore(self, pending):
+        """Put back entries from a failed flush unless newer progress arrived meanwhile."""
+        with self._lock:
+            for key, entry in pending.items():
+                current = self._pending.get(key)
+                if current is None or entry[1] > current[1]:
+                    self._pending[key] = entry
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._run, name='reading-progress-flusher', daemon=True)
+                self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush reading progress")
+            finally:
+                connection.close()
+
+
+progress_buffer = ReadingProgressBuffer()
+
+
+@atexit.register
+def _flush_on_shutdown():
+    try:
+        progress_buffer.flush()
+    except Exception:
+        logger.exception("Failed to flush reading progress on shutdown")
@@ -78,9 +78,9 @@ class BookmarkSerializer(serializers.ModelSerializer):
         read_only_fields = ['bookmark_id', 'user', 'created_at']
 
     def get_series_details(self, obj):
-        """Return basic series information."""
+        """Return basic series information (annotated and prefetched by BookmarkViewSet)."""
         from library.serializers import SeriesSerializer
-        return SeriesSerializer(obj.series).data
+        return SeriesSerializer(obj.series, context=self.context).data
 
     def create(self, validated_data):
         # Set the user from the request context
@@ -89,6 +89,47 @@ class BookmarkSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class LibraryEntrySerializer(serializers.ModelSerializer):
+    """
+    A bookmarked series with the user's reading progress.
+    Expects the annotations added by users.dashboard.library_queryset.
+    """
+    series_id = serializers.UUIDField(source='series.series_id', read_only=True)
+    series_title = serializers.CharField(source='series.title', read_only=True)
+    cover_image_url = serializers.CharField(source='series.cover_image_url', read_only=True)
+    series_status = serializers.CharField(source='series.status', read_only=True)
+    last_read_chapter_id = serializers.UUIDField(read_only=True)
+    last_read_chapter_number = serializers.IntegerField(read_only=True)
+    last_read_at = serializers.DateTimeField(read_only=True)
+    latest_chapter_number = serializers.IntegerField(read_only=True)
+    unread_count = serializers.IntegerField(read_only=True)
+    bookmarked_at = serializers.DateTimeField(source='created_at', read_only=True)
+
+    class Meta:
+        model = Bookmark
+        fields = [
+            'bookmark_id', 'series_id', 'series_title', 'cover_image_url', 'series_status',
+            'last_read_chapter_id', 'last_read_chapter_number', 'last_read_at',
+            'latest_chapter_number', 'unread_count', 'bookmarked_at'
+        ]
+
+
+class ReadingProgressSerializer(serializers.Serializer):
+    """Validates a chapter-open event for the debounced progress endpoint."""
+    series = serializers.UUIDField()
+    chapter = serializers.UUIDField()
+
+    def validate(self, data):
+        from library.models import Chapter
+        chapter_number = Chapter.objects.filter(
+            chapter_id=data['chapter'], series_id=data['series']
+        ).values_list('chapter_number', flat=True).first()
+        if chapter_number is None:
+            raise serializers.ValidationError("Chapter does not belong to this series.")
+        data['chapter_number'] = chapter_number
+        return data
+
+
 class ReadingHistorySerializer(serializers.ModelSerializer):
     """
     Serializer for reading history.
@@ -0,0 +1,53 @@
+"""
+Signal handlers that retire cached per-user state when the data behind it
+changes: library dashboards (users/dashboard.py) and authenticated user
+state (users/authentication.py) and role permission sets
+(users/permissions.py).
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from library.models import Chapter
+from .authentication import user_state_cache
+from .dashboard import invalidate_user_library
+from .models import Bookmark, Permission, ReadingHistory, Role, RolePermission, User
+from .permissions import invalidate_role_permissions
+
+
+@receiver(post_save, sender=Chapter)
+def chapter_published(sender, instance, created, **kwargs):
+    if created:
+        invalidate_user_library(
+            Bookmark.objects.filter(series_id=instance.series_id).values_list('user_id', flat=True)
+        )
+
+
+@receiver(post_delete, sender=Chapter)
+def chapter_removed(sender, instance, **kwargs):
+    invalidate_user_library(
+        Bookmark.objects.filter(series_id=instance.series_id).values_list('user_id', flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=Bookmark)
+@receiver([post_save, post_delete], sender=ReadingHistory)
+def library_entry_changed(sender, instance, **kwargs):
+    invalidate_user_library([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    user_state_cache.evict(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Role)
+def role_changed(sender, instance, **kwargs):
+    # Cached users carry their role; roles change rarely, so drop everything.
+    user_state_cache.clear()
+
+
+@receiver([post_save, post_delete], sender=RolePermission)
+@receiver([post_save, post_delete], sender=Permission)
+@receiver(post_delete, sender=Role)
+def role_permissions_changed(sender, instance, **kwargs):
+    invalidate_role_permissions()
@@ -1,3 +1,451 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in, user_login_failed
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from babelLibrary.versioning import get_version
+from library.models import Chapter, Genre, Series, SeriesRating
+from library.tests import QueryBudgetMixin, _seed_catalog
+from .authentication import tokens_for_user, user_state_cache
+from .models import Bookmark, Permission, ReadingHistory, Role, RolePermission, User
+from .permissions import MANAGE_ROLES, ROLE_PERMISSIONS_SCOPE, HasRolePermission, get_role_permissions
+from .progress import progress_buffer
+
+
+class UserTestMixin:
+    """Shared fixtures: a reader with an authenticated API client."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.role = Role.objects.create(name='Reader')
+        self.user = User.objects.create_user('reader', 'reader@example.com', 'pw', role=self.role)
+        self.client.force_authenticate(self.user)
+
+    def _series(self, title, chapters=2):
+        series = Series.objects.create(title=title)
+        for number in range(1, chapters + 1):
+            Chapter.objects.create(series=series, chapter_number=number, title=f'Chapter {number}', content='Text')
+        return series
+
+
+class BookmarkListQueryTests(UserTestMixin, TestCase):
+    """The bookmark list loads a whole library in a constant number of queries."""
+
+    def _bookmark(self, count):
+        genre, _ = Genre.objects.get_or_create(name='Fantasy')
+        for i in range(count):
+            series = self._series(f'Bookmarked {Series.objects.count()}')
+            series.genres.add(genre)
+            Bookmark.objects.create(user=self.user, series=series)
+
+    def _list(self):
+        return self.client.get('/api/bookmarks/', {'user': str(self.user.user_id)})
+
+    def test_series_details_include_stats(self):
+        self._bookmark(1)
+        series = Series.objects.get()
+        SeriesRating.objects.create(series=series, user=self.user, rating=4)
+
+        details = self._list().data['results'][0]['series_details']
+
+        self.assertEqual(details['chapters_count'], 2)
+        self.assertEqual(details['average_rating'], 4)
+        self.assertEqual(details['total_view_count'], 0)
+        self.assertEqual([g['name'] for g in details['genres']], ['Fantasy'])
+
+    def test_query_count_does_not_grow_with_bookmarks(self):
+        self._bookmark(2)
+        with CaptureQueriesContext(connection) as small:
+            self._list()
+
+        self._bookmark(10)
+        with CaptureQueriesContext(connection) as large:
+            self._list()
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class LibraryDashboardTests(UserTestMixin, TestCase):
+    """The library dashboard reports unread chapters per bookmarked series."""
+
+    def setUp(self):
+        super().setUp()
+        self.read_series = self._series('Reading', chapters=5)
+        self.new_series = self._series('Untouched', chapters=3)
+        for series in (self.read_series, self.new_series):
+            Bookmark.objects.create(user=self.user, series=series)
+        ReadingHistory.objects.create(
+            user=self.user, series=self.read_series,
+            chapter=self.read_series.chapters.get(chapter_number=2)
+        )
+
+    def _library(self):
+        return self.client.get('/api/users/library/').data
+
+    def test_reports_last_read_and_unread_counts(self):
+        data = self._library()
+
+        entries = {entry['series_title']: entry for entry in data['results']}
+        self.assertEqual(entries['Reading']['last_read_chapter_number'], 2)
+        self.assertEqual(entries['Reading']['unread_count'], 3)
+        self.assertEqual(entries['Reading']['latest_chapter_number'], 5)
+        self.assertIsNone(entries['Untouched']['last_read_chapter_id'])
+        self.assertEqual(entries['Untouched']['unread_count'], 3)
+        self.assertEqual(data['total_unread'], 6)
+
+    def test_computed_in_one_query_and_cached(self):
+        self._series('More', chapters=4)
+        with CaptureQueriesContext(connection) as first:
+            self._library()
+        with CaptureQueriesContext(connection) as second:
+            self._library()
+
+        self.assertEqual(len(first.captured_queries), 1)
+        self.assertEqual(len(second.captured_queries), 0)
+
+    def test_new_chapter_invalidates_followers(self):
+        self._library()
+        Chapter.objects.create(series=self.read_series, chapter_number=6, title='New', content='Text')
+
+        entries = {entry['series_title']: entry for entry in self._library()['results']}
+        self.assertEqual(entries['Reading']['unread_count'], 4)
+
+
+class ReadingProgressTests(UserTestMixin, TestCase):
+    """Reading progress is buffered per user/series and flushed with one upsert."""
+
+    def setUp(self):
+        super().setUp()
+        self.series = self._series('Binge', chapters=5)
+        progress_buffer.flush()
+
+    def _open(self, number, series=None):
+        series = series or self.series
+        return self.client.post('/api/reading-history/progress/', {
+            'series': str(series.series_id),
+            'chapter': str(series.chapters.get(chapter_number=number).chapter_id),
+        })
+
+    @override_settings(READING_PROGRESS_FLUSH_INTERVAL=60)
+    def test_burst_is_coalesced_to_highest_chapter(self):
+        with mock.patch.object(progress_buffer, '_ensure_flusher'):
+            for number in (1, 3, 2):
+                self.assertEqual(self._open(number).status_code, 202)
+            self._open(1, series=self._series('Other'))
+
+        self.assertFalse(ReadingHistory.objects.exists())
+        self.assertEqual(len(progress_buffer), 2)
+        with CaptureQueriesContext(connection) as flush:
+            self.assertEqual(progress_buffer.flush(), 2)
+
+        self.assertEqual(len(flush.captured_queries), 1)
+        history = ReadingHistory.objects.get(series=self.series)
+        self.assertEqual(history.chapter.chapter_number, 3)
+
+    @override_settings(READING_PROGRESS_FLUSH_INTERVAL=0)
+    def test_flush_updates_existing_history(self):
+        self._open(1)
+        self._open(4)
+
+        history = ReadingHistory.objects.get(user=self.user, series=self.series)
+        self.assertEqual(history.chapter.chapter_number, 4)
+        self.assertEqual(ReadingHistory.objects.count(), 1)
+
+    @override_settings(READING_PROGRESS_FLUSH_INTERVAL=60)
+    def test_flush_stores_read_time(self):
+        with mock.patch.object(progress_buffer, '_ensure_flusher'):
+            self._open(2)
+        read_at = progress_buffer._pending[(self.user.pk, self.series.pk)][2]
+
+        later = read_at + timedelta(minutes=5)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            progress_buffer.flush()
+
+        history = ReadingHistory.objects.get(user=self.user, series=self.series)
+        self.assertEqual(history.last_read_at, read_at)
+
+    def test_rejects_chapter_from_another_series(self):
+        other = self._series('Other')
+        response = self.client.post('/api/reading-history/progress/', {
+            'series': str(self.series.series_id),
+            'chapter': str(other.chapters.first().chapter_id),
+        })
+        self.assertEqual(response.status_code, 400)
+
+
+class CachedAuthenticationTests(UserTestMixin, TestCase):
+    """Authenticated requests reuse cached user state instead of reloading the user."""
+
+    def setUp(self):
+        super().setUp()
+        user_state_cache.clear()
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(self.user).access_token}')
+
+    def _user_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        return response, [q for q in queries.captured_queries if 'FROM "users"' in q['sql']]
+
+    def test_user_is_loaded_once_per_ttl(self):
+        _, first = self._user_queries('/api/bookmarks/')
+        response, second = self._user_queries('/api/bookmarks/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+
+    def test_deactivation_takes_effect_immediately(self):
+        self._user_queries('/api/bookmarks/')
+        self.user.is_active = False
+        self.user.save()
+
+        response, _ = self._user_queries('/api/bookmarks/')
+        self.assertEqual(response.status_code, 401)
+
+    def _track_view(self):
+        chapter = self._series('Tracked', chapters=1).chapters.get()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(f'/api/library/chapters/{chapter.chapter_id}/track_view/')
+        return response, [q for q in queries.captured_queries if 'FROM "users"' in q['sql']]
+
+    def test_stateless_actions_use_token_claims(self):
+        response, user_queries = self._track_view()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_queries, [])
+
+    def test_tokens_without_claims_fall_back_to_database(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        response, user_queries = self._track_view()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(user_queries), 1)
+
+    def test_library_rejects_deactivated_user(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response, _ = self._user_queries('/api/users/library/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_tokens_carry_role_claims(self):
+        token = tokens_for_user(self.user).access_token
+        self.assertEqual((token['role'], token['is_staff']), ('Reader', False))
+
+    def test_refresh_issues_access_token_with_claims(self):
+        refresh = tokens_for_user(self.user)
+        response = APIClient().post('/api/users/token/refresh/', {'refresh': str(refresh)})
+
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        self.assertEqual((access['role'], access['role_id']), ('Reader', str(self.role.role_id)))
+
+    def test_refresh_rejects_invalid_token(self):
+        response = APIClient().post('/api/users/token/refresh/', {'refresh': 'not-a-token'})
+        self.assertEqual(response.status_code, 401)
+
+
+class RolePermissionTests(UserTestMixin, TestCase):
+    """Role permission sets are cached and invalidated when grants change."""
+
+    def setUp(self):
+        super().setUp()
+        self.permission = Permission.objects.create(name='moderate_comments')
+
+    def _check(self, user):
+        view = mock.Mock(action='destroy', required_role_permissions={'destroy': 'moderate_comments'})
+        request = APIRequestFactory().delete('/')
+        request.user = user
+        return HasRolePermission().has_permission(request, view)
+
+    def test_check_uses_cache_after_first_load(self):
+        RolePermission.objects.create(role=self.role, permission=self.permission)
+        self.assertTrue(self._check(self.user))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self._check(self.user))
+        self.assertIsInstance(get_role_permissions(self.role.role_id), frozenset)
+
+    def test_revoking_permission_invalidates_cache(self):
+        grant = RolePermission.objects.create(role=self.role, permission=self.permission)
+        self.assertTrue(self._check(self.user))
+
+        grant.delete()
+        self.assertFalse(self._check(self.user))
+
+    def test_revocation_in_another_process_expires_with_ttl(self):
+        grant = RolePermission.objects.create(role=self.role, permission=self.permission)
+        self.assertTrue(self._check(self.user))
+
+        # Another worker revokes the grant; with a per-process cache this one
+        # never sees the version bump.
+        with mock.patch('users.permissions.get_version', return_value=get_version(ROLE_PERMISSIONS_SCOPE)):
+            grant.delete()
+            self.assertTrue(self._check(self.user))
+
+            expired = time.monotonic() + settings.ROLE_PERMISSIONS_CACHE_TTL + 1
+            with mock.patch('users.permissions.time.monotonic', return_value=expired):
+                self.assertFalse(self._check(self.user))
+
+    def test_role_writes_require_manage_roles(self):
+        response = self.client.post('/api/permissions/', {'name': 'edit_series'})
+        self.assertEqual(response.status_code, 403)
+
+        manage = Permission.objects.create(name=MANAGE_ROLES)
+        grant = RolePermission.objects.create(role=self.role, permission=manage)
+        response = self.client.post('/api/permissions/', {'name': 'edit_series'})
+        self.assertEqual(response.status_code, 201)
+
+        # Revoking through the API takes effect on the very next request.
+        response = self.client.delete(f'/api/role-permissions/{grant.pk}/')
+        self.assertEqual(response.status_code, 204)
+        response = self.client.patch(f'/api/roles/{self.role.role_id}/', {'description': 'Changed'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get('/api/roles/').status_code, 200)
+
+    def test_role_permissions_endpoint_is_one_query(self):
+        for i in range(5):
+            RolePermission.objects.create(role=self.role, permission=Permission.objects.create(name=f'perm_{i}'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/roles/{self.role.role_id}/permissions/')
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(len(queries.captured_queries), 2)
+
+
+@override_settings(PBKDF2_ITERATIONS=1000, LOGIN_FAILURE_LIMIT_PER_USERNAME=2)
+class LoginPipelineTests(UserTestMixin, TestCase):
+    """Login throttles failures before hashing and upgrades outdated hashes."""
+
+    def _login(self, password):
+        return APIClient().post('/api/users/login/', {'username': 'reader', 'password': password})
+
+    def test_throttled_login_skips_hashing(self):
+        self.assertEqual(self._login('wrong').status_code, 401)
+        self.assertEqual(self._login('wrong').status_code, 401)
+
+        with mock.patch('users.login.check_password') as check:
+            response = self._login('pw')
+
+        self.assertEqual(response.status_code, 429)
+        check.assert_not_called()
+
+    def test_successful_login_resets_username_failures(self):
+        self._login('wrong')
+        self.assertEqual(self._login('pw').status_code, 200)
+
+        self._login('wrong')
+        self.assertEqual(self._login('pw').status_code, 200)
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        self.assertIn('$1000$', self.user.password)
+
+        with override_settings(PBKDF2_ITERATIONS=2000):
+            response = self._login('pw')
+
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertIn('$2000$', self.user.password)
+        self.assertTrue(self.user.check_password('pw'))
+
+    def test_login_goes_through_auth_backends_and_signals(self):
+        failed, logged_in = mock.Mock(), mock.Mock()
+        user_login_failed.connect(failed)
+        user_logged_in.connect(logged_in)
+        self.addCleanup(user_login_failed.disconnect, failed)
+        self.addCleanup(user_logged_in.disconnect, logged_in)
+
+        self._login('wrong')
+        self._login('pw')
+
+        failed.assert_called_once()
+        logged_in.assert_called_once()
+        self.assertEqual(logged_in.call_args.kwargs['user'], self.user)
+
+    def test_non_string_username_is_rejected(self):
+        response = APIClient().post('/api/users/login/', {'username': ['reader'], 'password': 'pw'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(LOGIN_FAILURE_LIMIT_PER_IP=2)
+    def test_ip_limit_ignores_forwarded_for_by_default(self):
+        for i in range(2):
+            APIClient().post(
+                '/api/users/login/', {'username': f'nobody{i}', 'password': 'x'}, HTTP_X_FORWARDED_FOR=f'10.0.0.{i}'
+            )
+        response = APIClient().post(
+            '/api/users/login/', {'username': 'reader', 'password': 'pw'}, HTTP_X_FORWARDED_FOR='10.0.0.9'
+        )
+        self.assertEqual(response.status_code, 429)
+
+
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Every users endpoint stays within its query budget on a seeded library."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.role = Role.objects.create(name='Reader')
+        users = User.objects.bulk_create([
+            User(username=f'reader{i}', email=f'reader{i}@example.com', role=cls.role) for i in range(200)
+        ])
+        cls.user = users[0]
+        cls.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', role=cls.role, is_staff=True)
+        permissions = Permission.objects.bulk_create([Permission(name=f'perm_{i}') for i in range(20)])
+        RolePermission.objects.bulk_create([RolePermission(role=cls.role, permission=p) for p in permissions])
+
+        series = _seed_catalog(100, 10, 20, users[:5])
+        chapters = {c.series_id: c for c in Chapter.objects.filter(chapter_number=5)}
+        Bookmark.objects.bulk_create([Bookmark(user=cls.user, series=s) for s in series])
+        ReadingHistory.objects.bulk_create([
+            ReadingHistory(user=cls.user, series=s, chapter=chapters[s.series_id]) for s in series
+        ])
+        cls.series = series[0]
+        cls.chapter = chapters[cls.series.series_id]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_reads(self):
+        role, user = self.role.role_id, self.user.user_id
+        budgets = [
+            ('/api/roles/', 2),
+            (f'/api/roles/{role}/', 1),
+            (f'/api/roles/{role}/users/', 2),
+            (f'/api/roles/{role}/permissions/', 2),
+            ('/api/permissions/', 2),
+            ('/api/role-permissions/', 2),
+            (f'/api/users/{user}/', 1),
+            ('/api/users/library/', 1),
+            (f'/api/bookmarks/?user={user}', 4),
+            (f'/api/reading-history/?user={user}', 2),
+        ]
+        for path, budget in budgets:
+            with self.subTest(path=path):
+                self.assertWithinBudget('get', path, budget)
+
+    def test_admin_user_list(self):
+        self.client.force_authenticate(self.admin)
+        self.assertWithinBudget('get', '/api/users/', 2)
+
+    @override_settings(READING_PROGRESS_FLUSH_INTERVAL=0)
+    def test_reading_progress(self):
+        self.assertWithinBudget('post', '/api/reading-history/progress/', 2, {
+            'series': str(self.series.series_id), 'chapter': str(self.chapter.chapter_id)
+        })
+
+    @override_settings(PBKDF2_ITERATIONS=1000)
+    def test_login(self):
+        member = User.objects.create_user('member', 'member@example.com', 'pw', role=self.role)
+        # No last_login UPDATE: update_last_login is disconnected while SIMPLE_JWT's UPDATE_LAST_LOGIN is off.
+        self.assertWithinBudget('post', '/api/users/login/', 2, {'username': 'member', 'password': 'pw'})
+        member.refresh_from_db()
+        self.assertIsNone(member.last_login)
@@ -1,12 +1,19 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_logged_in
+from django.db.models import Prefetch
+from babelLibrary.instrumentation import InstrumentedViewMixin
+from library.models import Series
+from .authentication import tokens_for_user
+from .dashboard import get_user_library
+from .login import LoginBusy, LoginThrottle, get_client_ip, verify_credentials
+from .progress import progress_buffer
 from .models import Role, Permission, RolePermission, User, Bookmark, ReadingHistory
+from .permissions import MANAGE_ROLES, WRITE_ACTIONS, HasRolePermission
 from .serializers import (
     RoleSerializer, PermissionSerializer, RolePermissionSerializer, 
-    UserSerializer, BookmarkSerializer, ReadingHistorySerializer
+    UserSerializer, BookmarkSerializer, ReadingHistorySerializer, ReadingProgressSerializer
 )
 
 
@@ -22,10 +29,31 @@ def login_view(request):
             {'detail': 'Username and password are required'},
             status=status.HTTP_400_BAD_REQUEST
         )
+    if not isinstance(username, str) or not isinstance(password, str):
+        return Response(
+            {'detail': 'Username and password must be strings'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-    user = authenticate(username=username, password=password)
+    # Reject clients with too many recent failures before doing any hashing
+    throttle = LoginThrottle(get_client_ip(request), username)
+    if throttle.is_blocked():
+        return Response(
+            {'detail': 'Too many failed login attempts. Please try again later.'},
+            status=status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    try:
+        user = verify_credentials(request, username, password)
+    except LoginBusy:
+        return Response(
+            {'detail': 'Login is temporarily busy. Please retry.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'}
+        )
 
     if user is None:
+        throttle.record_failure()
         return Response(
             {'detail': 'Invalid credentials'},
             status=status.HTTP_401_UNAUTHORIZED
@@ -37,7 +65,10 @@ def login_view(request):
             status=status.HTTP_403_FORBIDDEN
         )
 
-    refresh = RefreshToken.for_user(user)
+    throttle.reset()
+    user_logged_in.send(sender=user.__class__, request=request, user=user)
+
+    refresh = tokens_for_user(user)
     user_data = UserSerializer(user).data
 
     return Response({
@@ -47,11 +78,11 @@ def login_view(request):
     })
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing User instances.
     """
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('role')
     serializer_class = UserSerializer
     pagination_class = None
     permission_classes = [permissions.IsAuthenticated] # Default to authenticated
@@ -89,7 +120,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
         # Generate JWT tokens for the newly created user
         user = serializer.instance
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
 
         # Return user data along with authentication tokens
         return Response({
@@ -142,6 +173,14 @@ class UserViewSet(viewsets.ModelViewSet):
         """Login endpoint that returns JWT tokens"""
         return login_view(request)
 
+    @action(detail=False, methods=['get'])
+    def library(self, request):
+        """
+        Library dashboard for the current user: every bookmarked series with the
+        last chapter read, the latest chapter number and the unread count.
+        """
+        return Response(get_user_library(request.user.pk))
+
     @action(detail=True, methods=['post'])
     def set_password(self, request, user_id=None):
         """Set a new password for the user"""
@@ -170,14 +209,15 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response({'status': 'user activated'})
 
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Role instances.
     """
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     pagination_class = None
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, HasRolePermission]
+    required_role_permissions = dict.fromkeys(WRITE_ACTIONS, MANAGE_ROLES)
     lookup_field = 'role_id'
 
     def list(self, request, *args, **kwargs):
@@ -199,32 +239,33 @@ class RoleViewSet(viewsets.ModelViewSet):
     def permissions(self, request, role_id=None):
         """Get all permissions for this role"""
         role = self.get_object()
-        role_permissions = role.role_permissions.all()
-        permissions_list = [rp.permission for rp in role_permissions]
+        permissions_list = Permission.objects.filter(permission_roles__role=role)
         serializer = PermissionSerializer(permissions_list, many=True)
         return Response(serializer.data)
 
 
-class PermissionViewSet(viewsets.ModelViewSet):
+class PermissionViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Permission instances.
     """
     queryset = Permission.objects.all()
     serializer_class = PermissionSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, HasRolePermission]
+    required_role_permissions = dict.fromkeys(WRITE_ACTIONS, MANAGE_ROLES)
     lookup_field = 'permission_id'  # Use permission_id instead of pk in URLs
 
 
-class RolePermissionViewSet(viewsets.ModelViewSet):
+class RolePermissionViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Role-Permission relationships.
     """
-    queryset = RolePermission.objects.all()
+    queryset = RolePermission.objects.select_related('role', 'permission')
     serializer_class = RolePermissionSerializer
-    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, HasRolePermission]
+    required_role_permissions = dict.fromkeys(WRITE_ACTIONS, MANAGE_ROLES)
 
 
-class BookmarkViewSet(viewsets.ModelViewSet):
+class BookmarkViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user bookmarks.
     """
@@ -233,8 +274,13 @@ class BookmarkViewSet(viewsets.ModelViewSet):
     lookup_field = 'bookmark_id'
 
     def get_queryset(self):
-        """Return bookmarks filtered by query parameters."""
-        queryset = Bookmark.objects.select_related('user', 'series').all()
+        """
+        Return bookmarks filtered by query parameters.
+        Series are prefetched with the annotations and genres SeriesSerializer
+        renders, so a whole library serializes in a constant number of queries.
+        """
+        series_queryset = Series.objects.with_stats().prefetch_related('genres')
+        queryset = Bookmark.objects.prefetch_related(Prefetch('series', queryset=series_queryset))
         
         # Filter by user if specified in query params
         user_id = self.request.query_params.get('user', None)
@@ -263,7 +309,7 @@ class BookmarkViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class ReadingHistoryViewSet(viewsets.ModelViewSet):
+class ReadingHistoryViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing reading history.
     """
@@ -276,7 +322,7 @@ class ReadingHistoryViewSet(viewsets.ModelViewSet):
         """Return reading history filtered by query parameters."""
         queryset = ReadingHistory.objects.select_related(
             'user', 'series', 'chapter'
-        ).all()
+        ).defer('chapter__content')
         
         # Filter by user if specified in query params
         user_id = self.request.query_params.get('user', None)
@@ -298,3 +344,23 @@ class ReadingHistoryViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Automatically set the user to the current authenticated user."""
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def progress(self, request):
+        """
+        Record that the current user opened a chapter.
+        
+        Request body: {"series": "<uuid>", "chapter": "<uuid>"}
+        
+        Updates are buffered per user/series (keeping the highest chapter) and
+        written in bulk shortly afterwards, so this returns 202 without a body.
+        """
+        serializer = ReadingProgressSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        progress_buffer.record(
+            request.user.pk,
+            serializer.validated_data['series'],
+            serializer.validated_data['chapter'],
+            serializer.validated_data['chapter_number'],
+        )
+        return Response(status=status.HTTP_202_ACCEPTED)
@@ -2,9 +2,8 @@ import { Component, OnInit, OnDestroy } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { ActivatedRoute, Router } from '@angular/router';
 import { TranslatorService } from '../../../services/translator.service';
-import { TranslationJob } from '../../../models/translator';
-import { interval, Subscription } from 'rxjs';
-import { switchMap } from 'rxjs/operators';
+import { TranslationJob, TranslatedChapterCache, ChapterProgress, JobProgressEvent } from '../../../models/translator';
+import { Subscription } from 'rxjs';
 
 @Component({
   selector: 'app-job-detail',
@@ -17,7 +16,7 @@ export class JobDetail implements OnInit, OnDestroy {
   job?: TranslationJob;
   isLoading = false;
   errorMessage = '';
-  private refreshSubscription?: Subscription;
+  private progressSubscription?: Subscription;
 
   constructor(
     private translatorService: TranslatorService,
@@ -28,53 +27,73 @@ export class JobDetail implements OnInit, OnDestroy {
   ngOnInit(): void {
     const jobId = this.route.snapshot.paramMap.get('id');
     if (jobId) {
-      this.loadJob(jobId);
-      this.startAutoRefresh(jobId);
+      this.watchProgress(jobId);
     }
   }
 
   ngOnDestroy(): void {
-    this.stopAutoRefresh();
+    this.stopWatching();
   }
 
-  loadJob(jobId: string): void {
+  // The progress stream opens with a snapshot of the job and its chapter metadata,
+  // so the page never downloads chapter text.
+  watchProgress(jobId: string): void {
     this.isLoading = true;
     this.errorMessage = '';
 
-    this.translatorService.getJob(jobId).subscribe({
-      next: (data) => {
-        this.job = data;
+    this.progressSubscription = this.translatorService.watchJob(jobId).subscribe({
+      next: (event) => {
+        this.applyProgress(event);
         this.isLoading = false;
       },
       error: (error) => {
-        this.errorMessage = 'Failed to load job details';
+        if (!this.job) {
+          this.errorMessage = 'Failed to load job details';
+        }
         this.isLoading = false;
-        console.error('Error loading job:', error);
+        console.error('Progress stream error:', error);
       }
     });
   }
 
-  startAutoRefresh(jobId: string): void {
-    this.refreshSubscription = interval(3000)
-      .pipe(switchMap(() => this.translatorService.getJob(jobId)))
-      .subscribe({
-        next: (data) => {
-          this.job = data;
-          // Stop auto-refresh if job is completed or failed
-          if (data.status === 'completed' || data.status === 'failed') {
-            this.stopAutoRefresh();
-          }
-        },
-        error: (error) => {
-          console.error('Auto-refresh error:', error);
-        }
-      });
+  stopWatching(): void {
+    if (this.progressSubscription) {
+      this.progressSubscription.unsubscribe();
+    }
   }
 
-  stopAutoRefresh(): void {
-    if (this.refreshSubscription) {
-      this.refreshSubscription.unsubscribe();
+  private applyProgress(event: JobProgressEvent): void {
+    switch (event.event) {
+      case 'snapshot':
+        this.job = { ...this.job, ...event.data.job } as TranslationJob;
+        event.data.chapters.forEach((chapter) => this.applyChapter(chapter));
+        break;
+      case 'job':
+        this.job = { ...this.job, ...event.data } as TranslationJob;
+        break;
+      case 'chapter':
+        this.applyChapter(event.data);
+        break;
+      case 'end':
+        this.stopWatching();
+        break;
+    }
+  }
+
+  // Merge chapter metadata into the list.
+  private applyChapter(chapter: ChapterProgress): void {
+    if (!this.job) {
+      return;
+    }
+    const chapters = this.job.cached_chapters ? [...this.job.cached_chapters] : [];
+    const index = chapters.findIndex((c) => c.chapter_number === chapter.chapter_number);
+    if (index >= 0) {
+      chapters[index] = { ...chapters[index], ...chapter };
+    } else {
+      chapters.push({ created_at: chapter.updated_at, ...chapter } as TranslatedChapterCache);
+      chapters.sort((a, b) => a.chapter_number - b.chapter_number);
     }
+    this.job = { ...this.job, cached_chapters: chapters };
   }
 
   goBack(): void {
@@ -14,7 +14,6 @@ import { TranslationJobPreview, TranslatedChapterCache, ImportTranslationRequest
 })
 export class JobPreview implements OnInit {
   preview?: TranslationJobPreview;
-  allChapters: TranslatedChapterCache[] = [];
   selectedChapterNumbers: number[] = [];
   selectedChapter?: TranslatedChapterCache;
   
@@ -24,6 +23,7 @@ export class JobPreview implements OnInit {
   seriesStatus: 'Ongoing' | 'Completed' | 'Hiatus' = 'Ongoing';
   
   isLoading = false;
+  isLoadingChapter = false;
   isImporting = false;
   errorMessage = '';
   viewMode: 'preview' | 'full-chapter' = 'preview';
@@ -38,7 +38,6 @@ export class JobPreview implements OnInit {
     const jobId = this.route.snapshot.paramMap.get('id');
     if (jobId) {
       this.loadPreview(jobId);
-      this.loadAllChapters(jobId);
     }
   }
 
@@ -76,17 +75,6 @@ export class JobPreview implements OnInit {
     });
   }
 
-  loadAllChapters(jobId: string): void {
-    this.translatorService.getJobChapters(jobId).subscribe({
-      next: (data) => {
-        this.allChapters = data.filter(ch => ch.status === 'polished');
-      },
-      error: (error) => {
-        console.error('Error loading chapters:', error);
-      }
-    });
-  }
-
   toggleChapterSelection(chapterNumber: number): void {
     const index = this.selectedChapterNumbers.indexOf(chapterNumber);
     if (index > -1) {
@@ -112,11 +100,23 @@ export class JobPreview implements OnInit {
     this.selectedChapterNumbers = [];
   }
 
+  // Chapter text is not part of the preview; fetch it when a chapter is opened.
   viewChapterContent(chapterNumber: number): void {
-    this.selectedChapter = this.allChapters.find(ch => ch.chapter_number === chapterNumber);
-    if (this.selectedChapter) {
-      this.viewMode = 'full-chapter';
-    }
+    if (!this.preview) return;
+
+    this.isLoadingChapter = true;
+    this.translatorService.getJobChapter(this.preview.job_id, chapterNumber).subscribe({
+      next: (chapter) => {
+        this.selectedChapter = chapter;
+        this.viewMode = 'full-chapter';
+        this.isLoadingChapter = false;
+      },
+      error: (error) => {
+        this.errorMessage = 'Failed to load chapter content';
+        this.isLoadingChapter = false;
+        console.error('Error loading chapter:', error);
+      }
+    });
   }
 
   closeChapterView(): void {
@@ -16,21 +16,26 @@ export interface TranslationJob {
   chapters_completed: number;
   chapters_failed: number;
   progress_percentage: number;
+  throughput?: number | null;
+  eta_seconds?: number | null;
   current_operation?: string;
   error_message?: string;
   created_at: string;
   updated_at: string;
+  started_at?: string;
   completed_at?: string;
   imported_series?: string;
   cached_chapters?: TranslatedChapterCache[];
 }
 
+// Job detail and chapter lists carry metadata only; the text fields come
+// from GET /jobs/{id}/chapters/{number}/ (see getJobChapter).
 export interface TranslatedChapterCache {
   cache_id: string;
   chapter_number: number;
   chapter_url: string;
   korean_title: string;
-  korean_content: string;
+  korean_content?: string;
   english_title?: string;
   english_content_raw?: string;
   english_content_final?: string;
@@ -41,6 +46,8 @@ export interface TranslatedChapterCache {
   updated_at: string;
 }
 
+export type ChapterContentField = 'korean_content' | 'english_content_raw' | 'english_content_final';
+
 export interface CreateTranslationJobRequest {
   novel_url: string;
   chapters_requested?: number;
@@ -80,3 +87,12 @@ export interface ImportTranslationResponse {
   series_title: string;
   chapters_imported: number;
 }
+
+// Server-Sent Events from GET /jobs/{id}/progress/ (chapter text is never included)
+export type ChapterProgress = Omit<TranslatedChapterCache, 'korean_content' | 'english_content_raw' | 'english_content_final' | 'created_at'>;
+
+export type JobProgressEvent =
+  | { event: 'snapshot'; data: { job: Partial<TranslationJob>; chapters: ChapterProgress[] } }
+  | { event: 'job'; data: Partial<TranslationJob> }
+  | { event: 'chapter'; data: ChapterProgress }
+  | { event: 'end'; data: { status: string } };
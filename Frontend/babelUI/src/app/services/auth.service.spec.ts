@@ -0,0 +1,44 @@
+import { TestBed } from '@angular/core/testing';
+import { provideHttpClient } from '@angular/common/http';
+import { HttpTestingController, provideHttpClientTesting } from '@angular/common/http/testing';
+
+import { AuthService } from './auth.service';
+import { environment } from '../../environments/environment';
+
+describe('AuthService', () => {
+  let service: AuthService;
+  let http: HttpTestingController;
+
+  beforeEach(() => {
+    sessionStorage.clear();
+    TestBed.configureTestingModule({
+      providers: [provideHttpClient(), provideHttpClientTesting()]
+    });
+    service = TestBed.inject(AuthService);
+    http = TestBed.inject(HttpTestingController);
+  });
+
+  afterEach(() => {
+    http.verify();
+    sessionStorage.clear();
+  });
+
+  it('should store the refreshed access token', () => {
+    sessionStorage.setItem('refresh_token', 'refresh');
+    let access: string | undefined;
+    service.refreshAccessToken().subscribe((token) => (access = token));
+
+    const request = http.expectOne(`${environment.apiUrl}/users/token/refresh/`);
+    expect(request.request.body).toEqual({ refresh: 'refresh' });
+    request.flush({ access: 'new-access' });
+
+    expect(access).toBe('new-access');
+    expect(sessionStorage.getItem('access_token')).toBe('new-access');
+  });
+
+  it('should fail without a refresh token', () => {
+    let failed = false;
+    service.refreshAccessToken().subscribe({ error: () => (failed = true) });
+    expect(failed).toBeTrue();
+  });
+});
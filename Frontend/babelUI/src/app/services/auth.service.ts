@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable, BehaviorSubject, tap } from 'rxjs';
+import { Observable, BehaviorSubject, map, tap, throwError } from 'rxjs';
 import { User, LoginCredentials, AuthResponse } from '../models/user';
 import { environment } from '../../environments/environment';
 
@@ -47,6 +47,20 @@ export class AuthService {
     this.currentUserSubject.next(response.user);
   }
 
+  // Exchange the refresh token for a new access token and store it
+  refreshAccessToken(): Observable<string> {
+    const refresh = sessionStorage.getItem('refresh_token');
+    if (!refresh) {
+      return throwError(() => new Error('No refresh token'));
+    }
+    return this.http.post<{ access: string }>(`${this.apiUrl}/token/refresh/`, { refresh }).pipe(
+      map(response => {
+        sessionStorage.setItem('access_token', response.access);
+        return response.access;
+      })
+    );
+  }
+
   logout(): void {
     sessionStorage.removeItem('access_token');
     sessionStorage.removeItem('refresh_token');
@@ -1,15 +1,18 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { Observable, firstValueFrom } from 'rxjs';
 import {
   TranslationJob,
   TranslatedChapterCache,
+  ChapterContentField,
   CreateTranslationJobRequest,
   TranslationJobPreview,
   ImportTranslationRequest,
-  ImportTranslationResponse
+  ImportTranslationResponse,
+  JobProgressEvent
 } from '../models/translator';
 import { environment } from '../../environments/environment';
+import { AuthService } from './auth.service';
 
 @Injectable({
   providedIn: 'root'
@@ -17,7 +20,7 @@ import { environment } from '../../environments/environment';
 export class TranslatorService {
   private apiUrl = `${environment.apiUrl}/translator`;
 
-  constructor(private http: HttpClient) { }
+  constructor(private http: HttpClient, private authService: AuthService) { }
 
   // Get all translation jobs
   getJobs(): Observable<TranslationJob[]> {
@@ -29,6 +32,102 @@ export class TranslatorService {
     return this.http.get<TranslationJob>(`${this.apiUrl}/jobs/${jobId}/`);
   }
 
+  // Stream job progress (Server-Sent Events). Uses fetch rather than EventSource so the
+  // Authorization header can be sent. Reconnects with Last-Event-ID until the job ends:
+  // after a clean close, after network and 5xx errors (with exponential backoff), and
+  // after a 401 once the access token has been refreshed. Other errors end the stream.
+  watchJob(jobId: string): Observable<JobProgressEvent> {
+    return new Observable<JobProgressEvent>((subscriber) => {
+      const controller = new AbortController();
+      const maxBackoffMs = 30000;
+      let lastEventId: string | null = null;
+      let retryMs = 2000;
+      let failures = 0;
+      let ended = false;
+
+      const dispatch = (block: string) => {
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('id: ')) lastEventId = line.slice(4);
+          else if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+          else if (line.startsWith('retry: ')) retryMs = Number(line.slice(7)) || retryMs;
+        }
+        if (!data) return;
+        const parsed = { event, data: JSON.parse(data) } as JobProgressEvent;
+        if (parsed.event === 'end') ended = true;
+        subscriber.next(parsed);
+      };
+
+      // Resolves with the HTTP status when the stream could not be opened, or null once
+      // an opened stream closes; rejects on network errors.
+      const connect = async (): Promise<number | null> => {
+        const headers: Record<string, string> = { Accept: 'text/event-stream' };
+        const token = sessionStorage.getItem('access_token');
+        if (token) headers['Authorization'] = `Bearer ${token}`;
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+        const response = await fetch(`${this.apiUrl}/jobs/${jobId}/progress/`, { headers, signal: controller.signal });
+        if (!response.ok || !response.body) {
+          return response.status;
+        }
+        failures = 0;
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let boundary: number;
+          while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+            dispatch(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+          }
+        }
+        return null;
+      };
+
+      const wait = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+      const run = async () => {
+        let refreshed = false;
+        while (!ended && !controller.signal.aborted) {
+          let status: number | null;
+          try {
+            status = await connect();
+          } catch (error) {
+            if (controller.signal.aborted) return;
+            status = 0; // network error
+          }
+          if (ended || controller.signal.aborted) break;
+
+          if (status === 401 && !refreshed) {
+            refreshed = true;
+            await firstValueFrom(this.authService.refreshAccessToken());
+            continue;
+          }
+          if (status !== null && status !== 0 && status < 500) {
+            throw new Error(`Progress stream failed with status ${status}`);
+          }
+          if (status === null) {
+            refreshed = false;
+            await wait(retryMs);
+          } else {
+            failures++;
+            await wait(Math.min(retryMs * 2 ** failures, maxBackoffMs));
+          }
+        }
+        subscriber.complete();
+      };
+      run().catch((error) => {
+        if (!controller.signal.aborted) subscriber.error(error);
+      });
+
+      return () => controller.abort();
+    });
+  }
+
   // Create new translation job
   createJob(request: CreateTranslationJobRequest): Observable<TranslationJob> {
     return this.http.post<TranslationJob>(`${this.apiUrl}/jobs/`, request);
@@ -39,11 +138,17 @@ export class TranslatorService {
     return this.http.get<TranslationJobPreview>(`${this.apiUrl}/jobs/${jobId}/preview/`);
   }
 
-  // Get all chapters for a job
+  // Get the metadata of all chapters for a job (no chapter text)
   getJobChapters(jobId: string): Observable<TranslatedChapterCache[]> {
     return this.http.get<TranslatedChapterCache[]>(`${this.apiUrl}/jobs/${jobId}/chapters/`);
   }
 
+  // Get one chapter with its text, optionally only some of the text fields
+  getJobChapter(jobId: string, chapterNumber: number, fields?: ChapterContentField[]): Observable<TranslatedChapterCache> {
+    const params: Record<string, string> = fields ? { fields: fields.join(',') } : {};
+    return this.http.get<TranslatedChapterCache>(`${this.apiUrl}/jobs/${jobId}/chapters/${chapterNumber}/`, { params });
+  }
+
   // Import job to library
   importToLibrary(jobId: string, request: ImportTranslationRequest): Observable<ImportTranslationResponse> {
     return this.http.post<ImportTranslationResponse>(
@@ -64,8 +64,9 @@ export class UserDataService {
       );
   }
 
-  updateReadingHistory(historyData: UpdateReadingHistoryRequest): Observable<ReadingHistory> {
-    return this.http.post<ReadingHistory>(`${this.apiUrl}/reading-history/`, historyData);
+  // Buffered server-side and written in bulk; the response has no body
+  updateReadingHistory(historyData: UpdateReadingHistoryRequest): Observable<void> {
+    return this.http.post<void>(`${this.apiUrl}/reading-history/progress/`, historyData);
   }
 
   // User comments endpoint